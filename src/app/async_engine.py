@@ -0,0 +1,234 @@
+"""
+Asyncio fetch engine for webster_scraper (--engine async)
+
+All word pages for a letter are fetched from a single event loop, so thousands
+of requests can be in flight without a process per connection. HTML parsing is
+CPU bound and runs in a small process pool so the loop never stalls on it.
+Words whose URLs end up at the same page (directly or through redirects
+recorded in the page cache) are grouped up front; a fetch that is redirected
+to a page another fetch already claimed drops its response before the body is
+read and shares that fetch's result, so each page is downloaded and parsed
+once per run.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from tqdm import tqdm
+
+from page_parsers import is_empty_entry
+from proxy_pool import PARSE_FAILED, ParseError
+from word_urls import canonical_url
+
+try:
+    import aiohttp
+except ImportError:  # Only required for --engine async
+    aiohttp = None
+
+def proxy_for_url(url: str, proxy: Dict[str, str]) -> Optional[str]:
+    """Pick the proxy for a URL the same way requests does (by scheme)"""
+    if not proxy:
+        return None
+    return proxy.get(urlsplit(url).scheme)
+
+async def acquire_proxy(proxy_manager, avoid: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Take a proxy from the scheduler without blocking the event loop (another one than `avoid` if possible)"""
+    scheduler = proxy_manager.scheduler
+    proxy = scheduler.try_acquire()
+    while proxy is None:
+        wait = scheduler.next_eligible_in()
+        if wait is None:
+            # Everything is quarantined, let the blocking acquire readmit them off the loop
+            return await asyncio.get_running_loop().run_in_executor(None, proxy_manager.scheduler.acquire)
+        await asyncio.sleep(wait)
+        proxy = scheduler.try_acquire()
+    if avoid and proxy['http'] == avoid.get('http'):
+        proxy = scheduler.try_acquire() or proxy
+    return proxy
+
+async def _scrape_word(
+    word: str,
+    url: str,
+    session: 'aiohttp.ClientSession',
+    proxy_manager,
+    parse: Callable[[str, str], Dict],
+    parse_pool: ProcessPoolExecutor,
+    headers: Dict[str, str],
+    semaphore: asyncio.Semaphore,
+    cache=None,
+    negative_cache=None,
+    timeout: float = 30,
+    pages: Optional[Dict[str, asyncio.Future]] = None
+) -> Optional[Dict]:
+    """
+    Fetch one word page, retrying as proxy_manager.retry decides, and parse it off the event loop
+
+    `pages` maps final page URLs to the result of the fetch that claimed them
+    in this run; a page claimed by another fetch is awaited instead.
+    """
+    loop = asyncio.get_running_loop()
+    if pages is None:
+        pages = {}
+    if url in pages:
+        return await asyncio.shield(pages[url])
+    claimed = pages[url] = loop.create_future()
+    result = None
+    try:
+        result = await _fetch_word(word, url, session, proxy_manager, parse, parse_pool, headers,
+                                   semaphore, cache, negative_cache, timeout, pages, claimed)
+        return result
+    finally:
+        if not claimed.done():
+            claimed.set_result(result)
+
+async def _fetch_word(word, url, session, proxy_manager, parse, parse_pool, headers, semaphore,
+                      cache, negative_cache, timeout, pages, claimed) -> Optional[Dict]:
+    """Body of _scrape_word, `claimed` is the future its result is shared through"""
+    loop = asyncio.get_running_loop()
+    if cache is not None:
+        html = await loop.run_in_executor(None, cache.get, url)
+        if html is not None:
+            result = await loop.run_in_executor(parse_pool, parse, word, html)
+            # A cached block page is fetched again, like in the sync engine
+            if not is_empty_entry(result):
+                return result
+    if negative_cache is not None and await loop.run_in_executor(None, negative_cache.lookup, word):
+        return None
+
+    current_proxy = None
+    attempt = 0
+    parse_failures = 0
+    while True:
+        try:
+            async with semaphore:
+                current_proxy = await acquire_proxy(proxy_manager, avoid=current_proxy)
+                proxy_manager.retry.note_request()
+                started = loop.time()
+                async with session.get(
+                    url,
+                    headers=headers,
+                    proxy=proxy_for_url(url, current_proxy),
+                    timeout=aiohttp.ClientTimeout(total=timeout),
+                    allow_redirects=True
+                ) as response:
+                    response.raise_for_status()
+                    final_url = canonical_url(str(response.url))
+                    # Redirected to a page another fetch claimed: skip the body
+                    owner = pages.setdefault(final_url, claimed)
+                    if owner is claimed:
+                        html = await response.text(errors='replace')
+                        validators = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                latency = loop.time() - started
+
+            if owner is not claimed:
+                proxy_manager.mark_proxy_status(current_proxy, True, latency)
+                if cache is not None:
+                    await loop.run_in_executor(None, cache.add_redirect, url, final_url)
+                return await asyncio.shield(owner)
+
+            if cache is not None:
+                # Store the page once under where it was redirected to
+                await loop.run_in_executor(None, cache.add_redirect, url, final_url)
+                await loop.run_in_executor(None, partial(
+                    cache.put, final_url, html, etag=validators[0], last_modified=validators[1]))
+
+            result = await loop.run_in_executor(parse_pool, parse, word, html)
+            if is_empty_entry(result):
+                raise ParseError("No dictionary entry found on the page")
+            proxy_manager.mark_proxy_status(current_proxy, True, latency)
+            return result
+
+        except Exception as e:
+            failure, delay = proxy_manager.record_failure(current_proxy, e, attempt)
+            parse_failures += failure == PARSE_FAILED
+            print("Error scraping '{}' (attempt {}, {}): {}".format(word, attempt + 1, failure, str(e) or type(e).__name__))
+            if delay is None:
+                if negative_cache is not None and proxy_manager.retry.is_terminal(failure, parse_failures):
+                    await loop.run_in_executor(None, negative_cache.record, word, failure)
+                return None
+            await asyncio.sleep(delay)
+            attempt += 1
+
+async def scrape_words_async(
+    words: List[str],
+    proxy_manager,
+    parse: Callable[[str, str], Dict],
+    url_for: Callable[[str], str],
+    headers: Dict[str, str],
+    concurrency: int = 1000,
+    parse_workers: Optional[int] = None,
+    on_result: Optional[Callable[[Dict], None]] = None,
+    cache=None,
+    negative_cache=None
+) -> List[Dict]:
+    """
+    Scrape every word concurrently from one event loop
+
+    Args:
+        words: Words to scrape
+        proxy_manager: Shared ProxyManager used to pick and score proxies
+        parse: Picklable function turning (word, html) into a result dict
+        url_for: Function building the dictionary URL for a word
+        headers: Request headers for word pages
+        concurrency: Maximum number of requests in flight
+        parse_workers: Size of the HTML parsing process pool
+        on_result: Called on the event loop thread for every scraped result
+        cache: PageCache read before fetching and filled with fetched pages
+        negative_cache: NegativeCache of words skipped without a request, and
+            where words ending in a terminal failure are recorded
+
+    Returns:
+        List of result dicts for the words that were scraped successfully
+        (duplicate words are fetched once, see proxy_pool.singleflight)
+    """
+    if aiohttp is None:
+        raise RuntimeError("The async engine requires aiohttp (pip install aiohttp)")
+
+    if parse_workers is None:
+        parse_workers = max(1, min(4, multiprocessing.cpu_count() - 1))
+
+    # Words whose URLs resolve to the same page wait on one fetch
+    resolve = cache.resolve if cache is not None else (lambda url: url)
+    words_by_url = {}
+    for word in words:
+        words_by_url.setdefault(resolve(url_for(word)), []).append(word)
+    pages = {}  # Final URL -> future of the result of the fetch that claimed it
+
+    results = []
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency, ssl=False)
+
+    with ProcessPoolExecutor(max_workers=parse_workers) as parse_pool:
+        async with aiohttp.ClientSession(connector=connector, trust_env=False) as session:
+            async def scrape_url(url: str, url_words: List[str]):
+                result = await _scrape_word(url_words[0], url, session, proxy_manager, parse,
+                                            parse_pool, headers, semaphore, cache, negative_cache,
+                                            pages=pages)
+                return url_words, result
+
+            tasks = [asyncio.create_task(scrape_url(url, url_words)) for url, url_words in words_by_url.items()]
+
+            with tqdm(total=len(words), desc="Scraping words") as progress:
+                for task in asyncio.as_completed(tasks):
+                    url_words, result = await task
+                    progress.update(len(url_words))
+                    if not result:
+                        continue
+                    for word in url_words:
+                        word_result = dict(result, word=word)
+                        results.append(word_result)
+                        if on_result:
+                            on_result(word_result)
+
+    shared = len(words) - len(words_by_url)
+    if shared:
+        print("Coalesced requests: {} duplicate fetches absorbed, {} fetches".format(shared, len(words_by_url)))
+    return results
+
+def run_async_engine(words: List[str], proxy_manager, parse, url_for, headers, **kwargs) -> List[Dict]:
+    """Blocking entry point used by webster_scraper.main"""
+    return asyncio.run(scrape_words_async(words, proxy_manager, parse, url_for, headers, **kwargs))
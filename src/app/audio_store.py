@@ -0,0 +1,124 @@
+"""
+Pronunciation audio stored once per clip
+
+    audio/
+        index.sqlite            words: (word, pronunciation number) -> clip
+                                clips: clip -> size of the complete file
+        a/abacus01.mp3          audio/{audio_dir}/{audio_file}.mp3
+        bix/bixcap01.mp3
+        ...
+
+Clips are keyed like MW's own URLs ("{data-dir}/{data-file}") and sharded
+into the data-dir subdirectories, so no directory holds more than one
+shard's files. Words sharing a clip (inflections, variants) point at the
+same file through the index, so each clip is downloaded once, and finding a
+word's audio is one indexed lookup instead of a directory scan.
+
+Files written by older versions as audio/{word}_pronunciation.mp3 are moved
+into the store by `python webster_audio.py migrate`.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+AUDIO_DIR = 'audio'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS words (
+    word TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    clip TEXT NOT NULL,
+    PRIMARY KEY (word, number)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS clips (
+    clip TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+def clip_key(audio_dir: str, audio_file: str) -> str:
+    """"{audio_dir}/{audio_file}", refusing names that would leave the shard"""
+    for part in (audio_dir, audio_file):
+        if not part or part in ('.', '..') or '/' in part or '\\' in part:
+            raise ValueError("Invalid audio name: {!r}/{!r}".format(audio_dir, audio_file))
+    return '{}/{}'.format(audio_dir, audio_file)
+
+class AudioStore:
+    def __init__(self, directory: str = AUDIO_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, 'index.sqlite')
+        self._local = threading.local()
+        os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread, reopened in forked worker processes
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.index_path, timeout=60, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def path(self, clip: str) -> str:
+        """File of a clip: audio/{audio_dir}/{audio_file}.mp3"""
+        return os.path.join(self.directory, *clip.split('/')) + '.mp3'
+
+    def index(self, entries: Iterable[Tuple[str, int, str]]) -> int:
+        """Point (word, pronunciation number) at a clip for every (word, number, clip), return how many"""
+        connection = self._connection()
+        rows = list(entries)
+        connection.execute('BEGIN')
+        try:
+            connection.executemany('INSERT OR REPLACE INTO words VALUES (?, ?, ?)', rows)
+        except BaseException:
+            # Don't leave this thread's connection inside the transaction
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+        return len(rows)
+
+    def clip_of(self, word: str, number: int = 1) -> Optional[str]:
+        row = self._connection().execute(
+            'SELECT clip FROM words WHERE word = ? AND number = ?', (word, number)).fetchone()
+        return row[0] if row else None
+
+    def lookup(self, word: str, number: int = 1) -> Optional[str]:
+        """Path of a word's downloaded audio, None if it has none (yet)"""
+        clip = self.clip_of(word, number)
+        return self.path(clip) if clip is not None and self.is_complete(clip) else None
+
+    def word_clips(self, word: str) -> Dict[int, str]:
+        """Clips of every pronunciation of a word, by number"""
+        return dict(self._connection().execute('SELECT number, clip FROM words WHERE word = ?', (word,)))
+
+    def is_complete(self, clip: str) -> bool:
+        """Whether a clip's file exists with the size it was stored with"""
+        row = self._connection().execute('SELECT size FROM clips WHERE clip = ?', (clip,)).fetchone()
+        if row is None:
+            return False
+        path = self.path(clip)
+        return os.path.exists(path) and os.path.getsize(path) == row[0]
+
+    def record(self, clip: str, size: int):
+        """Remember a clip's file as complete (called after it was renamed into place)"""
+        self._connection().execute('INSERT OR REPLACE INTO clips VALUES (?, ?, ?)', (clip, size, time.time()))
+
+    def clips(self) -> Iterator[str]:
+        """Every clip some word points at"""
+        for (clip,) in self._connection().execute('SELECT DISTINCT clip FROM words ORDER BY clip'):
+            yield clip
+
+    def counts(self) -> Dict[str, int]:
+        connection = self._connection()
+        return {
+            'words': connection.execute('SELECT COUNT(*) FROM words').fetchone()[0],
+            'clips': connection.execute('SELECT COUNT(DISTINCT clip) FROM words').fetchone()[0],
+            'stored': connection.execute('SELECT COUNT(*) FROM clips').fetchone()[0],
+        }
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark ProxyScheduler against the old linear-scan get_next_proxy
+
+Simulates a pool of proxies with hidden success rates and latencies and a set
+of worker threads that acquire a proxy, "make a request" (sleep for the
+proxy's latency, scaled down) and report the outcome.
+
+    python bench_proxy_scheduler.py --proxies 2000 --workers 200 --duration 10
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+from typing import Dict, List
+
+from proxy_pool import ProxyScheduler
+
+class LegacyScanScheduler:
+    """The pre-heap ProxyManager.get_next_proxy/mark_proxy_status logic"""
+
+    def __init__(self, proxies: List[Dict[str, str]], cooldown: float):
+        self.proxies = list(proxies)
+        self.cooldown = cooldown
+        self.proxy_status = {str(p): True for p in self.proxies}
+        self.proxy_last_used = {str(p): 0 for p in self.proxies}
+        self.proxy_index = 0
+        self.proxy_lock = threading.Lock()
+
+    def acquire(self) -> Dict[str, str]:
+        with self.proxy_lock:
+            while True:
+                for _ in range(len(self.proxies)):
+                    proxy = self.proxies[self.proxy_index]
+                    self.proxy_index = (self.proxy_index + 1) % len(self.proxies)
+                    if not self.proxy_status[str(proxy)]:
+                        continue
+                    last_used = self.proxy_last_used[str(proxy)]
+                    if last_used > 0 and time.time() - last_used < self.cooldown:
+                        continue
+                    self.proxy_last_used[str(proxy)] = time.time()
+                    return proxy
+                for p in self.proxy_status:
+                    self.proxy_status[p] = True
+
+    def release(self, proxy: Dict[str, str], success: bool, latency: float = None):
+        with self.proxy_lock:
+            self.proxy_status[str(proxy)] = success
+            if not success and not any(self.proxy_status.values()):
+                for p in self.proxy_status:
+                    self.proxy_status[p] = True
+
+def make_proxies(count: int, seed: int) -> Dict[str, Dict]:
+    """Proxy dicts plus their hidden success rate and latency"""
+    rng = random.Random(seed)
+    proxies = {}
+    for i in range(count):
+        url = "http://10.{}.{}.{}:8080".format(i // 65536, (i // 256) % 256, i % 256)
+        proxies[url] = {
+            'proxy': {"http": url, "https": None},
+            'success_rate': rng.choice([rng.uniform(0.9, 0.99), rng.uniform(0.3, 0.9), rng.uniform(0.0, 0.3)]),
+            'latency': rng.lognormvariate(0, 0.7),  # Seconds, median 1 s
+        }
+    return proxies
+
+def run(scheduler, proxies: Dict[str, Dict], workers: int, duration: float, time_scale: float) -> Dict:
+    stop = threading.Event()
+    lock = threading.Lock()
+    acquire_times = []
+    outcomes = []
+    picked_latencies = []
+
+    def worker(worker_id: int):
+        rng = random.Random(worker_id)
+        local_acquire, local_outcomes, local_latencies = [], [], []
+        while not stop.is_set():
+            started = time.perf_counter()
+            proxy = scheduler.acquire()
+            local_acquire.append(time.perf_counter() - started)
+
+            info = proxies[proxy['http']]
+            latency = info['latency'] * rng.uniform(0.8, 1.2)
+            time.sleep(latency * time_scale)
+            success = rng.random() < info['success_rate']
+            scheduler.release(proxy, success, latency * time_scale)
+            local_outcomes.append(success)
+            local_latencies.append(info['latency'])
+        with lock:
+            acquire_times.extend(local_acquire)
+            outcomes.extend(local_outcomes)
+            picked_latencies.extend(local_latencies)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    acquire_times.sort()
+    return {
+        'requests': len(outcomes),
+        'requests_per_s': len(outcomes) / elapsed,
+        'success_rate': sum(outcomes) / len(outcomes) if outcomes else 0,
+        'mean_proxy_latency_s': statistics.mean(picked_latencies) if picked_latencies else 0,
+        'acquire_p50_us': acquire_times[len(acquire_times) // 2] * 1e6 if acquire_times else 0,
+        'acquire_p99_us': acquire_times[int(len(acquire_times) * 0.99)] * 1e6 if acquire_times else 0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--proxies', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per scheduler")
+    parser.add_argument('--time-scale', type=float, default=0.01,
+                        help="Multiplier applied to simulated latencies and cooldowns")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    proxies = make_proxies(args.proxies, args.seed)
+    proxy_list = [info['proxy'] for info in proxies.values()]
+    cooldown = 0.2 * args.time_scale
+
+    schedulers = {
+        'linear scan': LegacyScanScheduler(proxy_list, cooldown),
+        'heap scheduler': ProxyScheduler(proxy_list, cooldown=cooldown, reference_latency=args.time_scale),
+    }
+
+    print(f"{args.proxies} proxies, {args.workers} workers, {args.duration:.0f}s per run")
+    for name, scheduler in schedulers.items():
+        stats = run(scheduler, proxies, args.workers, args.duration, args.time_scale)
+        print(f"\n{name}:")
+        print(f"  requests/s:          {stats['requests_per_s']:.0f} ({stats['requests']} total)")
+        print(f"  success rate:        {stats['success_rate'] * 100:.1f}%")
+        print(f"  mean proxy latency:  {stats['mean_proxy_latency_s']:.2f}s (unscaled)")
+        print(f"  acquire p50 / p99:   {stats['acquire_p50_us']:.0f}us / {stats['acquire_p99_us']:.0f}us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Priority job queue feeding a set of executors until no work is left
+
+Used by webster_scraper's global schedule: browse pages and word batches of
+every letter go through one queue, so a letter's stragglers never leave the
+pool idle while other letters still have work.
+
+    queue = JobQueue({'browse': (thread_pool, 50), 'words': (process_pool, 100)})
+    queue.push('browse', (0, page), get_page_words, (page, ...), on_done)
+    queue.run()
+
+Each executor has its own heap, ordered by the job's priority tuple (lowest
+first), and is kept at its in-flight limit while it has queued jobs.
+Callbacks get the finished future and run on the thread calling run(), so they
+can push follow-up jobs and update shared state without locks. A job pushed
+with a delay (a retry backing off) waits in the queue, not in a worker.
+"""
+
+import heapq
+import itertools
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Callable, Dict, Tuple
+
+class JobQueue:
+    def __init__(self, executors: Dict[str, Tuple[Executor, int]]):
+        """
+        Args:
+            executors: Executor and maximum jobs in flight, by name
+        """
+        self.executors = executors
+        self.heaps = {name: [] for name in executors}
+        self.delayed = []  # (due time, order, executor name, job) not yet runnable
+        self.in_flight = {}  # future -> (executor name, callback)
+        self.running = {name: 0 for name in executors}
+        self._order = itertools.count()  # FIFO among equal priorities
+        self.completed = {name: 0 for name in executors}
+        self._busy = {name: 0.0 for name in executors}  # job-seconds in flight
+        self._elapsed = 0.0
+
+    def push(self, executor: str, priority: Tuple, fn: Callable, args: Tuple = (),
+             callback: Callable[[Future], None] = None, delay: float = 0):
+        """Queue fn(*args) on an executor, runnable after `delay` seconds; callback(future) runs when it finishes"""
+        job = (priority, next(self._order), fn, args, callback)
+        if delay > 0:
+            heapq.heappush(self.delayed, (time.monotonic() + delay, job[1], executor, job))
+        else:
+            heapq.heappush(self.heaps[executor], job)
+
+    def _fill(self):
+        now = time.monotonic()
+        while self.delayed and self.delayed[0][0] <= now:
+            _, _, name, job = heapq.heappop(self.delayed)
+            heapq.heappush(self.heaps[name], job)
+        for name, (executor, limit) in self.executors.items():
+            heap = self.heaps[name]
+            while heap and self.running[name] < limit:
+                _, _, fn, args, callback = heapq.heappop(heap)
+                self.in_flight[executor.submit(fn, *args)] = (name, callback)
+                self.running[name] += 1
+
+    def run(self):
+        """Run until every queued job, including ones pushed by callbacks, has finished"""
+        started = time.monotonic()
+        self._fill()
+        last = started
+        while self.in_flight or self.delayed:
+            timeout = max(0.0, self.delayed[0][0] - time.monotonic()) if self.delayed else None
+            if self.in_flight:
+                done, _ = wait(list(self.in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+            else:
+                time.sleep(timeout)
+                done = ()
+            now = time.monotonic()
+            for name in self.executors:
+                self._busy[name] += self.running[name] * (now - last)
+            last = now
+
+            for future in done:
+                name, callback = self.in_flight.pop(future)
+                self.running[name] -= 1
+                self.completed[name] += 1
+                if callback:
+                    callback(future)
+            self._fill()
+        self._elapsed += time.monotonic() - started
+
+    def utilization(self) -> Dict[str, float]:
+        """Mean jobs in flight as a fraction of each executor's limit"""
+        if not self._elapsed:
+            return {name: 0.0 for name in self.executors}
+        return {name: self._busy[name] / self._elapsed / limit
+                for name, (_, limit) in self.executors.items()}
+
+    def print_summary(self):
+        utilization = self.utilization()
+        print("Job queue: {:.0f}s, ".format(self._elapsed) + ", ".join(
+            "{} {} jobs ({:.0f}% of slots busy)".format(name, self.completed[name], utilization[name] * 100)
+            for name in self.executors))
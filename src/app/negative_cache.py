@@ -0,0 +1,167 @@
+"""
+Persistent cache of words known to have no page (or no audio)
+
+    negative_cache.sqlite       (kind, word) -> failure class, expiry
+
+Terminal misses - a 404, or a page that still had no entry after every parse
+attempt (RetryPolicy.is_terminal) - are recorded here with a TTL per failure
+class, and the scrapers, pronunciation checker and audio downloader look a
+word up before fetching it, so a known miss costs no request on the next run.
+Blocked or proxy failures, and retries cut short by the retry budget, are
+not terminal and are never recorded. A page in the page cache is always
+read before the negative cache is consulted.
+
+Word lists of earlier failures can be seeded from the command line:
+
+    python negative_cache.py import ../../finalcwlfails.txt
+    python negative_cache.py list
+    python negative_cache.py forget "some word"
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, Optional
+
+from proxy_pool import NOT_FOUND, PARSE_FAILED
+
+NEGATIVE_CACHE_FILE = 'negative_cache.sqlite'
+
+# Seconds a miss is trusted, by failure class
+TTLS = {
+    NOT_FOUND: 30 * 24 * 3600,
+    PARSE_FAILED: 7 * 24 * 3600,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS misses (
+    kind TEXT NOT NULL,
+    word TEXT NOT NULL,
+    failure TEXT NOT NULL,
+    source TEXT,
+    recorded_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (kind, word)
+)
+"""
+
+class NegativeCache:
+    def __init__(self, path: str = NEGATIVE_CACHE_FILE, ttls: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            path: SQLite file
+            ttls: Seconds a miss is trusted, by failure class (classes not
+                listed are not recorded)
+        """
+        self.path = path
+        self.ttls = ttls or TTLS
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.recorded = 0
+        self._connection().execute(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread, reopened in forked worker processes
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def lookup(self, word: str, kind: str = 'page') -> Optional[Dict]:
+        """Unexpired miss recorded for a word, if any"""
+        row = self._connection().execute(
+            'SELECT * FROM misses WHERE kind = ? AND word = ? AND expires_at > ?',
+            (kind, word, time.time())).fetchone()
+        if row is None:
+            return None
+        with self._lock:
+            self.hits += 1
+        return dict(row)
+
+    def record(self, word: str, failure: str, kind: str = 'page', source: Optional[str] = None) -> bool:
+        """Remember a terminal miss; False if the failure class is not cached"""
+        ttl = self.ttls.get(failure)
+        if ttl is None:
+            return False
+        now = time.time()
+        self._connection().execute(
+            'INSERT OR REPLACE INTO misses VALUES (?, ?, ?, ?, ?, ?)',
+            (kind, word, failure, source, now, now + ttl))
+        with self._lock:
+            self.recorded += 1
+        return True
+
+    def forget(self, word: str, kind: Optional[str] = None) -> int:
+        """Drop a word's misses (all kinds by default), return how many were dropped"""
+        if kind is None:
+            cursor = self._connection().execute('DELETE FROM misses WHERE word = ?', (word,))
+        else:
+            cursor = self._connection().execute('DELETE FROM misses WHERE kind = ? AND word = ?', (kind, word))
+        return cursor.rowcount
+
+    def purge_expired(self) -> int:
+        return self._connection().execute('DELETE FROM misses WHERE expires_at <= ?', (time.time(),)).rowcount
+
+    def entries(self) -> Iterator[Dict]:
+        for row in self._connection().execute('SELECT * FROM misses ORDER BY kind, word'):
+            yield dict(row)
+
+    def summary(self) -> Optional[str]:
+        with self._lock:
+            if not self.hits and not self.recorded:
+                return None
+            return "Negative cache: {} known misses skipped, {} new misses recorded".format(self.hits, self.recorded)
+
+    def __len__(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM misses').fetchone()[0]
+
+def read_failed_words(path: str) -> Iterator[str]:
+    """Words from a scraping results file ("- word" lines) or a plain one-word-per-line list"""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line.rstrip('\n') for line in f]
+    listed = [m.group(1).strip() for m in map(re.compile(r'^\s*-\s+(.+)$').match, lines) if m]
+    for word in listed or lines:
+        word = word.strip().lower()
+        if word:
+            yield word
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or seed the negative cache of known-missing words")
+    commands = parser.add_subparsers(dest='command', required=True)
+    seed = commands.add_parser('import', help="Record the words of a failure list as misses")
+    seed.add_argument('file')
+    seed.add_argument('--failure', choices=sorted(TTLS), default=NOT_FOUND)
+    seed.add_argument('--kind', default='page', help="page (word pages) or audio")
+    commands.add_parser('list', help="Print every recorded miss")
+    forget = commands.add_parser('forget', help="Drop the misses of a word so it is fetched again")
+    forget.add_argument('word')
+    commands.add_parser('purge', help="Drop expired misses")
+    args = parser.parse_args()
+
+    cache = NegativeCache()
+    if args.command == 'import':
+        words = set(read_failed_words(args.file))
+        for word in words:
+            cache.record(word, args.failure, args.kind, source=os.path.basename(args.file))
+        print("Recorded {} words from {} as {}".format(len(words), args.file, args.failure))
+    elif args.command == 'list':
+        for entry in cache.entries():
+            print("{kind}\t{word}\t{failure}\t{source}\texpires {0}".format(
+                time.strftime('%Y-%m-%d', time.localtime(entry['expires_at'])), **entry))
+        print("{} misses".format(len(cache)))
+    elif args.command == 'forget':
+        print("Dropped {} misses of '{}'".format(cache.forget(args.word), args.word))
+    elif args.command == 'purge':
+        print("Dropped {} expired misses".format(cache.purge_expired()))
+
+if __name__ == "__main__":
+    main()
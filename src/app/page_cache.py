@@ -0,0 +1,214 @@
+"""
+Content-addressed on-disk cache of fetched dictionary pages
+
+    page_cache/
+        index.sqlite            url -> digest, validators, fetch time, profile;
+                                redirects: url -> url it redirected to
+        blobs/ab/<sha256>.html.gz
+
+Pages are stored gzip-compressed under the SHA-256 of their content, so
+identical pages (a word and its redirect target, unchanged re-fetches) are
+kept once. The index holds the ETag/Last-Modified of every URL for
+conditional re-fetches once an entry is older than `max_age`.
+
+Streamed fetches (page_fetch) stop once their extraction profile is complete,
+so an entry can be a page prefix: `profile` records what it was read for and
+`complete` whether the whole page was read. An 'entry' prefix covers every
+profile; a 'pronunciation' prefix only covers pronunciation lookups.
+
+Pages are stored under their final, canonical URL (page_fetch.canonical_url)
+and every redirect seen is recorded, so an inflected form ("borrows") that
+redirects to a lemma ("borrow") is answered from the lemma's entry by get()
+without another download.
+
+The index is SQLite in WAL mode, safe to share between the scraper's threads
+and worker processes.
+"""
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+from word_urls import canonical_url
+
+PAGE_CACHE_DIR = 'page_cache'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    profile TEXT,
+    complete INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at TEXT NOT NULL,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS redirects (
+    url TEXT PRIMARY KEY,
+    target TEXT NOT NULL,
+    recorded_at REAL NOT NULL
+)
+"""
+
+# Hops followed through recorded redirects before giving up (loops, long chains)
+MAX_REDIRECTS = 5
+
+def blob_path(directory: str, digest: str) -> str:
+    return os.path.join(directory, 'blobs', digest[:2], '{}.html.gz'.format(digest))
+
+def read_blob(directory: str, digest: str) -> str:
+    """Cached page text by content digest"""
+    with gzip.open(blob_path(directory, digest), 'rb') as f:
+        return f.read().decode('utf-8')
+
+def covers(entry: Dict, profile: Optional[str]) -> bool:
+    """Whether a cached entry has everything a fetch with `profile` needs (None: whole page)"""
+    if entry['complete']:
+        return True
+    return profile is not None and entry['profile'] in ('entry', profile)
+
+class PageCache:
+    def __init__(self, directory: str = PAGE_CACHE_DIR, max_age: Optional[float] = None):
+        """
+        Args:
+            directory: Cache root
+            max_age: Seconds before an entry is revalidated with a conditional
+                request (None: cached pages never expire)
+        """
+        self.directory = directory
+        self.max_age = max_age
+        self._local = threading.local()
+        os.makedirs(os.path.join(directory, 'blobs'), exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+        self._canonicalize_keys()
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread, reopened in forked worker processes
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(os.path.join(self.directory, 'index.sqlite'), timeout=60, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _canonicalize_keys(self):
+        # Entries stored before keys were canonical (raw or differently quoted
+        # URLs) are moved to their canonical URL, once per cache
+        connection = self._connection()
+        if connection.execute('PRAGMA user_version').fetchone()[0] >= 1:
+            return
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            if connection.execute('PRAGMA user_version').fetchone()[0] < 1:
+                for (url,) in connection.execute('SELECT url FROM pages').fetchall():
+                    canonical = canonical_url(url)
+                    if canonical != url:
+                        connection.execute('INSERT OR IGNORE INTO pages SELECT ?, digest, size, profile, complete, etag, '
+                                           'last_modified, fetched_at, checked_at FROM pages WHERE url = ?', (canonical, url))
+                        connection.execute('DELETE FROM pages WHERE url = ?', (url,))
+                connection.execute('PRAGMA user_version = 1')
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Index entry of a URL, if cached"""
+        row = self._connection().execute('SELECT * FROM pages WHERE url = ?', (url,)).fetchone()
+        return dict(row) if row else None
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return self.max_age is None or time.time() - entry['checked_at'] < self.max_age
+
+    def resolve(self, url: str) -> str:
+        """URL a request for `url` ends up at, following recorded redirects"""
+        connection = self._connection()
+        for _ in range(MAX_REDIRECTS):
+            row = connection.execute('SELECT target FROM redirects WHERE url = ?', (url,)).fetchone()
+            if row is None:
+                break
+            url = row[0]
+        return url
+
+    def add_redirect(self, url: str, target: str):
+        """Record that `url` redirects to `target`"""
+        if url != target:
+            self._connection().execute('INSERT OR REPLACE INTO redirects VALUES (?, ?, ?)', (url, target, time.time()))
+
+    def redirects(self) -> Iterator[Dict]:
+        """Every recorded redirect"""
+        for row in self._connection().execute('SELECT * FROM redirects ORDER BY url'):
+            yield dict(row)
+
+    def get(self, url: str, profile: Optional[str] = 'entry') -> Optional[str]:
+        """Cached page text if a fresh entry covers `profile` (following recorded redirects)"""
+        entry = self.lookup(self.resolve(url))
+        if entry is None or not covers(entry, profile) or not self.is_fresh(entry):
+            return None
+        return self.read(entry)
+
+    def read(self, entry: Dict) -> Optional[str]:
+        try:
+            return read_blob(self.directory, entry['digest'])
+        except (OSError, EOFError, UnicodeDecodeError):
+            return None  # Missing or damaged blob: treat as a miss
+
+    def validators(self, url: str, profile: Optional[str] = 'entry') -> Dict[str, str]:
+        """Conditional request headers for a stale entry that would cover `profile`"""
+        entry = self.lookup(url)
+        if entry is None or not covers(entry, profile) or not os.path.exists(blob_path(self.directory, entry['digest'])):
+            return {}
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(
+        self,
+        url: str,
+        html: str,
+        profile: Optional[str] = None,
+        complete: bool = True,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> str:
+        """Store a fetched page (or page prefix), return its content digest"""
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = blob_path(self.directory, digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = '{}.{}.{}.tmp'.format(path, os.getpid(), threading.get_ident())
+            with open(temp_path, 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=6))
+            os.replace(temp_path, path)
+
+        self._connection().execute(
+            'INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (url, digest, len(data), profile, int(complete), etag, last_modified,
+             datetime.utcnow().isoformat(), time.time()))
+        return digest
+
+    def touch(self, url: str):
+        """Mark an entry as just revalidated (304 Not Modified)"""
+        self._connection().execute('UPDATE pages SET checked_at = ? WHERE url = ?', (time.time(), url))
+
+    def entries(self) -> Iterator[Dict]:
+        """Every index entry"""
+        for row in self._connection().execute('SELECT * FROM pages ORDER BY url'):
+            yield dict(row)
+
+    def __len__(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM pages').fetchone()[0]
@@ -0,0 +1,179 @@
+"""
+Streamed fetching of dictionary pages with early abort
+
+Instead of downloading a whole page and parsing `response.text`, the body is
+read in chunks and fed to a WordPageExtractor. Once the fields of the
+extraction profile are complete the connection is closed, so the rest of the
+page never crosses the proxy.
+
+    extractor, transfer = fetch_word_page(session, url, word, 'pronunciation',
+                                          proxies=proxy, timeout=10)
+    result = extractor.text_pronunciations()
+
+`transfer` has the bytes read off the wire and, when the server sent a
+Content-Length, the bytes saved by stopping early.
+
+With a PageCache, whatever was read is stored, stale entries are revalidated
+with If-None-Match/If-Modified-Since, and extract_cached() answers from the
+cache without a request (check it before picking a proxy).
+
+Redirects are followed here rather than by requests: each hop is recorded in
+the cache, and when it leads to a page that is already cached (an inflected
+form redirecting to its lemma) the page is answered from the cache without
+downloading it again. `transfer['url']` is the final, canonical URL. A
+`reuse` callback is asked about that URL before the cached page is parsed:
+when it has a result already (webster_scraper's shared parse results), the
+extractor is None and the result is in `transfer['reused']`.
+"""
+
+import codecs
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+
+from page_cache import PageCache
+from page_parsers import WordPageExtractor
+from word_urls import canonical_url
+
+CHUNK_SIZE = 8192
+
+MAX_REDIRECTS = 5
+
+def fetch_word_page(
+    session: requests.Session,
+    url: str,
+    word: str,
+    profile: str = 'entry',
+    chunk_size: int = CHUNK_SIZE,
+    cache: Optional[PageCache] = None,
+    reuse: Optional[Callable[[str], Optional[Any]]] = None,
+    **request_kwargs
+) -> Tuple[Optional[WordPageExtractor], Dict]:
+    """GET a word page, feeding the body to an extractor until its profile is complete"""
+    url = canonical_url(url)
+    if cache is not None:
+        url = cache.resolve(url)
+    request_kwargs['allow_redirects'] = False
+    headers = request_kwargs.pop('headers', None) or {}
+
+    for _ in range(MAX_REDIRECTS + 1):
+        validators = cache.validators(url, profile) if cache is not None else {}
+        response = session.get(url, stream=True, headers=dict(headers, **validators), **request_kwargs)
+        if response.is_redirect:
+            target = canonical_url(urljoin(url, response.headers['Location']))
+            response.close()
+            if cache is not None:
+                cache.add_redirect(url, target)
+                transfer = {'bytes_read': 0, 'bytes_saved': None, 'aborted': False, 'cached': True, 'url': target}
+                reused = reuse(target) if reuse is not None else None
+                if reused is not None:
+                    return None, dict(transfer, reused=reused)
+                extractor = extract_cached(cache, target, word, profile)
+                if extractor is not None:
+                    return extractor, transfer
+            url = target
+            continue
+        return _read_word_page(response, url, word, profile, chunk_size, cache)
+    raise requests.exceptions.TooManyRedirects("More than {} redirects from {}".format(MAX_REDIRECTS, url))
+
+def _read_word_page(
+    response: requests.Response,
+    url: str,
+    word: str,
+    profile: str,
+    chunk_size: int,
+    cache: Optional[PageCache]
+) -> Tuple[WordPageExtractor, Dict]:
+    extractor = WordPageExtractor(word, profile)
+    try:
+        if response.status_code == 304 and cache is not None:
+            html = cache.read(cache.lookup(url))
+            if html is None:
+                raise requests.exceptions.HTTPError("304 Not Modified but the cached page is gone", response=response)
+            cache.touch(url)
+            extractor.feed_all(html)
+            return extractor, {'bytes_read': 0, 'bytes_saved': None, 'aborted': False, 'cached': True, 'url': url}
+        response.raise_for_status()
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+        received = 0
+        pieces = []
+        for chunk in response.iter_content(chunk_size):
+            received += len(chunk)
+            text = decoder.decode(chunk)
+            pieces.append(text)
+            extractor.feed(text)
+            if extractor.done:
+                break
+        else:
+            pieces.append(decoder.decode(b'', final=True))
+            extractor.feed(pieces[-1])
+            extractor.close()
+
+        if cache is not None:
+            cache.put(url, ''.join(pieces), profile, complete=not extractor.done,
+                      etag=response.headers.get('ETag'), last_modified=response.headers.get('Last-Modified'))
+
+        # Wire bytes (compressed if gzip) against the advertised length;
+        # urllib3 does not count chunked transfers, use the decoded size then
+        bytes_read = response.raw.tell() or received
+        content_length = response.headers.get('Content-Length')
+        transfer = {
+            'bytes_read': bytes_read,
+            'bytes_saved': max(int(content_length) - bytes_read, 0) if content_length else None,
+            'aborted': extractor.done,
+            'cached': False,
+            'url': url,
+        }
+    finally:
+        # Unread body: urllib3 drops the connection instead of reusing it
+        response.close()
+    return extractor, transfer
+
+def extract_cached(cache: Optional[PageCache], url: str, word: str, profile: str = 'entry') -> Optional[WordPageExtractor]:
+    """Extractor fed from a fresh cached page covering `profile`, or None on a miss"""
+    if cache is None:
+        return None
+    html = cache.get(url, profile)
+    if html is None:
+        return None
+    return WordPageExtractor(word, profile).feed_all(html)
+
+def format_transfer(transfer: Dict) -> str:
+    if transfer.get('cached'):
+        return "cached"
+    saved = "{:.0f} KB saved".format(transfer['bytes_saved'] / 1024) if transfer['bytes_saved'] is not None else "saved n/a"
+    return "{:.0f} KB read, {}".format(transfer['bytes_read'] / 1024, saved)
+
+class TransferStats:
+    """Thread-safe totals of fetch_word_page() transfers"""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.pages = 0
+        self.cached = 0
+        self.aborted = 0
+        self.bytes_read = 0
+        self.bytes_saved = 0
+        self.unknown_length = 0
+
+    def add(self, transfer: Dict):
+        with self.lock:
+            self.pages += 1
+            self.cached += transfer.get('cached', False)
+            self.aborted += transfer['aborted']
+            self.bytes_read += transfer['bytes_read']
+            if transfer['bytes_saved'] is None:
+                self.unknown_length += 1
+            else:
+                self.bytes_saved += transfer['bytes_saved']
+
+    def summary(self) -> Optional[str]:
+        with self.lock:
+            if not self.pages:
+                return None
+            return "Transfers: {} pages ({} from cache, {} stopped early), {:.1f} MB read, {:.1f} MB saved, {:.0f} KB/page read{}".format(
+                self.pages, self.cached, self.aborted, self.bytes_read / 1048576, self.bytes_saved / 1048576,
+                self.bytes_read / 1024 / self.pages,
+                ", {} without Content-Length".format(self.unknown_length) if self.unknown_length else "")
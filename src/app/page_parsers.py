@@ -0,0 +1,758 @@
+#!/usr/bin/env python3
+"""
+Pluggable HTML parser backends for Merriam-Webster pages
+
+Every backend implements the same extraction logic:
+    word_page(word, html)           part of speech, pronunciations (with their
+                                    span.mw text), etymology, senses and
+                                    examples (webster_scraper)
+    browse_page(html)               words listed on a browse page
+    total_pages(html)               page count of a browse letter
+    text_pronunciations(word, html) span.mw pronunciations (update_pronunciations)
+
+Backends:
+    bs4     BeautifulSoup with html.parser (the original implementation)
+    lxml    lxml.html with precompiled XPath, several times faster
+    stream  one pass over html.parser's token stream (WordPageExtractor) that
+            stops at the end of the dictionary column; pages can be fed in
+            chunks as they download. Browse pages use the tree backend.
+
+Check that backends agree and measure them on saved pages (tests/fixtures/word_pages
+has a few, checked by tests/test_page_parsers.py):
+    python page_parsers.py parity <dir with *.html>
+    python page_parsers.py bench <dir with *.html> [--parsers bs4 lxml stream]
+"""
+
+import argparse
+import glob
+import os
+import time
+from datetime import datetime
+from html import escape
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # Optional, the bs4 backend is used without it
+    lxml = None
+
+AUDIO_URL = "https://media.merriam-webster.com/audio/prons/en/us/mp3/{}/{}.mp3"
+
+def make_pronunciation(pron_text: str, audio_dir: Optional[str], audio_file: Optional[str]) -> Dict:
+    """Pronunciation entry as stored in the results"""
+    if audio_dir and audio_file:
+        audio_url = AUDIO_URL.format(audio_dir, audio_file)
+    else:
+        audio_url = None
+    return {
+        'text': pron_text,
+        'audio_dir': audio_dir,
+        'audio_file': audio_file,
+        'audio_url': audio_url
+    }
+
+def make_word_result(word: str, word_class, syllables, pronunciations, etymology, definitions,
+                     text_pronunciations: List[str]) -> Dict:
+    return {
+        'word': word,
+        'part_of_speech': word_class,
+        'syllables': syllables,
+        'pronunciations': pronunciations,
+        'text_pronunciations': text_pronunciations,
+        'etymology': etymology,
+        'definitions': definitions,
+        'scraped_at': datetime.utcnow().isoformat()
+    }
+
+def is_empty_entry(result: Dict) -> bool:
+    """Whether a parsed word page has no entry at all (an error or block page, not a dictionary page)"""
+    return not (result['part_of_speech'] or result['pronunciations'] or result['definitions'])
+
+def clean_definition(definition_text: str) -> str:
+    if definition_text.startswith(': '):
+        definition_text = definition_text[2:]
+    return definition_text
+
+def add_unique(values: List[str], value: str):
+    if value and value not in values:
+        values.append(value)
+
+class BeautifulSoupParser:
+    name = 'bs4'
+
+    def word_page(self, word: str, html: str) -> Dict:
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # Get word class (part of speech)
+        word_class = None
+        pos_spans = soup.select('span.fl')
+        if pos_spans:
+            word_class = pos_spans[0].text.strip()
+
+        # Get syllables and pronunciations
+        syllables = None
+        pronunciations = []
+
+        # Find the main pronunciation section
+        pron_section = soup.find('span', class_='prons-entries-list-inline')
+        if pron_section:
+            for pron_link in pron_section.find_all('a', class_='play-pron-v2'):
+                # Get the pronunciation text (remove &nbsp; and other whitespace)
+                pron_text = pron_link.get_text(strip=True).replace('\xa0', '')
+                if not pron_text:
+                    continue
+                pronunciations.append(make_pronunciation(pron_text, pron_link.get('data-dir'), pron_link.get('data-file')))
+
+                # Use the first pronunciation as syllables if not set
+                if syllables is None:
+                    syllables = pron_text
+
+        # Get etymology if available
+        etymology = None
+        etym_element = soup.select_one('p.et')
+        if etym_element:
+            etymology = etym_element.text.strip()
+
+        # Get definitions and examples
+        definitions = []
+        for group_num, group in enumerate(soup.select('div.sense'), 1):
+            definition_element = group.select_one('span.dtText')
+            if not definition_element:
+                continue
+            definition_text = clean_definition(definition_element.get_text(separator=' ', strip=True))
+
+            examples = []
+            for example in group.select('span.ex-sent'):
+                attribution = None
+                auth_element = example.select_one('span.auth')
+                if auth_element:
+                    attribution = auth_element.get_text(strip=True)
+                examples.append({
+                    'text': example.get_text(separator=' ', strip=True),
+                    'attribution': attribution
+                })
+
+            definitions.append({
+                'definition_number': group_num,
+                'definition_text': definition_text,
+                'examples': examples
+            })
+
+        text_pronunciations = self._text_pronunciations(soup, pron_section)
+        return make_word_result(word, word_class, syllables, pronunciations, etymology, definitions, text_pronunciations)
+
+    def browse_page(self, html: str) -> List[str]:
+        soup = BeautifulSoup(html, 'html.parser')
+        words = []
+        for link in soup.select('div.mw-grid-table-list li'):
+            word = link.text.strip()
+            if word:
+                words.append(word)
+        return words
+
+    def total_pages(self, html: str) -> Optional[int]:
+        soup = BeautifulSoup(html, 'html.parser')
+        pagination = soup.find('span', class_='counters')
+        if not pagination:
+            return None
+        return int(pagination.text.strip().split('of')[-1].strip())
+
+    def text_pronunciations(self, word: str, html: str) -> Dict:
+        soup = BeautifulSoup(html, 'html.parser')
+        pron_section = soup.find('span', class_='prons-entries-list-inline')
+        prons = self._text_pronunciations(soup, pron_section)
+        result = {'word': word, 'text_pronunciations': prons}
+
+        # Include the raw pronunciation section for debugging
+        if not prons and pron_section:
+            result['html_structure'] = str(pron_section)
+        return result
+
+    @staticmethod
+    def _text_pronunciations(soup, pron_section) -> List[str]:
+        prons = []
+
+        # Look for the mw span of each prons-entry-list-item first
+        if pron_section:
+            for div in pron_section.find_all('div', class_='prons-entry-list-item'):
+                mw_span = div.find('span', class_='mw')
+                if mw_span:
+                    add_unique(prons, mw_span.get_text(strip=True))
+
+        # Fall back to any span.mw, then pron-spell-content/pr, then IPA
+        if not prons:
+            for span in soup.find_all('span', class_='mw'):
+                add_unique(prons, span.get_text(strip=True))
+        if not prons:
+            for pron_span in soup.find_all('span', class_=['pron-spell-content', 'pr']):
+                add_unique(prons, pron_span.get_text(strip=True).replace('\xa0', ''))
+        if not prons:
+            for ipa in soup.find_all('span', class_='ipa'):
+                add_unique(prons, ipa.get_text(strip=True))
+        return prons
+
+if lxml is not None:
+    def _has_class(name: str) -> str:
+        return "contains(concat(' ', normalize-space(@class), ' '), ' {} ')".format(name)
+
+    def _xpath(expression: str, *classes: str) -> 'etree.XPath':
+        return etree.XPath(expression.format(*(_has_class(c) for c in classes)))
+
+    _NO_TEXT_TAGS = {'script', 'style', 'template'}
+
+    def _strings(element):
+        """Text nodes in document order, skipping comments and script/style like bs4"""
+        if element.tag not in _NO_TEXT_TAGS and element.text:
+            yield element.text
+        for child in element:
+            if isinstance(child.tag, str):  # Comments and PIs have a function as tag
+                yield from _strings(child)
+            if child.tail:
+                yield child.tail
+
+    def _get_text(element, separator: str = '', strip: bool = False) -> str:
+        """Equivalent of bs4's Tag.get_text"""
+        if strip:
+            return separator.join(s.strip() for s in _strings(element) if s.strip())
+        return separator.join(_strings(element))
+
+    class LxmlParser:
+        name = 'lxml'
+
+        _pos = _xpath("(//span[{}])[1]", 'fl')
+        _pron_section = _xpath("(//span[{}])[1]", 'prons-entries-list-inline')
+        _pron_links = _xpath(".//a[{}]", 'play-pron-v2')
+        _etymology = _xpath("(//p[{}])[1]", 'et')
+        _senses = _xpath("//div[{}]", 'sense')
+        _definition = _xpath("(.//span[{}])[1]", 'dtText')
+        _examples = _xpath(".//span[{}]", 'ex-sent')
+        _attribution = _xpath("(.//span[{}])[1]", 'auth')
+        _browse_words = _xpath("//div[{}]//li", 'mw-grid-table-list')
+        _counters = _xpath("(//span[{}])[1]", 'counters')
+        _pron_items = _xpath(".//div[{}]", 'prons-entry-list-item')
+        _mw = _xpath("(.//span[{}])[1]", 'mw')
+        _all_mw = _xpath("//span[{}]", 'mw')
+        _spell = _xpath("//span[{} or {}]", 'pron-spell-content', 'pr')
+        _ipa = _xpath("//span[{}]", 'ipa')
+
+        @staticmethod
+        def _parse(html: str):
+            return lxml.html.document_fromstring(html)
+
+        @staticmethod
+        def _first(xpath, node):
+            found = xpath(node)
+            return found[0] if found else None
+
+        def word_page(self, word: str, html: str) -> Dict:
+            doc = self._parse(html)
+
+            word_class = None
+            pos = self._first(self._pos, doc)
+            if pos is not None:
+                word_class = _get_text(pos).strip()
+
+            syllables = None
+            pronunciations = []
+            pron_section = self._first(self._pron_section, doc)
+            if pron_section is not None:
+                for pron_link in self._pron_links(pron_section):
+                    pron_text = _get_text(pron_link, strip=True).replace('\xa0', '')
+                    if not pron_text:
+                        continue
+                    pronunciations.append(make_pronunciation(pron_text, pron_link.get('data-dir'), pron_link.get('data-file')))
+                    if syllables is None:
+                        syllables = pron_text
+
+            etymology = None
+            etym_element = self._first(self._etymology, doc)
+            if etym_element is not None:
+                etymology = _get_text(etym_element).strip()
+
+            definitions = []
+            for group_num, group in enumerate(self._senses(doc), 1):
+                definition_element = self._first(self._definition, group)
+                if definition_element is None:
+                    continue
+                definition_text = clean_definition(_get_text(definition_element, ' ', strip=True))
+
+                examples = []
+                for example in self._examples(group):
+                    attribution = None
+                    auth_element = self._first(self._attribution, example)
+                    if auth_element is not None:
+                        attribution = _get_text(auth_element, strip=True)
+                    examples.append({
+                        'text': _get_text(example, ' ', strip=True),
+                        'attribution': attribution
+                    })
+
+                definitions.append({
+                    'definition_number': group_num,
+                    'definition_text': definition_text,
+                    'examples': examples
+                })
+
+            text_pronunciations = self._text_pronunciations(doc, pron_section)
+            return make_word_result(word, word_class, syllables, pronunciations, etymology, definitions, text_pronunciations)
+
+        def browse_page(self, html: str) -> List[str]:
+            words = []
+            for item in self._browse_words(self._parse(html)):
+                word = _get_text(item).strip()
+                if word:
+                    words.append(word)
+            return words
+
+        def total_pages(self, html: str) -> Optional[int]:
+            pagination = self._first(self._counters, self._parse(html))
+            if pagination is None:
+                return None
+            return int(_get_text(pagination).strip().split('of')[-1].strip())
+
+        def text_pronunciations(self, word: str, html: str) -> Dict:
+            doc = self._parse(html)
+            pron_section = self._first(self._pron_section, doc)
+            prons = self._text_pronunciations(doc, pron_section)
+            result = {'word': word, 'text_pronunciations': prons}
+            if not prons and pron_section is not None:
+                result['html_structure'] = etree.tostring(pron_section, encoding='unicode', with_tail=False)
+            return result
+
+        def _text_pronunciations(self, doc, pron_section) -> List[str]:
+            prons = []
+            if pron_section is not None:
+                for div in self._pron_items(pron_section):
+                    mw_span = self._first(self._mw, div)
+                    if mw_span is not None:
+                        add_unique(prons, _get_text(mw_span, strip=True))
+
+            if not prons:
+                for span in self._all_mw(doc):
+                    add_unique(prons, _get_text(span, strip=True))
+            if not prons:
+                for pron_span in self._spell(doc):
+                    add_unique(prons, _get_text(pron_span, strip=True).replace('\xa0', ''))
+            if not prons:
+                for ipa in self._ipa(doc):
+                    add_unique(prons, _get_text(ipa, strip=True))
+            return prons
+
+# Extraction profiles of WordPageExtractor: what each one stops after
+PROFILES = {
+    'entry': 'every field of word_page() (end of the dictionary column)',
+    'pronunciation': 'text_pronunciations() only (end of the pronunciation section)',
+}
+
+# Elements bs4 never gives children (html.parser builder) and whose strings
+# get_text() leaves out
+_VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen',
+              'link', 'menuitem', 'meta', 'param', 'source', 'track', 'wbr',
+              'basefont', 'bgsound', 'command', 'frame', 'image', 'isindex', 'nextid', 'spacer'}
+_HIDDEN_TAGS = {'script', 'style', 'template'}
+
+class _Capture:
+    """Text nodes of one element, handed to `on_close` when it ends"""
+    __slots__ = ('strings', 'on_close')
+
+    def __init__(self, on_close):
+        self.strings = []
+        self.on_close = on_close
+
+def _joined(strings: List[str], separator: str = '', strip: bool = False) -> str:
+    if strip:
+        return separator.join(s.strip() for s in strings if s.strip())
+    return separator.join(strings)
+
+class WordPageExtractor(HTMLParser):
+    """
+    Single-pass word page extractor over html.parser's token stream
+
+    Collects everything word_page() and text_pronunciations() need while the
+    page is fed in, and sets `done` as soon as the fields of the extraction
+    profile (see PROFILES) are complete: for 'entry' once the element with id
+    `stop_id` (the dictionary column holding every entry) has closed, for
+    'pronunciation' once the pronunciation section has yielded span.mw text.
+    The rest of the page (related words, footer, scripts) then need not be
+    read or downloaded.
+    Tag nesting follows bs4's html.parser tree builder so results match the
+    bs4 backend.
+    """
+
+    def __init__(self, word: str, profile: str = 'entry', stop_id: Optional[str] = 'left-content'):
+        super().__init__(convert_charrefs=True)
+        if profile not in PROFILES:
+            raise ValueError("Unknown extraction profile '{}' (available: {})".format(profile, ', '.join(PROFILES)))
+        self.word = word
+        self.profile = profile
+        self.stop_id = stop_id
+        self.done = False
+        self._stack = []      # [tag, captures, closers] of open elements
+        self._texts = []      # pending text, merged into one node like bs4
+        self._active = []     # captures receiving text
+        self._hidden = 0      # open script/style/template elements
+
+        self._seen = set()    # 'first match only' selectors already matched
+        self.word_class = None
+        self.etymology = None
+        self._pron_links = []
+        self._pron_items = []
+        self._open_items = []
+        self._pron_raw = None  # Raw markup of the pron section while inside it
+        self._pron_html = None
+        self._senses = []
+        self._open_senses = []
+        self._open_examples = []
+        self._mw_spans = []
+        self._spell_spans = []
+        self._ipa_spans = []
+
+    def feed_all(self, html: str, chunk_size: int = 16384) -> 'WordPageExtractor':
+        """Feed a whole page, stopping as soon as the main entries are done"""
+        for start in range(0, len(html), chunk_size):
+            self.feed(html[start:start + chunk_size])
+            if self.done:
+                return self
+        self.close()
+        return self
+
+    def close(self):
+        super().close()
+        self._flush()
+        while self._stack:
+            self._pop()
+
+    # Tree building
+
+    def _flush(self):
+        if not self._texts:
+            return
+        text = ''.join(self._texts)
+        self._texts.clear()
+        if self._pron_raw is not None:
+            self._pron_raw.append(escape(text, quote=False))
+        if not self._hidden:
+            for capture in self._active:
+                capture.strings.append(text)
+
+    def _capture(self, captures: List[_Capture], on_close):
+        capture = _Capture(on_close)
+        captures.append(capture)
+        self._active.append(capture)
+
+    def _pop(self):
+        tag, captures, closers = self._stack.pop()
+        if self._pron_raw is not None:
+            self._pron_raw.append('</{}>'.format(tag))
+        for capture in captures:
+            self._active.remove(capture)
+            capture.on_close(capture.strings)
+        for closer in closers:
+            closer()
+
+    def _first(self, key: str) -> bool:
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        return True
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        self._flush()
+        attrs = dict(attrs)
+        classes = (attrs.get('class') or '').split()
+        captures, closers = [], []
+
+        if self._pron_raw is not None:
+            self._pron_raw.append(self.get_starttag_text())
+        if tag in _HIDDEN_TAGS:
+            self._hidden += 1
+            closers.append(self._unhide)
+        if classes:
+            self._match(tag, classes, attrs, captures, closers)
+        if self.stop_id and attrs.get('id') == self.stop_id and self._first('stop'):
+            closers.append(self._stop)
+
+        self._stack.append((tag, captures, closers))
+        if tag in _VOID_TAGS:
+            self._pop()
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        self._flush()
+        # Close up to the most recent open element of that name, ignore strays
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index][0] == tag:
+                while len(self._stack) > index:
+                    self._pop()
+                return
+
+    def handle_data(self, data):
+        if not self.done:
+            self._texts.append(data)
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    def unknown_decl(self, data):
+        self._flush()
+
+    def _unhide(self):
+        self._hidden -= 1
+
+    def _stop(self):
+        self.done = True
+
+    # Selectors of the bs4 backend, matched as elements open
+
+    def _match(self, tag, classes, attrs, captures, closers):
+        if tag == 'span':
+            if 'fl' in classes and self._first('fl'):
+                self._capture(captures, self._set_word_class)
+            if 'prons-entries-list-inline' in classes and self._first('prons'):
+                self._pron_raw = [self.get_starttag_text()]
+                closers.append(self._end_pron_section)
+            if 'mw' in classes:
+                slot = []
+                self._mw_spans.append(slot)
+                self._capture(captures, slot.extend)
+                for item in self._open_items:
+                    if item['mw'] is None:
+                        item['mw'] = slot
+            if 'pron-spell-content' in classes or 'pr' in classes:
+                slot = []
+                self._spell_spans.append(slot)
+                self._capture(captures, slot.extend)
+            if 'ipa' in classes:
+                slot = []
+                self._ipa_spans.append(slot)
+                self._capture(captures, slot.extend)
+            if 'dtText' in classes:
+                owners = [sense for sense in self._open_senses if sense['definition'] is None]
+                if owners:
+                    slot = []
+                    for sense in owners:
+                        sense['definition'] = slot
+                    self._capture(captures, slot.extend)
+            if 'ex-sent' in classes:
+                example = {'strings': [], 'attribution': None}
+                for sense in self._open_senses:
+                    sense['examples'].append(example)
+                self._open_examples.append(example)
+                self._capture(captures, example['strings'].extend)
+                closers.append(lambda: self._open_examples.remove(example))
+            if 'auth' in classes:
+                owners = [example for example in self._open_examples if example['attribution'] is None]
+                if owners:
+                    slot = []
+                    for example in owners:
+                        example['attribution'] = slot
+                    self._capture(captures, slot.extend)
+        elif tag == 'a':
+            if 'play-pron-v2' in classes and self._pron_raw is not None and 'prons_done' not in self._seen:
+                link = {'strings': [], 'audio_dir': attrs.get('data-dir'), 'audio_file': attrs.get('data-file')}
+                self._pron_links.append(link)
+                self._capture(captures, link['strings'].extend)
+        elif tag == 'div':
+            if 'sense' in classes:
+                sense = {'definition': None, 'examples': []}
+                self._senses.append(sense)
+                self._open_senses.append(sense)
+                closers.append(lambda: self._open_senses.remove(sense))
+            if 'prons-entry-list-item' in classes and self._pron_raw is not None and 'prons_done' not in self._seen:
+                item = {'mw': None}
+                self._pron_items.append(item)
+                self._open_items.append(item)
+                closers.append(lambda: self._open_items.remove(item))
+        elif tag == 'p':
+            if 'et' in classes and self._first('et'):
+                self._capture(captures, self._set_etymology)
+
+    def _set_word_class(self, strings):
+        self.word_class = _joined(strings).strip()
+
+    def _set_etymology(self, strings):
+        self.etymology = _joined(strings).strip()
+
+    def _end_pron_section(self):
+        self._seen.add('prons_done')
+        self._pron_html = ''.join(self._pron_raw)
+        self._pron_raw = None
+        # The fallbacks of text_pronunciations() look at the whole page, so
+        # only stop here when the section itself had pronunciations
+        if self.profile == 'pronunciation' and any(
+                item['mw'] is not None and _joined(item['mw'], strip=True) for item in self._pron_items):
+            self.done = True
+
+    # Results, built exactly like the bs4 backend's
+
+    def word_page(self) -> Dict:
+        syllables = None
+        pronunciations = []
+        for link in self._pron_links:
+            pron_text = _joined(link['strings'], strip=True).replace('\xa0', '')
+            if not pron_text:
+                continue
+            pronunciations.append(make_pronunciation(pron_text, link['audio_dir'], link['audio_file']))
+            if syllables is None:
+                syllables = pron_text
+
+        definitions = []
+        for group_num, sense in enumerate(self._senses, 1):
+            if sense['definition'] is None:
+                continue
+            examples = []
+            for example in sense['examples']:
+                attribution = None
+                if example['attribution'] is not None:
+                    attribution = _joined(example['attribution'], strip=True)
+                examples.append({
+                    'text': _joined(example['strings'], ' ', strip=True),
+                    'attribution': attribution
+                })
+            definitions.append({
+                'definition_number': group_num,
+                'definition_text': clean_definition(_joined(sense['definition'], ' ', strip=True)),
+                'examples': examples
+            })
+
+        return make_word_result(self.word, self.word_class, syllables, pronunciations, self.etymology, definitions,
+                                self.text_pronunciations()['text_pronunciations'])
+
+    def text_pronunciations(self) -> Dict:
+        result = {'word': self.word, 'text_pronunciations': []}
+        prons = result['text_pronunciations']
+        for item in self._pron_items:
+            if item['mw'] is not None:
+                add_unique(prons, _joined(item['mw'], strip=True))
+        if not prons:
+            for strings in self._mw_spans:
+                add_unique(prons, _joined(strings, strip=True))
+        if not prons:
+            for strings in self._spell_spans:
+                add_unique(prons, _joined(strings, strip=True).replace('\xa0', ''))
+        if not prons:
+            for strings in self._ipa_spans:
+                add_unique(prons, _joined(strings, strip=True))
+        if not prons and 'prons' in self._seen:
+            result['html_structure'] = self._pron_html or ''.join(self._pron_raw or [])
+        return result
+
+class StreamParser:
+    """Word pages through WordPageExtractor; browse pages through the tree backend"""
+    name = 'stream'
+
+    def word_page(self, word: str, html: str) -> Dict:
+        return WordPageExtractor(word).feed_all(html).word_page()
+
+    def text_pronunciations(self, word: str, html: str) -> Dict:
+        return WordPageExtractor(word).feed_all(html).text_pronunciations()
+
+    def browse_page(self, html: str) -> List[str]:
+        return get_parser(TREE_PARSER).browse_page(html)
+
+    def total_pages(self, html: str) -> Optional[int]:
+        return get_parser(TREE_PARSER).total_pages(html)
+
+PARSERS = {'bs4': BeautifulSoupParser, 'stream': StreamParser}
+if lxml is not None:
+    PARSERS['lxml'] = LxmlParser
+
+# Fastest full-tree backend available
+TREE_PARSER = 'lxml' if 'lxml' in PARSERS else 'bs4'
+DEFAULT_PARSER = TREE_PARSER
+
+_instances = {}
+
+def get_parser(name: Optional[str] = None):
+    """Parser backend by name (DEFAULT_PARSER if None)"""
+    name = name or DEFAULT_PARSER
+    if name not in PARSERS:
+        raise ValueError("Unknown or unavailable parser '{}' (available: {})".format(name, ', '.join(PARSERS)))
+    if name not in _instances:
+        _instances[name] = PARSERS[name]()
+    return _instances[name]
+
+def load_fixtures(directory: str) -> Dict[str, str]:
+    """Saved pages keyed by word (the file name without .html)"""
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            fixtures[os.path.splitext(os.path.basename(path))[0]] = f.read()
+    return fixtures
+
+def _comparable(result: Dict) -> Dict:
+    return {key: value for key, value in result.items() if key not in ('scraped_at', 'html_structure')}
+
+def check_parity(directory: str, reference: str = 'bs4', candidates: Optional[List[str]] = None) -> int:
+    """Compare every backend against the reference on saved pages, return the mismatch count"""
+    fixtures = load_fixtures(directory)
+    candidates = candidates or [name for name in PARSERS if name != reference]
+    base = get_parser(reference)
+    mismatches = 0
+    for name in candidates:
+        parser = get_parser(name)
+        for word, html in fixtures.items():
+            for method in ('word_page', 'text_pronunciations'):
+                expected = _comparable(getattr(base, method)(word, html))
+                actual = _comparable(getattr(parser, method)(word, html))
+                if expected != actual:
+                    mismatches += 1
+                    print("MISMATCH {} {} '{}'".format(name, method, word))
+                    for key in expected:
+                        if expected[key] != actual.get(key):
+                            print("  {}: {!r} != {!r}".format(key, expected[key], actual.get(key)))
+    print("{} fixtures, {} backends checked against {}: {} mismatches".format(
+        len(fixtures), len(candidates), reference, mismatches))
+    return mismatches
+
+def benchmark(directory: str, names: Optional[List[str]] = None, rounds: int = 3):
+    """Pages per second per core for each backend's word_page"""
+    fixtures = load_fixtures(directory)
+    total_kb = sum(len(html) for html in fixtures.values()) / 1024
+    print("{} pages, {:.0f} KB average".format(len(fixtures), total_kb / len(fixtures) if fixtures else 0))
+    for name in names or list(PARSERS):
+        parser = get_parser(name)
+        best = None
+        for _ in range(rounds):
+            started = time.process_time()
+            for word, html in fixtures.items():
+                parser.word_page(word, html)
+            elapsed = time.process_time() - started
+            best = elapsed if best is None else min(best, elapsed)
+        print("{:>6}: {:8.1f} pages/s per core".format(name, len(fixtures) / best if best else float('inf')))
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Check and benchmark the HTML parser backends")
+    subparsers = arg_parser.add_subparsers(dest='command', required=True)
+    parity_parser = subparsers.add_parser('parity', help="Compare backends against bs4 on saved pages")
+    parity_parser.add_argument('directory')
+    bench_parser = subparsers.add_parser('bench', help="Measure pages/s per core on saved pages")
+    bench_parser.add_argument('directory')
+    bench_parser.add_argument('--parsers', nargs='+', default=None)
+    bench_parser.add_argument('--rounds', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    if args.command == 'parity':
+        raise SystemExit(1 if check_parity(args.directory) else 0)
+    benchmark(args.directory, args.parsers, args.rounds)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Indexed working copy of a {letter}_dictionary_data.json_pronunciations.json file
+
+    a_dictionary_data.json_pronunciations.json      the output, read by everything else
+    a_dictionary_data.json_pronunciations.sqlite    entries by word, updated in place
+
+update_pronunciations records each checked word with set_text_pronunciations()
+- an indexed UPDATE of that word's rows - and checkpoint() commits them, so a
+checkpoint costs the rows changed since the last one, not a rewrite of the
+file. The JSON is written once by export() when a file is done.
+
+The store remembers the size and mtime of the JSON it was imported from or
+exported to. If the JSON changes behind its back (a new scrape,
+clear_text_pronunciations.py), it is imported again and the JSON wins; if only
+the store moved on (an interrupted run), its progress is kept.
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    seq INTEGER PRIMARY KEY,
+    word TEXT NOT NULL,
+    checked INTEGER NOT NULL,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_word ON entries (word);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+)
+"""
+
+def store_path(json_path: str) -> str:
+    return os.path.splitext(json_path)[0] + '.sqlite'
+
+def _signature(path: str) -> Optional[str]:
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return '{}:{}'.format(stat.st_size, stat.st_mtime_ns)
+
+class PronunciationStore:
+    def __init__(self, json_path: str):
+        """
+        Args:
+            json_path: The *_pronunciations.json file this store mirrors
+                (it need not exist yet)
+        """
+        self.json_path = json_path
+        self.path = store_path(json_path)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(_SCHEMA)
+        self.changed = 0
+        if self._meta('source') != _signature(json_path):
+            self._import()
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.connection.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: Optional[str]):
+        self.connection.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', (key, value))
+
+    def _import(self):
+        """Replace the store's entries with the JSON file's (one pass, only when it changed)"""
+        entries = []
+        if os.path.exists(self.json_path):
+            with open(self.json_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        with self.connection:
+            self.connection.execute('DELETE FROM entries')
+            self.connection.executemany(
+                'INSERT INTO entries (word, checked, entry) VALUES (?, ?, ?)',
+                ((entry['word'], 'text_pronunciations' in entry, json.dumps(entry, ensure_ascii=False))
+                 for entry in entries))
+            self._set_meta('source', _signature(self.json_path))
+            self.connection.execute("DELETE FROM meta WHERE key = 'unexported'")
+
+    def checked_words(self) -> Set[str]:
+        """Words with text_pronunciations on any of their entries"""
+        return {row[0] for row in self.connection.execute('SELECT DISTINCT word FROM entries WHERE checked')}
+
+    def words_without_text(self) -> List[str]:
+        """Words none of whose entries has any text pronunciation (unchecked, or checked empty)"""
+        has_text = {}
+        for word, data in self.connection.execute('SELECT word, entry FROM entries ORDER BY seq'):
+            has_text[word] = has_text.get(word, False) or bool(json.loads(data).get('text_pronunciations'))
+        return [word for word, found in has_text.items() if not found]
+
+    def word_entries(self, word: str) -> List[Dict]:
+        return [json.loads(data) for (data,) in self.connection.execute(
+            'SELECT entry FROM entries WHERE word = ? ORDER BY seq', (word,))]
+
+    def set_text_pronunciations(self, word: str, text_pronunciations: List[str]) -> int:
+        """
+        Set the text pronunciations of every entry of a word, adding an entry
+        without audio if it has none; returns the number of entries updated
+        (0 for an added entry)
+        """
+        rows = self.connection.execute('SELECT seq, entry FROM entries WHERE word = ?', (word,)).fetchall()
+        self.changed += 1
+        if not rows:
+            entry = {
+                "word": word,
+                "pronunciation_number": 1,
+                "pronunciation_text": None,  # We don't have this yet
+                "audio_dir": None,
+                "audio_file": None,
+                "audio_url": None,
+                "text_pronunciations": text_pronunciations,
+                "scraped_at": datetime.now().isoformat()
+            }
+            self.connection.execute('INSERT INTO entries (word, checked, entry) VALUES (?, 1, ?)',
+                                    (word, json.dumps(entry, ensure_ascii=False)))
+            return 0
+        updates = []
+        for seq, data in rows:
+            entry = json.loads(data)
+            entry['text_pronunciations'] = text_pronunciations
+            updates.append((json.dumps(entry, ensure_ascii=False), seq))
+        self.connection.executemany('UPDATE entries SET checked = 1, entry = ? WHERE seq = ?', updates)
+        return len(updates)
+
+    @property
+    def unexported(self) -> bool:
+        """Whether checkpoints hold changes the JSON file doesn't have yet"""
+        return self._meta('unexported') is not None
+
+    def checkpoint(self) -> int:
+        """Commit the words set since the last checkpoint, return how many"""
+        if self.changed:
+            self._set_meta('unexported', '1')
+        self.connection.commit()
+        changed, self.changed = self.changed, 0
+        return changed
+
+    def entries(self) -> Iterator[Dict]:
+        for (data,) in self.connection.execute('SELECT entry FROM entries ORDER BY seq'):
+            yield json.loads(data)
+
+    def export(self):
+        """Write the JSON file from the store (atomically) and remember it as in sync"""
+        self.checkpoint()
+        tmp_path = self.json_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(list(self.entries()), f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.json_path)
+        with self.connection:
+            self._set_meta('source', _signature(self.json_path))
+            self.connection.execute("DELETE FROM meta WHERE key = 'unexported'")
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
@@ -1,7 +1,17 @@
 import requests
 import re
-from bs4 import BeautifulSoup
+import ssl
+import json
 import time
+import argparse
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+from bs4 import BeautifulSoup
+
+# Fetched through each proxy by `validate`; answers 200 (the http:// site redirects)
+DEFAULT_TARGET = "https://www.merriam-webster.com/"
 
 def get_spys_proxies():
     try:
@@ -30,7 +40,7 @@ def get_freeproxy_list():
         print("Error fetching from free-proxy-list: {}".format(e))
         return []
 
-def main():
+def harvest(output_file: str = "proxies_list.txt"):
     all_proxies = set()  # Using set to avoid duplicates
     
     # Get proxies from spys.me
@@ -44,11 +54,183 @@ def main():
     print("Found {} proxies from free-proxy-list.net".format(len(free_proxies)))
     
     # Save unique proxies to file
-    with open("proxies_list.txt", 'w') as file:
+    with open(output_file, 'w') as file:
         for proxy in all_proxies:
             file.write(proxy + "\n")
-    
+
     print("Total unique proxies saved: {}".format(len(all_proxies)))
 
+async def check_proxy(
+    proxy: str,
+    target: str,
+    connect_timeout: float = 3.0,
+    timeout: float = 10.0,
+    max_bytes: int = 256 * 1024
+) -> Optional[Dict]:
+    """
+    Fetch `target` through an HTTP proxy and measure it
+
+    https targets are tunnelled with CONNECT, http targets use an
+    absolute-form GET. Returns None if the proxy is unusable, otherwise
+    connect time, time to first byte and download throughput. Only a 2xx
+    answer counts: a redirect would measure the redirect, not a page fetch.
+    """
+    parts = urlsplit(target)
+    target_host = parts.hostname
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    loop = asyncio.get_running_loop()
+    writer = None
+
+    try:
+        # A malformed line ("host", "host:port:extra") is just an unusable proxy
+        host, port = proxy.rsplit(':', 1)
+        started = loop.time()
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, int(port)), connect_timeout)
+        connected = loop.time()
+
+        async def fetch():
+            if parts.scheme == 'https':
+                writer.write("CONNECT {0}:{1} HTTP/1.1\r\nHost: {0}:{1}\r\n\r\n".format(
+                    target_host, parts.port or 443).encode())
+                await writer.drain()
+                status_line = await reader.readline()
+                if b' 200' not in status_line:
+                    return None
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                await writer.start_tls(ssl.create_default_context(), server_hostname=target_host)
+                request_target = path
+            else:
+                request_target = target
+
+            writer.write((
+                "GET {} HTTP/1.1\r\n"
+                "Host: {}\r\n"
+                "User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36\r\n"
+                "Accept: */*\r\n"
+                "Connection: close\r\n\r\n"
+            ).format(request_target, parts.netloc).encode())
+            await writer.drain()
+
+            status_line = await reader.readline()
+            first_byte = loop.time()
+            fields = status_line.split()
+            if len(fields) < 2 or not fields[0].startswith(b'HTTP/'):
+                return None
+            status = int(fields[1])
+            if not 200 <= status < 300:
+                return None
+
+            received = len(status_line)
+            while received < max_bytes:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    break
+                received += len(chunk)
+            finished = loop.time()
+
+            transfer_time = max(finished - first_byte, 1e-6)
+            return {
+                'proxy': 'http://{}'.format(proxy),
+                'status': status,
+                'connect_ms': round((connected - started) * 1000, 1),
+                'latency_ms': round((first_byte - started) * 1000, 1),
+                'bytes': received,
+                'throughput_kbps': round(received / 1024 / transfer_time, 1),
+            }
+
+        return await asyncio.wait_for(fetch(), timeout)
+    except (OSError, asyncio.TimeoutError, ValueError, ssl.SSLError):
+        return None
+    finally:
+        if writer is not None:
+            writer.close()
+
+async def validate_proxies(
+    candidates: List[str],
+    target: str,
+    concurrency: int = 500,
+    connect_timeout: float = 3.0,
+    timeout: float = 10.0,
+    min_throughput: float = 0.0
+) -> List[Dict]:
+    """Check all candidates concurrently, return working ones ranked fastest first"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(proxy):
+        async with semaphore:
+            return await check_proxy(proxy, target, connect_timeout, timeout)
+
+    results = await asyncio.gather(*(bounded(p) for p in candidates), return_exceptions=True)
+    working = [r for r in results if isinstance(r, dict) and r['throughput_kbps'] >= min_throughput]
+    working.sort(key=lambda r: (r['latency_ms'], -r['throughput_kbps']))
+    return working
+
+def validate(
+    input_file: str = "proxies_list.txt",
+    target: str = DEFAULT_TARGET,
+    concurrency: int = 500,
+    connect_timeout: float = 3.0,
+    timeout: float = 10.0,
+    min_throughput: float = 0.0,
+    output_file: Optional[str] = None
+) -> str:
+    """Validate a harvested proxy list and write a ranked working_proxies_<timestamp>.json"""
+    with open(input_file, 'r') as f:
+        candidates = list(dict.fromkeys(
+            line.strip().replace('http://', '') for line in f if line.strip()))
+    print("Validating {} candidates against {} ({} at a time)...".format(len(candidates), target, concurrency))
+
+    started = time.time()
+    working = asyncio.run(validate_proxies(
+        candidates, target, concurrency, connect_timeout, timeout, min_throughput))
+    elapsed = time.time() - started
+
+    if output_file is None:
+        output_file = "working_proxies_{}.json".format(datetime.now().strftime("%Y%m%d_%H%M%S"))
+    with open(output_file, 'w') as f:
+        json.dump({
+            'proxies': [r['proxy'] for r in working],
+            'details': working,
+            'target': target,
+            'tested': len(candidates),
+            'validated_at': datetime.utcnow().isoformat()
+        }, f, indent=2)
+
+    print("{} of {} proxies working ({:.1f}s, {:.0f} checks/s)".format(
+        len(working), len(candidates), elapsed, len(candidates) / elapsed if elapsed else 0))
+    if working:
+        latencies = sorted(r['latency_ms'] for r in working)
+        print("Latency p50 {:.0f}ms, p90 {:.0f}ms".format(
+            latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.9)]))
+    print("Saved ranked proxies to {}".format(output_file))
+    return output_file
+
+def main():
+    parser = argparse.ArgumentParser(description="Harvest and validate free proxies")
+    subparsers = parser.add_subparsers(dest='command')
+
+    harvest_parser = subparsers.add_parser('harvest', help="Scrape proxy lists into proxies_list.txt (default)")
+    harvest_parser.add_argument('--output', default="proxies_list.txt")
+
+    validate_parser = subparsers.add_parser('validate', help="Check candidates and write working_proxies_<timestamp>.json")
+    validate_parser.add_argument('--input', default="proxies_list.txt")
+    validate_parser.add_argument('--output', default=None)
+    validate_parser.add_argument('--target', default=DEFAULT_TARGET,
+                                 help="URL fetched through each proxy (http or https)")
+    validate_parser.add_argument('--concurrency', type=int, default=500)
+    validate_parser.add_argument('--connect-timeout', type=float, default=3.0)
+    validate_parser.add_argument('--timeout', type=float, default=10.0, help="Total time allowed per proxy")
+    validate_parser.add_argument('--min-throughput', type=float, default=0.0, help="Minimum KB/s to keep a proxy")
+
+    args = parser.parse_args()
+    if args.command == 'validate':
+        validate(args.input, args.target, args.concurrency, args.connect_timeout,
+                 args.timeout, args.min_throughput, args.output)
+    else:
+        harvest(getattr(args, 'output', "proxies_list.txt"))
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,54 @@
+"""
+Shared proxy handling for the Merriam-Webster scrapers
+
+    from proxy_pool import ProxyManager, latest_working_proxies
+
+    proxy_manager = ProxyManager(latest_working_proxies(), cooldown=0.2)
+    proxy = proxy_manager.get_next_proxy()
+    ...
+    proxy_manager.mark_proxy_status(proxy, success, latency)
+"""
+
+from .concurrency import AdaptiveLimiter, format_metrics, is_throttled
+from .health import ProxyHealthMonitor
+from .manager import ProxyManager
+from .retry import (BLOCKED, NOT_FOUND, PARSE_FAILED, PROXY_DEAD, ParseError, RetryBudget,
+                    RetryLater, RetryPolicy, classify)
+from .scheduler import QUARANTINED, READY, ProxyScheduler
+from .service import (ProxyPoolService, connect_limiter, connect_retry_budget, connect_scheduler,
+                      connect_singleflight)
+from .singleflight import SingleFlight, format_singleflight
+from .sources import (latest_working_proxies, load_proxies, load_proxy_latencies,
+                      load_proxy_list, load_working_proxies)
+
+__all__ = [
+    'AdaptiveLimiter',
+    'BLOCKED',
+    'NOT_FOUND',
+    'PARSE_FAILED',
+    'PROXY_DEAD',
+    'ParseError',
+    'ProxyHealthMonitor',
+    'ProxyManager',
+    'ProxyPoolService',
+    'ProxyScheduler',
+    'QUARANTINED',
+    'READY',
+    'RetryBudget',
+    'RetryLater',
+    'RetryPolicy',
+    'SingleFlight',
+    'classify',
+    'connect_limiter',
+    'connect_retry_budget',
+    'connect_scheduler',
+    'connect_singleflight',
+    'format_metrics',
+    'format_singleflight',
+    'is_throttled',
+    'latest_working_proxies',
+    'load_proxies',
+    'load_proxy_latencies',
+    'load_proxy_list',
+    'load_working_proxies',
+]
@@ -0,0 +1,201 @@
+"""
+Adaptive (AIMD) limit on requests in flight
+
+Instead of fixed worker counts and random sleeps, every request takes a slot
+from an AdaptiveLimiter and returns it with its outcome and latency:
+
+    limiter = AdaptiveLimiter(initial=8, max_limit=100)
+    limiter.acquire()
+    ...
+    limiter.release(OK, latency)        # or THROTTLED / FAILED
+
+The limit is adjusted once per window of about `limit` completed requests
+(one round of the pool): while the success rate holds and the window's p95
+latency stays within `latency_tolerance` of the best p95 seen, it grows by
+`increase`; a window that misses either target, or any 403/429/timeout
+(THROTTLED), cuts it by `decrease` - at most once per `backoff_interval`, so
+one burst of refusals is a single backoff. The best p95 creeps up a little
+every window so a lasting change in site latency is relearned.
+
+ProxyManager takes the slot in get_next_proxy() and returns it in
+mark_proxy_status(), so existing fetch loops are gated without changes, and
+proxy_pool.service shares one limiter between worker processes.
+"""
+
+import math
+import threading
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+OK = 'ok'
+THROTTLED = 'throttled'
+FAILED = 'failed'
+
+# Responses that mean the site (or proxy) is pushing back rather than failing
+THROTTLE_STATUSES = (403, 429)
+
+def is_throttled(error: Optional[BaseException]) -> bool:
+    """Whether a request error is a 403/429 response or a timeout"""
+    if isinstance(error, requests.exceptions.Timeout):
+        return True
+    response = getattr(error, 'response', None)
+    return response is not None and response.status_code in THROTTLE_STATUSES
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile (None for no values)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+class AdaptiveLimiter:
+    """Counting semaphore whose size follows observed success rate and latency"""
+
+    def __init__(
+        self,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        increase: int = 1,
+        decrease: float = 0.5,
+        target_success: float = 0.9,
+        latency_tolerance: float = 2.0,
+        baseline_drift: float = 0.05,
+        backoff_interval: float = 2.0,
+        min_window: int = 5
+    ):
+        """
+        Args:
+            initial: Starting limit
+            min_limit: The limit never drops below this
+            max_limit: Nor grows above this (size thread/process pools to it)
+            increase: Added to the limit after a healthy window
+            decrease: Factor applied to the limit on backoff
+            target_success: Minimum success rate of a healthy window
+            latency_tolerance: Maximum window p95 as a multiple of the best p95 seen
+            baseline_drift: Fraction the best p95 rises by every window
+            backoff_interval: Minimum seconds between two decreases
+            min_window: Minimum requests per adjustment window
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.target_success = target_success
+        self.latency_tolerance = latency_tolerance
+        self.baseline_drift = baseline_drift
+        self.backoff_interval = backoff_interval
+        self.min_window = min_window
+
+        self.limit = max(min_limit, min(initial, max_limit))
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._window_ok = 0
+        self._window_failed = 0
+        self._window_latencies = []
+        self._baseline = None
+        self._last_decrease = 0.0
+
+        self.requests = 0
+        self.throttled = 0
+        self.failed = 0
+        self.increases = 0
+        self.decreases = 0
+        self.peak_limit = self.limit
+        self.wait_time = 0.0
+        self.last_success_rate = None
+        self.last_p95 = None
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a free slot; False if none freed up within `timeout` seconds"""
+        started = time.monotonic()
+        with self._available:
+            ok = self._available.wait_for(lambda: self.in_flight < self.limit, timeout)
+            if ok:
+                self.in_flight += 1
+            self.wait_time += time.monotonic() - started
+            return ok
+
+    def release(self, outcome: str = OK, latency: Optional[float] = None):
+        """Return a slot with the outcome (OK, THROTTLED or FAILED) and latency of its request"""
+        with self._available:
+            self.in_flight = max(0, self.in_flight - 1)
+            self.requests += 1
+            now = time.monotonic()
+            if outcome == OK:
+                self._window_ok += 1
+                if latency is not None:
+                    self._window_latencies.append(latency)
+            else:
+                self._window_failed += 1
+                if outcome == THROTTLED:
+                    self.throttled += 1
+                    self._back_off(now)
+                else:
+                    self.failed += 1
+
+            if self._window_ok + self._window_failed >= max(self.min_window, self.limit):
+                self._end_window(now)
+            self._available.notify_all()
+
+    def _end_window(self, now: float):
+        success_rate = self._window_ok / (self._window_ok + self._window_failed)
+        p95 = percentile(self._window_latencies, 0.95)
+        self.last_success_rate = success_rate
+        if p95 is not None:
+            self.last_p95 = p95
+            if self._baseline is None or p95 < self._baseline:
+                self._baseline = p95
+            else:
+                self._baseline *= 1 + self.baseline_drift
+        latency_ok = p95 is None or p95 <= self._baseline * self.latency_tolerance
+
+        if success_rate >= self.target_success and latency_ok:
+            if self.limit < self.max_limit:
+                self.limit = min(self.max_limit, self.limit + self.increase)
+                self.increases += 1
+                self.peak_limit = max(self.peak_limit, self.limit)
+        else:
+            self._back_off(now)
+        self._window_ok = self._window_failed = 0
+        self._window_latencies = []
+
+    def _back_off(self, now: float):
+        if now - self._last_decrease < self.backoff_interval or self.limit <= self.min_limit:
+            return
+        self.limit = max(self.min_limit, int(self.limit * self.decrease))
+        self.decreases += 1
+        self._last_decrease = now
+        # Measure the smaller pool from scratch
+        self._window_ok = self._window_failed = 0
+        self._window_latencies = []
+
+    def metrics(self) -> Dict:
+        """Current limit and counters"""
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'in_flight': self.in_flight,
+                'min_limit': self.min_limit,
+                'max_limit': self.max_limit,
+                'peak_limit': self.peak_limit,
+                'requests': self.requests,
+                'throttled': self.throttled,
+                'failed': self.failed,
+                'increases': self.increases,
+                'decreases': self.decreases,
+                'success_rate': self.last_success_rate,
+                'p95_latency': self.last_p95,
+                'baseline_p95': self._baseline,
+                'wait_time': self.wait_time,
+            }
+
+def format_metrics(metrics: Dict) -> str:
+    """One-line summary of AdaptiveLimiter.metrics()"""
+    p95 = "{:.2f}s".format(metrics['p95_latency']) if metrics['p95_latency'] is not None else "n/a"
+    return "Concurrency: limit {} ({} in flight, peak {}, range {}-{}), {} throttled, {} failed, p95 {}, {} increases/{} decreases".format(
+        metrics['limit'], metrics['in_flight'], metrics['peak_limit'], metrics['min_limit'], metrics['max_limit'],
+        metrics['throttled'], metrics['failed'], p95, metrics['increases'], metrics['decreases'])
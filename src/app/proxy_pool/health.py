@@ -0,0 +1,53 @@
+"""
+Background proxy health probing
+
+Proxies are scored passively from the outcome of the real requests made
+through them (see scheduler.ProxyScheduler). Only proxies that have
+been quarantined, or that have not produced a successful request for a while,
+are probed actively by the monitor thread here, so fetching a word costs one
+network round trip.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+class ProxyHealthMonitor(threading.Thread):
+    """Daemon thread that actively probes quarantined and stale proxies"""
+
+    def __init__(
+        self,
+        health,
+        probe: Callable[[Dict[str, str]], bool],
+        interval: float = 5.0,
+        probe_workers: int = 8
+    ):
+        """
+        Args:
+            health: Scheduler exposing due_for_probe() and probe_result()
+            probe: Returns True if the proxy is usable
+            interval: Seconds between probe rounds
+            probe_workers: Concurrent probes per round
+        """
+        super().__init__(name='proxy-health-monitor', daemon=True)
+        self.health = health
+        self.probe = probe
+        self.interval = interval
+        self.probe_workers = probe_workers
+        self._stopped = threading.Event()
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=self.probe_workers) as executor:
+            while not self._stopped.wait(self.interval):
+                for proxy in self.health.due_for_probe():
+                    executor.submit(self._probe_one, proxy)
+
+    def stop(self):
+        self._stopped.set()
+
+    def _probe_one(self, proxy: Dict[str, str]):
+        try:
+            ok = self.probe(proxy)
+        except Exception:
+            ok = False
+        self.health.probe_result(proxy, ok)
@@ -0,0 +1,222 @@
+"""
+ProxyManager: a requests session plus scheduled, health-checked proxies
+
+The scheduler backend is pluggable: by default the manager builds a local
+ProxyScheduler from a proxy source file and starts a health monitor for it;
+worker processes pass the shared scheduler from service.connect_scheduler()
+instead. With an AdaptiveLimiter, get_next_proxy() also waits for a slot
+of the adaptive concurrency limit and mark_proxy_status() hands it back.
+
+Requests are sent once: retrying is up to the caller's loop, guided by
+`proxy_manager.retry` (see retry.RetryPolicy); urllib3 does not retry
+underneath it.
+"""
+
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .concurrency import FAILED, OK, THROTTLED, format_metrics, is_throttled
+from .health import ProxyHealthMonitor
+from .retry import NOT_FOUND, RetryPolicy, classify
+from .scheduler import ProxyScheduler
+from .sources import load_proxies, load_proxy_latencies
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+    'Cache-Control': 'no-cache',
+    'Pragma': 'no-cache'
+}
+
+class ProxyManager:
+    def __init__(
+        self,
+        source: Optional[str] = None,
+        scheduler=None,
+        limiter=None,
+        retry: Optional[RetryPolicy] = None,
+        cooldown: float = 0.2,
+        pool_size: int = 50,
+        proxy_https: bool = False,
+        allow_direct: bool = False,
+        probe_url: str = 'http://www.merriam-webster.com',
+        probe_timeout: float = 5
+    ):
+        """
+        Args:
+            source: Proxy file (working_proxies_*.json or an ip:port list)
+            scheduler: Shared scheduler to use instead of loading `source`
+            limiter: AdaptiveLimiter (or a proxy from connect_limiter()) gating
+                requests in flight; None leaves concurrency to the caller
+            retry: Retry policy for the callers' fetch loops (default: RetryPolicy()
+                without a budget)
+            cooldown: Minimum pause between uses of the same (perfect) proxy
+            pool_size: Connection pool size of the session's adapters
+            proxy_https: Route https:// requests through the proxy as well
+            allow_direct: With no proxies loaded, connect directly instead of failing
+            probe_url: URL fetched by validate_proxy() health probes
+            probe_timeout: Timeout (s) of a health probe
+        """
+        self.source = source
+        self.probe_url = probe_url
+        self.probe_timeout = probe_timeout
+        self.health_monitor = None
+        self.proxies = None
+        self.scheduler = scheduler
+        self.limiter = limiter
+        self.retry = retry or RetryPolicy()
+        self._local = threading.local()  # Slot held by the calling thread
+
+        if scheduler is None:
+            try:
+                proxy_urls = load_proxies(source)
+            except Exception as e:
+                if not allow_direct:
+                    raise
+                print("Error loading proxies from {}: {}".format(source, e))
+                proxy_urls = []
+
+            self.proxies = [{"http": url, "https": url if proxy_https else None} for url in proxy_urls]
+            random.shuffle(self.proxies)  # Randomize initial order
+
+            if self.proxies:
+                # Weighted scheduling from passive scoring, plus background
+                # probing of quarantined/stale proxies
+                self.scheduler = ProxyScheduler(self.proxies, load_proxy_latencies(source), cooldown=cooldown)
+                self.health_monitor = ProxyHealthMonitor(self.scheduler, self.validate_proxy)
+            elif not allow_direct:
+                raise RuntimeError("No proxies loaded from {}".format(source))
+
+        # Create a session with optimized settings
+        self.session = requests.Session()
+        self.session.verify = False
+        self.session.trust_env = False
+
+        adapter = HTTPAdapter(
+            max_retries=0,  # One attempt per request, see RetryPolicy
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            pool_block=False  # Don't block when pool is full
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(DEFAULT_HEADERS)
+
+        if self.proxies is not None:
+            print("Loaded {} proxies from {}".format(len(self.proxies), source))
+        if self.health_monitor:
+            self.health_monitor.start()
+
+    def get_next_proxy(self, avoid: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Get the next eligible proxy, favouring fast and reliable ones ({} for direct)
+
+        `avoid` is the proxy of a failed attempt: if it comes up again, the
+        next eligible one is taken instead (when there is one).
+        """
+        if self.limiter is not None and getattr(self._local, 'started', None) is None:
+            self.limiter.acquire()
+            self._local.started = time.monotonic()
+        self.retry.note_request()
+        if self.scheduler is None:
+            return {}
+        proxy = self.scheduler.acquire()
+        if avoid and proxy['http'] == avoid.get('http'):
+            proxy = self.scheduler.try_acquire() or proxy
+        if self.limiter is not None:
+            self._local.started = time.monotonic()  # Time the request, not the wait for a proxy
+        return proxy
+
+    def mark_proxy_status(self, proxy: Dict[str, str], success: bool, latency: Optional[float] = None,
+                          error: Optional[BaseException] = None):
+        """
+        Record the outcome (and latency in seconds) of a real request made through the proxy
+
+        `error` is the exception of a failed request: 403/429 responses and
+        timeouts make the limiter back off.
+        """
+        started = getattr(self._local, 'started', None)
+        if started is not None:
+            self._local.started = None
+            outcome = OK if success else THROTTLED if is_throttled(error) else FAILED
+            self.limiter.release(outcome, latency if latency is not None else time.monotonic() - started)
+        if self.scheduler is None or not proxy:
+            return
+        self.scheduler.release(proxy, success, latency)
+
+    def record_failure(self, proxy: Dict[str, str], error: BaseException, attempt: int,
+                       retry: Optional[RetryPolicy] = None) -> Tuple[str, Optional[float]]:
+        """
+        Mark the proxy of a failed attempt by failure class
+
+        Returns the failure class and the seconds to wait before the next
+        attempt (0: at once, on another proxy), or None to give up, as decided
+        by `retry` (a caller's own limits) or else the manager's policy.
+        """
+        failure = classify(error)
+        if failure == NOT_FOUND:
+            self.mark_proxy_status(proxy, True)  # The proxy did its job
+        else:
+            self.mark_proxy_status(proxy, False, error=error)
+        return failure, (retry or self.retry).delay(failure, attempt)
+
+    def validate_proxy(self, proxy: Dict[str, str]) -> bool:
+        """Quick check if proxy is responsive (used by the health monitor's probes)"""
+        if not proxy:
+            return True
+        try:
+            response = self.session.get(
+                self.probe_url,
+                proxies=proxy,
+                timeout=self.probe_timeout,
+                verify=False,
+                allow_redirects=True
+            )
+            return response.status_code == 200
+        except Exception:
+            return False
+
+    def stats(self) -> List[Dict]:
+        """Per-proxy statistics (successes, failures, EWMA latency, weight), best first"""
+        if self.scheduler is None:
+            return []
+        return self.scheduler.stats()
+
+    def concurrency(self) -> Optional[Dict]:
+        """Current adaptive concurrency limit and counters (None without a limiter)"""
+        return self.limiter.metrics() if self.limiter is not None else None
+
+    def summary(self) -> Dict:
+        """Pool-wide totals, computed the same way for every script"""
+        rows = self.stats()
+        successes = sum(row['successes'] for row in rows)
+        failures = sum(row['failures'] for row in rows)
+        latencies = [row['ewma_latency'] for row in rows if row['ewma_latency'] is not None]
+        return {
+            'proxies': len(rows),
+            'ready': sum(1 for row in rows if row['state'] == 'ready'),
+            'requests': successes + failures,
+            'success_rate': successes / (successes + failures) if successes + failures else 0,
+            'mean_latency': sum(latencies) / len(latencies) if latencies else None,
+        }
+
+    def print_summary(self):
+        summary = self.summary()
+        latency = "{:.2f}s".format(summary['mean_latency']) if summary['mean_latency'] is not None else "n/a"
+        print("Proxy pool: {} requests, {:.1f}% success, mean latency {}, {}/{} proxies ready".format(
+            summary['requests'], summary['success_rate'] * 100, latency,
+            summary['ready'], summary['proxies']))
+        if self.limiter is not None:
+            print(format_metrics(self.limiter.metrics()))
+        if self.retry.budget is not None:
+            budget = self.retry.budget.stats()
+            print("Retries: {} of {} requests, {} denied by the retry budget".format(
+                budget['retries'], budget['requests'], budget['denied']))
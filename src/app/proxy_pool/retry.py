@@ -0,0 +1,162 @@
+"""
+Retry policy shared by every fetch loop
+
+Failures are classified before deciding whether and when to try again:
+
+    PROXY_DEAD    connection/proxy errors, timeouts, 5xx: retry at once on another proxy
+    BLOCKED       403/429: retry on another proxy after a jittered exponential backoff
+    NOT_FOUND     404/410: the word has no page, never retried
+    PARSE_FAILED  page fetched but the expected content is missing: retried once
+                  on another proxy (a free proxy may serve a captcha page)
+
+    policy = RetryPolicy(budget=RetryBudget())
+    for attempt in itertools.count():
+        try:
+            ...
+        except Exception as e:
+            delay = policy.delay(classify(e), attempt)
+            if delay is None:
+                break
+            time.sleep(delay)          # or requeue the work (RetryLater)
+
+delay() is None both when a failure is final and when retries run out (or
+the budget refuses one); is_terminal() tells a proven miss - worth
+remembering in the negative cache - from merely giving up.
+
+Retries also draw on a RetryBudget: every request adds `ratio` of a token and
+every retry takes one, so retries can never be more than about `ratio` of
+the traffic however badly things go (plus a small reserve for quiet starts).
+ProxyManager's adapter does not retry, so one attempt is one request.
+"""
+
+import random
+import threading
+from typing import Dict, Optional
+
+import requests
+
+PROXY_DEAD = 'proxy_dead'
+BLOCKED = 'blocked'
+NOT_FOUND = 'not_found'
+PARSE_FAILED = 'parse_failed'
+
+class ParseError(Exception):
+    """A page was fetched but did not contain what the parser looks for"""
+
+class RetryLater(Exception):
+    """Raised instead of sleeping: requeue the work after `delay` seconds as attempt `attempt`"""
+
+    def __init__(self, delay: float, attempt: int, failure: str):
+        super().__init__("retry in {:.1f}s ({})".format(delay, failure))
+        self.delay = delay
+        self.attempt = attempt
+        self.failure = failure
+
+    def __reduce__(self):
+        return (RetryLater, (self.delay, self.attempt, self.failure))
+
+def classify(error: BaseException) -> str:
+    """Failure class of a request/parse error (requests or aiohttp)"""
+    if isinstance(error, ParseError):
+        return PARSE_FAILED
+    response = getattr(error, 'response', None)
+    status = response.status_code if isinstance(response, requests.Response) else getattr(error, 'status', None)
+    if status in (404, 410):
+        return NOT_FOUND
+    if status in (403, 429):
+        return BLOCKED
+    return PROXY_DEAD
+
+class RetryBudget:
+    """Token bucket limiting retries to a fraction of all requests"""
+
+    def __init__(self, ratio: float = 0.2, reserve: float = 20.0, capacity: float = 200.0):
+        """
+        Args:
+            ratio: Tokens earned per request (the long-run retry/request ratio)
+            reserve: Tokens available from the start
+            capacity: Most tokens that can be saved up
+        """
+        self.ratio = ratio
+        self.capacity = capacity
+        self.tokens = reserve
+        self.requests = 0
+        self.retries = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """Count a request"""
+        with self._lock:
+            self.requests += 1
+            self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take a token for a retry, False if the budget is spent"""
+        with self._lock:
+            if self.tokens < 1:
+                self.denied += 1
+                return False
+            self.tokens -= 1
+            self.retries += 1
+            return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'requests': self.requests, 'retries': self.retries, 'denied': self.denied, 'tokens': self.tokens}
+
+class RetryPolicy:
+    """Whether and when to retry, by failure class and attempt number"""
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        parse_attempts: int = 2,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        budget: Optional[RetryBudget] = None
+    ):
+        """
+        Args:
+            max_attempts: Attempts per request for proxy and blocking failures
+            parse_attempts: Attempts when the page comes back without content
+            base_delay: First backoff (s) after a block, doubled per attempt
+            max_delay: Cap of the backoff
+            budget: Shared RetryBudget (or a proxy from connect_retry_budget());
+                None retries without a global limit
+        """
+        self.max_attempts = max_attempts
+        self.parse_attempts = parse_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+
+    def note_request(self):
+        """Count a request (attempt or retry) towards the budget"""
+        if self.budget is not None:
+            self.budget.deposit()
+
+    def delay(self, failure: str, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying after failed attempt `attempt` (0-based), None to give up"""
+        if failure == NOT_FOUND:
+            return None
+        attempts = self.parse_attempts if failure == PARSE_FAILED else self.max_attempts
+        if attempt + 1 >= attempts:
+            return None
+        if self.budget is not None and not self.budget.withdraw():
+            return None
+        if failure == BLOCKED:
+            # Full jitter keeps retries of many workers from arriving together
+            return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        # A dead proxy or a bad parse isn't helped by waiting, just use another proxy
+        return 0.0
+
+    def is_terminal(self, failure: str, parse_failures: int = 0) -> bool:
+        """
+        Whether giving up proves the page missing: a 404, or no content after
+        `parse_failures` real parse attempts reached parse_attempts. Running
+        out of retries or budget on other failures proves nothing.
+        """
+        if failure == NOT_FOUND:
+            return True
+        return failure == PARSE_FAILED and parse_failures >= self.parse_attempts
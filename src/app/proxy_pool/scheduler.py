@@ -0,0 +1,303 @@
+"""
+Weighted, latency-aware proxy scheduler
+
+Ready proxies sit in two min-heaps. A proxy cooling down after a pick waits
+in one keyed by the time it becomes eligible again; eligible proxies move to
+the other, keyed by a virtual "pass" (stride scheduling). Acquiring takes the
+eligible proxy with the lowest pass and advances its pass by 1 / weight, so
+acquire and release stay O(log n) and no thread ever scans the whole list,
+recurses or spins while holding the lock.
+
+The weight, built from the proxy's smoothed odds of success and EWMA latency,
+decides the picks: among eligible proxies each is picked in proportion to
+its weight, however long requests take compared to the cooldown. The
+cooldown after a pick is also divided by the weight (capped at 1), so a poor
+proxy rests longer as well, and each failure costs a proxy an extra turn.
+
+Proxies that fail repeatedly are quarantined (dropped from the heap) until
+health.ProxyHealthMonitor probes them back into service.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional
+
+READY = 'ready'
+QUARANTINED = 'quarantined'
+
+class _ProxyEntry:
+    __slots__ = ('proxy', 'state', 'generation', 'probing', 'successes', 'failures',
+                 'consecutive_failures', 'probe_failures', 'ewma_latency', 'last_ok',
+                 'quarantined_at', 'pass_')
+
+    def __init__(self, proxy: Dict[str, str], now: float):
+        self.proxy = proxy
+        self.state = READY
+        self.generation = 0
+        self.probing = False
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.probe_failures = 0
+        self.ewma_latency = None
+        self.last_ok = now  # Proxies come from a validated list, treat them as fresh
+        self.quarantined_at = 0.0
+        self.pass_ = 0.0  # Virtual time of its next pick (stride scheduling)
+
+class ProxyScheduler:
+    """Heaps of ready proxies: cooling ones by next-eligible time, eligible ones by weighted pass"""
+
+    def __init__(
+        self,
+        proxies: List[Dict[str, str]],
+        latencies: Optional[Dict[str, float]] = None,
+        cooldown: float = 0.2,
+        reference_latency: float = 1.0,
+        latency_alpha: float = 0.2,
+        min_weight: float = 0.01,
+        quarantine_after: int = 2,
+        quarantine_time: float = 30.0,
+        max_quarantine_time: float = 600.0,
+        stale_after: float = 300.0
+    ):
+        """
+        Args:
+            proxies: Proxy dicts as passed to requests (keyed by their 'http' URL)
+            latencies: Measured latency (s) per proxy URL to seed the EWMA with
+            cooldown: Minimum pause between uses of a perfect proxy
+            reference_latency: Latency (s) that halves a proxy's weight
+            latency_alpha: Smoothing factor of the latency EWMA
+            min_weight: Floor for the weight, caps the pause at cooldown / min_weight
+            quarantine_after: Consecutive failed requests before a proxy is pulled
+            quarantine_time: Wait before the first probe of a quarantined proxy
+            max_quarantine_time: Cap for the doubling wait after failed probes
+            stale_after: Probe ready proxies with no successful request for this long
+        """
+        if not proxies:
+            raise RuntimeError("No proxies loaded")
+
+        self.cooldown = cooldown
+        self.reference_latency = reference_latency
+        self.latency_alpha = latency_alpha
+        self.min_weight = min_weight
+        self.quarantine_after = quarantine_after
+        self.quarantine_time = quarantine_time
+        self.max_quarantine_time = max_quarantine_time
+        self.stale_after = stale_after
+
+        now = time.monotonic()
+        self._entries = {p['http']: _ProxyEntry(p, now) for p in proxies}
+        for key, latency in (latencies or {}).items():
+            if key in self._entries:
+                self._entries[key].ewma_latency = latency
+        self._seq = itertools.count()
+        self._pass = 0.0  # Pass of the latest pick, where proxies becoming eligible join
+        self._cooling = []  # (eligible_at, seq, key, generation)
+        self._eligible = [(0.0, next(self._seq), key, 0) for key in self._entries]  # (pass, seq, key, generation)
+        heapq.heapify(self._eligible)
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+    def acquire(self, timeout: float = 10.0) -> Dict[str, str]:
+        """
+        Take the eligible proxy that is due by weight (lowest pass)
+
+        Blocks (without spinning) until a proxy is eligible. If none becomes
+        eligible within `timeout` seconds every quarantined proxy is
+        readmitted, so a bad stretch never stalls the workers.
+        """
+        deadline = time.monotonic() + timeout
+        with self._available:
+            while True:
+                now = time.monotonic()
+                entry = self._pop_eligible(now)
+                if entry is not None:
+                    return entry.proxy
+
+                remaining = deadline - now
+                if remaining <= 0:
+                    self._readmit_all(now)
+                    deadline = now + timeout
+                    continue
+                if self._cooling:
+                    remaining = min(remaining, self._cooling[0][0] - now)
+                self._available.wait(remaining)
+
+    def try_acquire(self) -> Optional[Dict[str, str]]:
+        """Non-blocking acquire, returns None if no proxy is eligible yet"""
+        with self._lock:
+            entry = self._pop_eligible(time.monotonic())
+            return entry.proxy if entry else None
+
+    def next_eligible_in(self) -> Optional[float]:
+        """Seconds until the next proxy becomes eligible (None if none are ready)"""
+        with self._lock:
+            now = time.monotonic()
+            self._promote(now)
+            if self._eligible:
+                return 0.0
+            if not self._cooling:
+                return None
+            return max(0.0, self._cooling[0][0] - now)
+
+    def release(self, proxy: Dict[str, str], success: bool, latency: Optional[float] = None):
+        """Score a proxy from the outcome of a real request"""
+        with self._lock:
+            entry = self._entries.get(proxy['http'])
+            if entry is None:
+                return
+            if latency is not None:
+                if entry.ewma_latency is None:
+                    entry.ewma_latency = latency
+                else:
+                    entry.ewma_latency += self.latency_alpha * (latency - entry.ewma_latency)
+            if success:
+                entry.successes += 1
+                entry.consecutive_failures = 0
+                entry.last_ok = time.monotonic()
+            else:
+                entry.failures += 1
+                entry.consecutive_failures += 1
+                if entry.state == READY and entry.consecutive_failures >= self.quarantine_after:
+                    self._quarantine(entry, time.monotonic())
+                elif entry.state == READY:
+                    # A failure costs an extra turn at the lowered weight, its
+                    # eligible heap item is moved back lazily when it surfaces
+                    entry.pass_ = max(entry.pass_, self._pass) + 1 / self._weight(entry)
+
+    def due_for_probe(self) -> List[Dict[str, str]]:
+        """Quarantined proxies whose wait is over and ready proxies gone stale"""
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.probing:
+                    continue
+                if entry.state == QUARANTINED:
+                    wait = min(self.quarantine_time * (2 ** entry.probe_failures), self.max_quarantine_time)
+                    if now - entry.quarantined_at < wait:
+                        continue
+                elif now - entry.last_ok < self.stale_after:
+                    continue
+                entry.probing = True
+                due.append(entry.proxy)
+        return due
+
+    def probe_result(self, proxy: Dict[str, str], ok: bool):
+        """Apply the outcome of an active probe"""
+        with self._available:
+            entry = self._entries[proxy['http']]
+            entry.probing = False
+            now = time.monotonic()
+            if ok:
+                entry.probe_failures = 0
+                entry.consecutive_failures = 0
+                entry.last_ok = now
+                if entry.state != READY:
+                    self._make_ready(entry, now)
+            else:
+                if entry.state == QUARANTINED:
+                    entry.probe_failures += 1
+                else:
+                    self._quarantine(entry, now)
+                entry.quarantined_at = now
+
+    def weight(self, proxy: Dict[str, str]) -> float:
+        """Current pick weight of a proxy (1.0 for a perfect, instant proxy)"""
+        with self._lock:
+            return self._weight(self._entries[proxy['http']])
+
+    def counts(self) -> Dict[str, int]:
+        """Number of proxies in each state"""
+        with self._lock:
+            ready = sum(1 for e in self._entries.values() if e.state == READY)
+        return {READY: ready, QUARANTINED: len(self._entries) - ready}
+
+    def stats(self) -> List[Dict]:
+        """Per-proxy statistics, best weight first"""
+        with self._lock:
+            rows = [{
+                'proxy': key,
+                'state': entry.state,
+                'successes': entry.successes,
+                'failures': entry.failures,
+                'ewma_latency': entry.ewma_latency,
+                'weight': self._weight(entry),
+            } for key, entry in self._entries.items()]
+        rows.sort(key=lambda row: row['weight'], reverse=True)
+        return rows
+
+    def _weight(self, entry: _ProxyEntry) -> float:
+        # Squared Laplace-smoothed odds of success: new proxies start at 1 and
+        # picks concentrate on reliable proxies (19 successes in 20 outweigh
+        # 3 in 5 about fifty times over)
+        odds = ((entry.successes + 1) / (entry.failures + 1)) ** 2
+        latency = entry.ewma_latency if entry.ewma_latency is not None else self.reference_latency
+        return max(self.min_weight, odds / (1 + latency / self.reference_latency))
+
+    def _current(self, item) -> bool:
+        entry = self._entries[item[2]]
+        return entry.generation == item[3] and entry.state == READY
+
+    def _drop_stale_top(self, heap: list):
+        while heap and not self._current(heap[0]):
+            heapq.heappop(heap)
+
+    def _promote(self, now: float):
+        """Move proxies whose cooldown is over to the eligible heap"""
+        cooling = self._cooling
+        while cooling and cooling[0][0] <= now:
+            item = heapq.heappop(cooling)
+            if self._current(item):
+                entry = self._entries[item[2]]
+                # A proxy that sat out doesn't bank picks for later
+                entry.pass_ = max(entry.pass_, self._pass)
+                heapq.heappush(self._eligible, (entry.pass_, next(self._seq), item[2], item[3]))
+        self._drop_stale_top(self._eligible)
+
+    def _pop_eligible(self, now: float) -> Optional[_ProxyEntry]:
+        self._promote(now)
+        eligible = self._eligible
+        while eligible:
+            pass_, _, key, generation = heapq.heappop(eligible)
+            entry = self._entries[key]
+            if entry.pass_ <= pass_:
+                break
+            heapq.heappush(eligible, (entry.pass_, next(self._seq), key, generation))
+            self._drop_stale_top(eligible)
+        else:
+            return None
+        weight = self._weight(entry)
+        self._pass = pass_
+        entry.pass_ = pass_ + 1 / weight
+        entry.generation += 1
+        heapq.heappush(self._cooling, (now + self.cooldown / min(weight, 1.0), next(self._seq), key, entry.generation))
+        return entry
+
+    def _push(self, entry: _ProxyEntry, eligible_at: float):
+        entry.generation += 1
+        heapq.heappush(self._cooling, (eligible_at, next(self._seq), entry.proxy['http'], entry.generation))
+        # Superseded heap items are dropped lazily, rebuild if they pile up
+        if len(self._cooling) + len(self._eligible) > 4 * len(self._entries):
+            self._cooling = [item for item in self._cooling if self._current(item)]
+            self._eligible = [item for item in self._eligible if self._current(item)]
+            heapq.heapify(self._cooling)
+            heapq.heapify(self._eligible)
+
+    def _quarantine(self, entry: _ProxyEntry, now: float):
+        entry.state = QUARANTINED
+        entry.generation += 1  # Invalidates its heap item
+        entry.quarantined_at = now
+
+    def _make_ready(self, entry: _ProxyEntry, now: float):
+        entry.state = READY
+        self._push(entry, now)
+        self._available.notify()
+
+    def _readmit_all(self, now: float):
+        for entry in self._entries.values():
+            entry.consecutive_failures = 0
+            if entry.state != READY:
+                self._make_ready(entry, now)
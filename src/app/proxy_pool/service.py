@@ -0,0 +1,110 @@
+"""
+Proxy pool shared between processes
+
+ProxyPoolService serves the parent's ProxyScheduler over a
+multiprocessing manager connection from a background thread. Worker
+processes attach with connect_scheduler() and get a proxy object with the
+same acquire/release interface, so a proxy marked dead or cooling down in
+one worker is seen by every other worker on its next acquire, and the
+health monitor in the parent keeps probing one shared table. An
+AdaptiveLimiter and RetryBudget served alongside it (connect_limiter(),
+connect_retry_budget()) gate the requests and retries of all processes
+together, and a SingleFlight (connect_singleflight()) coalesces their
+duplicate in-flight fetches and keeps the results of recent ones.
+"""
+
+import os
+import threading
+from multiprocessing.managers import BaseManager
+from typing import Tuple
+
+SCHEDULER_METHODS = (
+    'acquire', 'try_acquire', 'next_eligible_in', 'release',
+    'due_for_probe', 'probe_result', 'weight', 'counts', 'stats'
+)
+
+LIMITER_METHODS = ('acquire', 'release', 'metrics')
+
+RETRY_BUDGET_METHODS = ('deposit', 'withdraw', 'stats')
+
+SINGLEFLIGHT_METHODS = ('join', 'leave', 'recall', 'remember', 'stats')
+
+# The shared objects served by this process (set by ProxyPoolService)
+_served_scheduler = None
+_served_limiter = None
+_served_retry_budget = None
+_served_singleflight = None
+
+def _get_scheduler():
+    return _served_scheduler
+
+def _get_limiter():
+    return _served_limiter
+
+def _get_retry_budget():
+    return _served_retry_budget
+
+def _get_singleflight():
+    return _served_singleflight
+
+class ProxyPoolManager(BaseManager):
+    pass
+
+ProxyPoolManager.register('get_scheduler', callable=_get_scheduler, exposed=SCHEDULER_METHODS)
+ProxyPoolManager.register('get_limiter', callable=_get_limiter, exposed=LIMITER_METHODS)
+ProxyPoolManager.register('get_retry_budget', callable=_get_retry_budget, exposed=RETRY_BUDGET_METHODS)
+ProxyPoolManager.register('get_singleflight', callable=_get_singleflight, exposed=SINGLEFLIGHT_METHODS)
+
+class ProxyPoolService:
+    """Serves one ProxyScheduler (optionally with an AdaptiveLimiter, RetryBudget and SingleFlight) to other processes"""
+
+    def __init__(self, scheduler, limiter=None, retry_budget=None, singleflight=None, host: str = '127.0.0.1'):
+        global _served_scheduler, _served_limiter, _served_retry_budget, _served_singleflight
+        if _served_scheduler is not None and _served_scheduler is not scheduler:
+            raise RuntimeError("A different scheduler is already being served by this process")
+        _served_scheduler = scheduler
+        _served_limiter = limiter
+        _served_retry_budget = retry_budget
+        _served_singleflight = singleflight
+
+        self.authkey = os.urandom(16)
+        manager = ProxyPoolManager(address=(host, 0), authkey=self.authkey)
+        self._server = manager.get_server()
+        self.address = self._server.address
+        self._thread = threading.Thread(target=self._server.serve_forever, name='proxy-pool-service', daemon=True)
+
+    def start(self) -> 'ProxyPoolService':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.stop_event.set()
+
+    @property
+    def connect_args(self) -> Tuple[Tuple[str, int], bytes]:
+        """Arguments for the connect_*() functions in a worker process"""
+        return self.address, self.authkey
+
+def connect_scheduler(address: Tuple[str, int], authkey: bytes):
+    """Attach to a ProxyPoolService and return a proxy for its scheduler"""
+    manager = ProxyPoolManager(address=address, authkey=authkey)
+    manager.connect()
+    return manager.get_scheduler()
+
+def connect_limiter(address: Tuple[str, int], authkey: bytes):
+    """Attach to a ProxyPoolService started with a limiter and return a proxy for it"""
+    manager = ProxyPoolManager(address=address, authkey=authkey)
+    manager.connect()
+    return manager.get_limiter()
+
+def connect_retry_budget(address: Tuple[str, int], authkey: bytes):
+    """Attach to a ProxyPoolService started with a retry budget and return a proxy for it"""
+    manager = ProxyPoolManager(address=address, authkey=authkey)
+    manager.connect()
+    return manager.get_retry_budget()
+
+def connect_singleflight(address: Tuple[str, int], authkey: bytes):
+    """Attach to a ProxyPoolService started with a SingleFlight and return a proxy for it"""
+    manager = ProxyPoolManager(address=address, authkey=authkey)
+    manager.connect()
+    return manager.get_singleflight()
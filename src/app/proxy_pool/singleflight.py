@@ -0,0 +1,136 @@
+"""
+Coalescing of duplicate in-flight requests
+
+The first caller to join() a key (a canonical page URL) is its leader and
+does the fetch; callers joining the same key while it is in flight wait for
+the leader to leave() and get its result instead of fetching it again.
+
+    leader, result = flights.join(url)
+    if leader:
+        try:
+            result = fetch(url)
+        finally:
+            flights.leave(url, result)
+
+A leader that leaves without a result (its fetch failed or was deferred)
+promotes one of the waiters to leader, so a failure is never shared. Served
+by ProxyPoolService (connect_singleflight()), one SingleFlight coalesces the
+requests of every worker process.
+
+With `memory`, the results of the latest fetches are kept after they leave:
+join() of such a key returns its result at once, and recall()/remember()
+look up and add results (a redirect target found mid-fetch) directly, so a
+page parsed by any worker is not parsed again by another.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+class _Call:
+    __slots__ = ('done', 'result')
+
+    def __init__(self):
+        self.done = False
+        self.result = None
+
+class SingleFlight:
+    """One fetch per key at a time, its result shared with concurrent callers"""
+
+    def __init__(self, timeout: float = 120.0, memory: int = 0):
+        """
+        Args:
+            timeout: Longest wait (s) for a leader before fetching anyway (a
+                leader in a crashed worker never leaves)
+            memory: Results of finished fetches kept for later callers (least
+                recently used dropped first), 0 to keep none
+        """
+        self.timeout = timeout
+        self.memory = memory
+        self._calls = {}
+        self._results = OrderedDict()
+        self._cond = threading.Condition()
+        self.leaders = 0
+        self.shared = 0
+        self.promoted = 0
+        self.recalled = 0
+
+    def join(self, key: str) -> Tuple[bool, Optional[Any]]:
+        """(True, None) if the caller should fetch `key` and leave(), else (False, the leader's result)"""
+        with self._cond:
+            waited = False
+            while True:
+                result = self._recall(key)
+                if result is not None:
+                    self.recalled += 1
+                    return False, result
+                call = self._calls.get(key)
+                if call is None:
+                    self._calls[key] = _Call()
+                    self.leaders += 1
+                    if waited:
+                        self.promoted += 1
+                    return True, None
+                waited = True
+                if not self._cond.wait_for(lambda: call.done, self.timeout):
+                    # Give up on a leader that never came back, as if it had failed
+                    if self._calls.get(key) is call:
+                        del self._calls[key]
+                        call.done = True
+                        self._cond.notify_all()
+                    continue
+                if call.result is not None:
+                    self.shared += 1
+                    return False, call.result
+
+    def leave(self, key: str, result: Optional[Any] = None):
+        """Finish the fetch of `key`, handing `result` (None if it failed) to the waiting callers"""
+        with self._cond:
+            call = self._calls.pop(key, None)
+            if call is None:
+                return
+            call.done = True
+            call.result = result
+            self._remember(key, result)
+            self._cond.notify_all()
+
+    def recall(self, key: str) -> Optional[Any]:
+        """Result kept from an earlier fetch of `key`, None if there is none"""
+        with self._cond:
+            result = self._recall(key)
+            if result is not None:
+                self.recalled += 1
+            return result
+
+    def remember(self, key: str, result: Any):
+        """Keep a result obtained outside join()/leave() (no-op without memory)"""
+        with self._cond:
+            self._remember(key, result)
+
+    def _recall(self, key: str) -> Optional[Any]:
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+        return result
+
+    def _remember(self, key: str, result: Optional[Any]):
+        if result is None or not self.memory:
+            return
+        self._results[key] = result
+        self._results.move_to_end(key)
+        if len(self._results) > self.memory:
+            self._results.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {'fetches': self.leaders, 'shared': self.shared, 'promoted': self.promoted,
+                    'recalled': self.recalled, 'in_flight': len(self._calls)}
+
+def format_singleflight(stats: Dict) -> Optional[str]:
+    """Summary line of SingleFlight.stats(), None if nothing was coalesced"""
+    recalled = stats.get('recalled', 0)
+    if not stats['shared'] and not stats['promoted'] and not recalled:
+        return None
+    return "Coalesced requests: {} duplicate fetches absorbed, {} fetches, {} taken over after a failed one{}".format(
+        stats['shared'], stats['fetches'], stats['promoted'],
+        ", {} answered from earlier results".format(recalled) if recalled else "")
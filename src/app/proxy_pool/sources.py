@@ -0,0 +1,51 @@
+"""
+Proxy list loaders
+
+Two formats are in use:
+    working_proxies_<timestamp>.json   {"proxies": ["http://ip:port", ...],
+                                        "details": [{"proxy": ..., "latency_ms": ...}, ...]}
+    proxies_list.txt                   one ip:port per line (proxies.py harvest output)
+
+Both loaders return proxy URLs of the form http://ip:port. The "details"
+list is written by `proxies.py validate` and is optional.
+"""
+
+import glob
+import json
+from typing import Dict, List, Optional
+
+def load_working_proxies(path: str) -> List[str]:
+    """Load proxy URLs from a validated working_proxies_*.json file"""
+    with open(path, 'r') as f:
+        proxy_data = json.load(f)
+    return list(proxy_data['proxies'])
+
+def load_proxy_list(path: str) -> List[str]:
+    """Load proxy URLs from a plain ip:port list"""
+    with open(path, 'r') as f:
+        lines = [line.strip() for line in f if line.strip()]
+    return [line if '://' in line else 'http://{}'.format(line) for line in lines]
+
+def load_proxies(source: str) -> List[str]:
+    """Load proxy URLs from either format, picked by file extension"""
+    if source.endswith('.json'):
+        return load_working_proxies(source)
+    return load_proxy_list(source)
+
+def load_proxy_latencies(path: str) -> Dict[str, float]:
+    """Measured latency (seconds) per proxy URL from a validated JSON file, if recorded"""
+    if not path.endswith('.json'):
+        return {}
+    with open(path, 'r') as f:
+        proxy_data = json.load(f)
+    return {
+        detail['proxy']: detail['latency_ms'] / 1000
+        for detail in proxy_data.get('details', [])
+        if detail.get('latency_ms') is not None
+    }
+
+def latest_working_proxies(default: Optional[str] = None, directory: str = '.') -> Optional[str]:
+    """Newest working_proxies_<timestamp>.json in a directory, or `default` if there is none"""
+    # The timestamp format (YYYYmmdd_HHMMSS) sorts chronologically
+    candidates = sorted(glob.glob('{}/working_proxies_*.json'.format(directory)))
+    return candidates[-1] if candidates else default
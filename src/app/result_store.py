@@ -0,0 +1,146 @@
+"""
+Append-only store for scraped word results
+
+Every result is written once, as one JSON line, when it arrives:
+
+    {letter}_dictionary_data_results/
+        00000.jsonl
+        00001.jsonl
+        ...
+        progress.log        progress journal, one completed word per line
+
+Each run (and every `segment_records` results) starts a new segment, so a
+crash can only ever leave the last line of the newest segment torn, and load()
+skips such a line. A word goes into the journal after its result, so
+completed() - a set built from plain lines, milliseconds even for a whole
+letter - never claims a word whose result is missing. Checkpoints are an
+fsync instead of rewriting every output file; the words/definitions/examples/
+pronunciations/metadata JSON layout is produced once from load() at the end
+(webster_scraper.save_results_to_json).
+"""
+
+import glob
+import json
+import os
+import shutil
+from threading import Lock
+from typing import Dict, Iterator, List, Set
+
+class ResultStore:
+    def __init__(self, directory: str, segment_records: int = 1000):
+        """
+        Args:
+            directory: Segment directory, created on first append
+            segment_records: Results per segment file before a new one is started
+        """
+        self.directory = directory
+        self.segment_records = segment_records
+        self.lock = Lock()
+        self._file = None
+        self._records = 0
+        self._journal = None
+        self.journal_path = os.path.join(directory, 'progress.log')
+
+    def _segments(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directory, '*.jsonl')))
+
+    def _open_segment(self):
+        os.makedirs(self.directory, exist_ok=True)
+        segments = self._segments()
+        number = int(os.path.basename(segments[-1])[:-len('.jsonl')]) + 1 if segments else 0
+        self._file = open(os.path.join(self.directory, '{:05d}.jsonl'.format(number)), 'a', encoding='utf-8')
+        self._records = 0
+
+    def append(self, result: Dict):
+        """Write one result to the log and journal its word as completed"""
+        line = json.dumps(result, ensure_ascii=False) + '\n'
+        with self.lock:
+            if self._file is None or self._records >= self.segment_records:
+                self._close_segment()
+                self._open_segment()
+            self._file.write(line)
+            self._file.flush()
+            self._records += 1
+            self._journal_words([result['word']])
+
+    def _journal_words(self, words):
+        if self._journal is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._journal = open(self.journal_path, 'a+b')
+            # Cut a line torn by a crash so the next word starts on its own line
+            size = self._journal.seek(0, os.SEEK_END)
+            if size:
+                self._journal.seek(max(size - 4096, 0))
+                tail = self._journal.read()
+                if not tail.endswith(b'\n'):
+                    self._journal.truncate(size - len(tail) + tail.rfind(b'\n') + 1)
+        self._journal.write(''.join(word + '\n' for word in words).encode('utf-8'))
+        self._journal.flush()
+
+    def extend(self, results: List[Dict]):
+        for result in results:
+            self.append(result)
+
+    def sync(self):
+        """Make everything appended so far durable (results before the journal)"""
+        with self.lock:
+            for f in (self._file, self._journal):
+                if f is not None:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+    def _close_segment(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        self._close_segment()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def completed(self) -> Set[str]:
+        """Replay the progress journal: words whose results are stored"""
+        if not os.path.exists(self.journal_path):
+            return set()
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            data = f.read()
+        # Drop a torn last line
+        return set(data[:data.rfind('\n') + 1].splitlines())
+
+    def rebuild_journal(self) -> Set[str]:
+        """Recreate a lost journal from the stored results"""
+        words = self.words()
+        with self.lock:
+            self._journal_words(sorted(words))
+        return words
+
+    def records(self) -> Iterator[Dict]:
+        """Every stored result in write order (torn lines skipped)"""
+        for path in self._segments():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+    def load(self) -> List[Dict]:
+        """Latest result per word, in the order words were first stored"""
+        latest = {}
+        for result in self.records():
+            latest[result['word']] = result
+        return list(latest.values())
+
+    def words(self) -> Set[str]:
+        return {result['word'] for result in self.records()}
+
+    def clear(self):
+        """Delete the log and journal (after compaction, or to start over)"""
+        with self.lock:
+            self.close()
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.records())
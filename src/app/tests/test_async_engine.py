@@ -0,0 +1,87 @@
+"""async_engine: words ending up at the same page share one download and one parse"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+import async_engine
+from async_engine import scrape_words_async
+from page_cache import PageCache
+
+PAGE = "<html><body><h1 class='hword'>run</h1></body></html>"
+
+class DirectProxyManager:
+    """Stands in for ProxyManager: connect without a proxy, fail on any error"""
+
+    class retry:
+        @staticmethod
+        def note_request():
+            pass
+
+    def __init__(self):
+        self.scheduler = self
+
+    def try_acquire(self):
+        return {}
+
+    def mark_proxy_status(self, proxy, success, latency=None):
+        pass
+
+    def record_failure(self, proxy, error, attempt):
+        raise AssertionError("unexpected failure: {!r}".format(error))
+
+async def scrape(monkeypatch, words, url_for, cache=None):
+    """Scrape `words`, parsing in threads so the parses can be counted"""
+    monkeypatch.setattr(async_engine, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    parsed = []
+
+    def parse(word, html):
+        parsed.append(word)
+        return {'word': word, 'part_of_speech': 'verb', 'pronunciations': [], 'definitions': ['to move fast']}
+
+    results = await scrape_words_async(words, DirectProxyManager(), parse, url_for, {}, cache=cache)
+    return sorted(result['word'] for result in results), parsed
+
+def test_redirects_to_one_page_share_a_download_and_parse(monkeypatch):
+    hits = []
+
+    async def redirect(request):
+        hits.append(request.path)
+        raise web.HTTPFound('/page')
+
+    async def page(request):
+        hits.append(request.path)
+        return web.Response(text=PAGE, content_type='text/html')
+
+    async def main():
+        app = web.Application()
+        app.router.add_get('/a', redirect)
+        app.router.add_get('/b', redirect)
+        app.router.add_get('/page', page)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            return await scrape(monkeypatch, ['a', 'b'], lambda word: 'http://127.0.0.1:{}/{}'.format(port, word))
+        finally:
+            await runner.cleanup()
+
+    words, parsed = asyncio.run(main())
+
+    assert words == ['a', 'b']
+    assert len(parsed) == 1
+    assert sorted(hits) == ['/a', '/b', '/page', '/page']
+
+def test_words_cached_under_one_page_are_parsed_once(monkeypatch, tmp_path):
+    cache = PageCache(str(tmp_path))
+    cache.put('https://example.test/page', PAGE)
+    cache.add_redirect('https://example.test/old', 'https://example.test/page')
+    urls = {'old': 'https://example.test/old', 'new': 'https://example.test/page'}
+
+    words, parsed = asyncio.run(scrape(monkeypatch, ['old', 'new'], urls.get, cache=cache))
+
+    assert words == ['new', 'old']
+    assert len(parsed) == 1
@@ -0,0 +1,56 @@
+"""Backend parity of page_parsers on the saved word pages in fixtures/word_pages"""
+
+import os
+
+import pytest
+
+from page_parsers import PARSERS, WordPageExtractor, _comparable, get_parser, load_fixtures
+
+FIXTURES = load_fixtures(os.path.join(os.path.dirname(__file__), 'fixtures', 'word_pages'))
+
+CANDIDATES = [name for name in PARSERS if name != 'bs4']
+
+@pytest.mark.parametrize('name', CANDIDATES)
+@pytest.mark.parametrize('word', sorted(FIXTURES))
+@pytest.mark.parametrize('method', ['word_page', 'text_pronunciations'])
+def test_backend_matches_bs4(name, word, method):
+    html = FIXTURES[word]
+    expected = getattr(get_parser('bs4'), method)(word, html)
+    assert _comparable(getattr(get_parser(name), method)(word, html)) == _comparable(expected)
+
+@pytest.mark.parametrize('word', sorted(FIXTURES))
+def test_stream_chunk_boundaries(word):
+    # Tags and entities split across chunks, as when the page is downloaded
+    extractor = WordPageExtractor(word).feed_all(FIXTURES[word], chunk_size=7)
+    assert _comparable(extractor.word_page()) == _comparable(get_parser('bs4').word_page(word, FIXTURES[word]))
+
+def test_word_page_fields():
+    result = get_parser('bs4').word_page('run', FIXTURES['run'])
+    assert result['part_of_speech'] == 'verb'
+    assert [pron['audio_file'] for pron in result['pronunciations']] == ['run00001', 'run00002']
+    assert result['text_pronunciations'][0] == 'ˈrən'
+    assert result['etymology'].startswith('Middle English')
+    assert [d['definition_number'] for d in result['definitions']] == [1, 2, 3, 4]
+    assert result['definitions'][0]['examples'][1]['attribution'] == '—The Times, 4 May 2019'
+
+@pytest.mark.parametrize('name', list(PARSERS))
+def test_lemma_page_is_the_lemma_entry(name):
+    # "ran" redirects to the page of "run": same entry, reported under the word asked for
+    parser = get_parser(name)
+    ran = parser.word_page('ran', FIXTURES['ran'])
+    run = parser.word_page('run', FIXTURES['run'])
+    assert ran['word'] == 'ran'
+    assert _comparable(dict(ran, word='run')) == _comparable(run)
+
+@pytest.mark.parametrize('name', list(PARSERS))
+def test_block_page_has_no_entry(name):
+    result = get_parser(name).word_page('empty', FIXTURES['empty'])
+    assert not (result['part_of_speech'] or result['pronunciations'] or result['definitions'])
+    assert result['text_pronunciations'] == []
+
+def test_stream_ignores_senses_after_the_dictionary_column():
+    # The one designed difference: the stream backend stops at the end of #left-content
+    html = FIXTURES['run'].replace('<div id="right-rail" class="col-lg-4">',
+                                   '<div id="right-rail"><div class="sense"><span class="dtText">: related</span></div>')
+    assert len(get_parser('bs4').word_page('run', html)['definitions']) == 5
+    assert len(get_parser('stream').word_page('run', html)['definitions']) == 4
@@ -0,0 +1,44 @@
+"""proxies.py validation against a local stand-in proxy"""
+
+import asyncio
+
+from proxies import check_proxy, validate_proxies
+
+BODY = b'x' * 4096
+
+async def handle(reader, writer):
+    """Answer absolute-form GETs like a forwarding proxy: /moved redirects, anything else is a page"""
+    request_line = await reader.readline()
+    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+        pass
+    target = request_line.split()[1]
+    if target.endswith(b'/moved'):
+        writer.write(b"HTTP/1.1 301 Moved Permanently\r\nLocation: /\r\nContent-Length: 0\r\n\r\n")
+    else:
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(BODY) + BODY)
+    await writer.drain()
+    writer.close()
+
+def run_with_proxy(check):
+    async def main():
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        async with server:
+            return await check('127.0.0.1:{}'.format(server.sockets[0].getsockname()[1]))
+    return asyncio.run(main())
+
+def test_working_proxy_is_measured():
+    result = run_with_proxy(lambda proxy: check_proxy(proxy, 'http://example.test/'))
+    assert result['status'] == 200
+    assert result['bytes'] > len(BODY)
+    assert result['throughput_kbps'] > 0
+
+def test_redirect_does_not_count_as_working():
+    assert run_with_proxy(lambda proxy: check_proxy(proxy, 'http://example.test/moved')) is None
+
+def test_malformed_candidates_do_not_fail_the_batch():
+    async def check(proxy):
+        working = await validate_proxies(['not-a-proxy', '127.0.0.1:notaport', '127.0.0.1:1', proxy],
+                                         'http://example.test/', connect_timeout=1, timeout=2)
+        return proxy, working
+    proxy, working = run_with_proxy(check)
+    assert [row['proxy'] for row in working] == ['http://' + proxy]
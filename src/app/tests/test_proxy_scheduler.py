@@ -0,0 +1,26 @@
+"""ProxyScheduler pick weighting and quarantine"""
+
+from collections import Counter
+
+from proxy_pool import ProxyScheduler
+
+GOOD = {"http": "http://10.0.0.1:8080", "https": None}
+FLAKY = {"http": "http://10.0.0.2:8080", "https": None}
+
+def test_reliable_proxy_gets_most_picks():
+    scheduler = ProxyScheduler([GOOD, FLAKY], cooldown=0)
+    for _ in range(10):
+        scheduler.release(GOOD, True, 1.0)
+    for success in (True, False, True, True, False):
+        scheduler.release(FLAKY, success, 1.0)
+
+    picks = Counter(scheduler.acquire(timeout=1)['http'] for _ in range(200))
+    assert picks[GOOD['http']] > 10 * picks[FLAKY['http']]
+    assert picks[FLAKY['http']] > 0
+
+def test_consecutive_failures_quarantine_a_proxy():
+    scheduler = ProxyScheduler([GOOD, FLAKY], cooldown=0)
+    scheduler.release(FLAKY, False, 1.0)
+    scheduler.release(FLAKY, False, 1.0)
+
+    assert all(scheduler.acquire(timeout=1) == GOOD for _ in range(20))
@@ -0,0 +1,28 @@
+"""webster_audio.migrate_legacy_files: one legacy file per word goes to the word's last clip"""
+
+import json
+import os
+
+import webster_audio
+from audio_store import AudioStore
+
+def test_legacy_file_moves_to_the_last_clip(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(webster_audio, '_audio_store', AudioStore())
+    with open('r_pronunciations.json', 'w', encoding='utf-8') as f:
+        json.dump([
+            {'word': 'run', 'pronunciation_number': 1, 'audio_dir': 'r', 'audio_file': 'run00001'},
+            {'word': 'run', 'pronunciation_number': 2, 'audio_dir': 'r', 'audio_file': 'run00002'},
+        ], f)
+    os.makedirs('audio', exist_ok=True)
+    with open(webster_audio.legacy_audio_path('run'), 'wb') as f:
+        f.write(b'second clip')
+
+    webster_audio.migrate_legacy_files('*_pronunciations.json')
+
+    store = webster_audio.get_audio_store()
+    assert webster_audio.legacy_audio_path('run') == os.path.join('audio', 'run_pronunciation.mp3')
+    assert not os.path.exists(webster_audio.legacy_audio_path('run'))
+    assert store.lookup('run', 1) is None
+    with open(store.lookup('run', 2), 'rb') as f:
+        assert f.read() == b'second clip'
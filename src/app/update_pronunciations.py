@@ -1,7 +1,5 @@
 #!/usr/bin/env python3
 
-import requests
-from bs4 import BeautifulSoup
 import json
 import os
 import time
@@ -10,10 +8,18 @@ import urllib3
 import random
 from threading import Lock
 from typing import Dict, List, Optional
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from job_queue import JobQueue
+from negative_cache import NegativeCache
+from page_cache import PageCache
+from page_fetch import TransferStats, extract_cached, fetch_word_page
+from page_parsers import add_unique
+from pronunciation_store import PronunciationStore
+from proxy_pool import (AdaptiveLimiter, ProxyManager, RetryBudget, RetryLater, RetryPolicy, SingleFlight,
+                        format_singleflight, latest_working_proxies)
+from word_urls import word_url
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -21,116 +27,103 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 # Global lock for printing
 print_lock = Lock()
 
-class ProxyManager:
-    def __init__(self):
-        """Initialize with verified working proxies from JSON file"""
-        with open('working_proxies_20250403_201006.json', 'r') as f:
-            proxy_data = json.load(f)
-            proxy_urls = proxy_data['proxies']
-            
-        self.proxies = [{"http": url, "https": None} for url in proxy_urls]
-        random.shuffle(self.proxies)  # Randomize initial order
-        
-        # Track proxy status
-        self.proxy_status = {str(p): True for p in self.proxies}
-        self.proxy_last_used = {str(p): 0 for p in self.proxies}
-        self.proxy_index = 0
-        self.proxy_lock = Lock()  # Add lock for thread safety
-        
-        # Create a session with optimized settings
-        self.session = requests.Session()
-        self.session.verify = False
-        self.session.trust_env = False
-        
-        # Optimize retry settings
-        retries = Retry(
-            total=2,  # Reduced from 3 to 2
-            backoff_factor=0.05,  # Reduced from 0.1
-            status_forcelist=[500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS", "POST"]
-        )
-        
-        # Increase connection pooling even more
-        adapter = HTTPAdapter(
-            max_retries=retries,
-            pool_connections=75,  # Increased from 50
-            pool_maxsize=75,  # Increased from 50
-            pool_block=False
-        )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
-        
-        # Add default headers
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Cache-Control': 'no-cache',
-            'Pragma': 'no-cache'
-        })
-        
-        with print_lock:
-            print(f"Loaded {len(self.proxies)} verified proxies")
-
-    def get_next_proxy(self) -> Dict[str, str]:
-        """Get next working proxy with minimum pause between uses"""
-        with self.proxy_lock:
-            for _ in range(len(self.proxies)):
-                proxy = self.proxies[self.proxy_index]
-                self.proxy_index = (self.proxy_index + 1) % len(self.proxies)
-                
-                # Check if proxy is marked as working
-                if not self.proxy_status[str(proxy)]:
-                    continue
-                    
-                # Ensure minimum pause between uses of same proxy
-                last_used = self.proxy_last_used[str(proxy)]
-                if last_used > 0:
-                    elapsed = time.time() - last_used
-                    if elapsed < 1.0:  # Reduced from 2.0s to 1.0s - balanced value
-                        continue
-                
-                self.proxy_last_used[str(proxy)] = time.time()
-                return proxy
-            
-            # If we get here, reset all proxies and try again
-            for p in self.proxy_status:
-                self.proxy_status[p] = True
-            return self.get_next_proxy()
-
-    def mark_proxy_status(self, proxy: Dict[str, str], success: bool):
-        """Mark proxy as working or failed"""
-        with self.proxy_lock:
-            if success:
-                self.proxy_status[str(proxy)] = True
-            else:
-                self.proxy_status[str(proxy)] = False
-                
-                # Check if we have any working proxies left
-                if not any(self.proxy_status.values()):
-                    for p in self.proxy_status:
-                        self.proxy_status[p] = True
+PROXY_SOURCE = latest_working_proxies('working_proxies_20250403_201006.json')
+
+# Bytes read/saved by the streamed, pronunciation-only page fetches
+transfer_stats = TransferStats()
+
+# Word pages already downloaded by webster_scraper are read from here first
+_page_cache = None
+
+# Words known to have no page are not requested again (shared with webster_scraper)
+_negative_cache = None
+
+# Pages being checked right now, so duplicate words wait instead of fetching again
+_in_flight = None
+
+# Guards the lazy creation of the three above (checks run in threads)
+_init_lock = Lock()
+
+# Words recorded between two commits of a file's pronunciation store
+CHECKPOINT_WORDS = 60
+
+# Checks in flight start at INITIAL_IN_FLIGHT and adapt up to MAX_IN_FLIGHT,
+# backing off on 403/429/timeouts (see proxy_pool.concurrency)
+INITIAL_IN_FLIGHT = 8
+MAX_IN_FLIGHT = 50
+
+def create_proxy_manager() -> ProxyManager:
+    """Proxy manager tuned for pronunciation checks (longer cooldown, bigger pool, fewer retries)"""
+    limiter = AdaptiveLimiter(initial=INITIAL_IN_FLIGHT, max_limit=MAX_IN_FLIGHT)
+    retry = RetryPolicy(max_attempts=3, budget=RetryBudget())
+    return ProxyManager(PROXY_SOURCE, limiter=limiter, retry=retry, cooldown=1.0, pool_size=75)
 
 def safe_print(*args, **kwargs):
     """Thread-safe printing function"""
     with print_lock:
         print(*args, **kwargs)
 
-def check_pronunciation(word: str, proxy_manager: ProxyManager) -> Dict:
+def get_page_cache() -> PageCache:
+    """Get or create this process's page cache"""
+    global _page_cache
+    with _init_lock:
+        if _page_cache is None:
+            _page_cache = PageCache()
+    return _page_cache
+
+def get_negative_cache() -> NegativeCache:
+    """Get or create this process's negative cache"""
+    global _negative_cache
+    with _init_lock:
+        if _negative_cache is None:
+            _negative_cache = NegativeCache()
+    return _negative_cache
+
+def get_in_flight() -> SingleFlight:
+    """Get or create this process's SingleFlight"""
+    global _in_flight
+    with _init_lock:
+        if _in_flight is None:
+            _in_flight = SingleFlight()
+    return _in_flight
+
+def check_pronunciation(word: str, proxy_manager: ProxyManager, attempt: int = 0, defer: bool = False) -> Dict:
     """
     Check pronunciation for a given word (focusing only on text pronunciations)
-    Uses the same proxy handling as webster_scraper.py
+    Uses the same proxy handling as webster_scraper.py; with `defer`, a retry
+    that has to back off raises RetryLater instead of sleeping in the thread
     """
-    # URL encode problematic characters in word
-    safe_word = requests.utils.quote(word)
-    url = f"https://www.merriam-webster.com/dictionary/{safe_word}"
+    url = word_url(word)
     
-    max_retries = 2  # Reduced from 3 to 2
-    for attempt in range(max_retries):
+    # Threads checking the same page at the same time share one fetch
+    in_flight = get_in_flight()
+    key = get_page_cache().resolve(url)
+    leader, shared = in_flight.join(key)
+    if not leader:
+        return dict(shared, word=word)
+    result = None
+    try:
+        result = fetch_pronunciation(word, url, proxy_manager, attempt, defer)
+    finally:
+        in_flight.leave(key, result)
+    return result or {'word': word, 'text_pronunciations': []}  # Return empty list instead of error for consistency
+
+def fetch_pronunciation(word: str, url: str, proxy_manager: ProxyManager, attempt: int, defer: bool) -> Optional[Dict]:
+    """Text pronunciations of a word page from the page cache, or fetched; None if every attempt failed"""
+    page_cache = get_page_cache()
+    negative_cache = get_negative_cache()
+    extractor = extract_cached(page_cache, url, word, 'pronunciation')
+    if extractor is not None:
+        transfer_stats.add({'bytes_read': 0, 'bytes_saved': None, 'aborted': False, 'cached': True})
+        return extractor.text_pronunciations()
+    
+    if negative_cache.lookup(word) is not None:
+        return {'word': word, 'text_pronunciations': []}
+    
+    current_proxy = None
+    while True:
         try:
-            current_proxy = proxy_manager.get_next_proxy()
+            current_proxy = proxy_manager.get_next_proxy(avoid=current_proxy)
             
             # Don't print every check to reduce log noise
             if attempt == 0:
@@ -147,103 +140,43 @@ def check_pronunciation(word: str, proxy_manager: ProxyManager) -> Dict:
                 'Cache-Control': 'max-age=0',
             }
             
-            # Reduced sleep time for better performance
-            time.sleep(random.uniform(0.5, 1.5))  # Reduced from 1.0-3.0s to 0.5-1.5s
-            
-            response = proxy_manager.session.get(
+            started = time.monotonic()
+            # Stream the page and hang up once the pronunciation section is read
+            extractor, transfer = fetch_word_page(
+                proxy_manager.session,
                 url,
+                word,
+                'pronunciation',
+                cache=page_cache,
                 proxies=current_proxy,
                 timeout=10,  # Reduced from 15 to 10 seconds
                 verify=False,
-                allow_redirects=True,
                 headers=headers
             )
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Result dictionary
-            result = {
-                'word': word,
-                'text_pronunciations': []
-            }
+            latency = time.monotonic() - started
+            transfer_stats.add(transfer)
             
-            # Check for text pronunciations using the specific structure
-            # Look for the prons-entries-list-inline span first
-            pron_section = soup.find('span', class_='prons-entries-list-inline')
-            if pron_section:
-                # Find all div.prons-entry-list-item elements within this span
-                pronunciation_divs = pron_section.find_all('div', class_='prons-entry-list-item')
-                
-                for div in pronunciation_divs:
-                    # Find the mw span inside each div
-                    mw_span = div.find('span', class_='mw')
-                    if mw_span:
-                        pron_text = mw_span.get_text(strip=True)
-                        if pron_text and pron_text not in result['text_pronunciations']:
-                            result['text_pronunciations'].append(pron_text)
+            # span.mw text pronunciations, with fallbacks to other markup
+            result = extractor.text_pronunciations()
             
-            # If the above specific structure didn't work, try more general selectors
-            if not result['text_pronunciations']:
-                # Backup approach 1: Look for any span with class='mw'
-                mw_spans = soup.find_all('span', class_='mw')
-                for span in mw_spans:
-                    pron_text = span.get_text(strip=True)
-                    if pron_text and pron_text not in result['text_pronunciations']:
-                        result['text_pronunciations'].append(pron_text)
-                        
-                # Backup approach A: Look for spans with pron-spell-content or pr classes
-                if not result['text_pronunciations']:
-                    for pron_span in soup.find_all('span', class_=['pron-spell-content', 'pr']):
-                        pron_text = pron_span.get_text(strip=True).replace('\xa0', '')
-                        if pron_text and pron_text not in result['text_pronunciations']:
-                            result['text_pronunciations'].append(pron_text)
-                
-                # Backup approach 2: Look for IPA notation specifically
-                if not result['text_pronunciations']:
-                    ipa_sections = soup.find_all('span', class_='ipa')
-                    for ipa in ipa_sections:
-                        ipa_text = ipa.get_text(strip=True)
-                        if ipa_text and ipa_text not in result['text_pronunciations']:
-                            result['text_pronunciations'].append(ipa_text)
-            
-            # If still no pronunciations found, look for the raw HTML structure
-            if not result['text_pronunciations']:
-                # Include the full HTML of the pronunciation section for debugging
-                html_section = soup.find('span', class_='prons-entries-list-inline')
-                if html_section:
-                    result['html_structure'] = str(html_section)
-            
-            proxy_manager.mark_proxy_status(current_proxy, True)
+            proxy_manager.mark_proxy_status(current_proxy, True, latency)
             return result
             
-        except requests.exceptions.HTTPError as e:
-            error_msg = str(e)
-            if "403" in error_msg:
-                # Forbidden - proxy might be blocked, mark as failed
-                proxy_manager.mark_proxy_status(current_proxy, False)
-            elif "404" in error_msg:
-                # Word not found - don't retry
-                proxy_manager.mark_proxy_status(current_proxy, True)
-                return {'word': word, 'text_pronunciations': []}
-            else:
-                # Other HTTP error
-                proxy_manager.mark_proxy_status(current_proxy, False)
-                
-            with print_lock:
-                print(f"Error checking '{word}' (attempt {attempt + 1}/{max_retries}): {error_msg}")
-                
-            if attempt < max_retries - 1:
-                time.sleep(random.uniform(1.0, 2.0))  # Random delay between attempts
-        
         except Exception as e:
+            # Dead proxies are retried at once on another proxy, blocks (403/429)
+            # after a backoff, and a 404 means the word has no page
+            failure, delay = proxy_manager.record_failure(current_proxy, e, attempt)
+            if proxy_manager.retry.is_terminal(failure):
+                negative_cache.record(word, failure)
+                return {'word': word, 'text_pronunciations': []}
             with print_lock:
-                print(f"Error checking '{word}' (attempt {attempt + 1}/{max_retries}): {str(e)}")
-            proxy_manager.mark_proxy_status(current_proxy, False)
-            if attempt < max_retries - 1:
-                time.sleep(random.uniform(1.0, 2.0))
-    
-    return {'word': word, 'text_pronunciations': []}  # Return empty list instead of error for consistency
+                print(f"Error checking '{word}' (attempt {attempt + 1}, {failure}): {str(e)}")
+            if delay is None:
+                return None
+            if defer and delay > 0:
+                raise RetryLater(delay, attempt + 1, failure)
+            time.sleep(delay)
+            attempt += 1
 
 def display_pronunciation_result(result: Dict):
     """Display the pronunciation check results in a readable format"""
@@ -268,204 +201,243 @@ def display_pronunciation_result(result: Dict):
                 print("\nHTML Structure (for debugging):")
                 print(result['html_structure'])
 
-def process_single_file(file_path: str, proxy_manager: ProxyManager):
-    """Process a single pronunciation file"""
-    try:
-        # Change the file path from pronunciations to words
-        words_file_path = file_path.replace("_pronunciations.json", "_words.json")
-        if not os.path.exists(words_file_path):
-            safe_print(f"Words file not found: {words_file_path}")
-            return 0, 0
-            
-        # Load words file first
-        with open(words_file_path, 'r', encoding='utf-8') as f:
-            words_data = json.load(f)
-            
-        # Load pronunciations file if it exists
-        pron_file_exists = os.path.exists(file_path)
-        if pron_file_exists:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                pronunciations = json.load(f)
+class LetterWriter:
+    """Records the checked words of one pronunciation file in its store, checkpointing as they arrive"""
+
+    def __init__(self, file_path: str, store: PronunciationStore, words: List[str], total_words: int):
+        self.file_path = file_path
+        self.store = store
+        self.words = words
+        self.total_words = total_words
+        self.remaining = len(words)
+        self.updated_count = 0
+        self.new_entries_count = 0
+
+    def record(self, word: str, result: Optional[Dict]):
+        # Empty results are recorded too, to avoid re-checking
+        text_prons = (result or {}).get('text_pronunciations') or []
+        updated = self.store.set_text_pronunciations(word, text_prons)
+        if updated:
+            self.updated_count += updated
         else:
-            pronunciations = []
-            
-        # Create a map of words to their existing pronunciation entries
-        word_to_pron_entries = {}
-        for entry in pronunciations:
-            word = entry['word']
-            if word not in word_to_pron_entries:
-                word_to_pron_entries[word] = []
-            word_to_pron_entries[word].append(entry)
-            
-        total_words = len(words_data)
-        safe_print(f"Processing {words_file_path} ({total_words} words)...")
-        
-        # Find words that need text pronunciations
-        words_to_process = []
-        for word_entry in words_data:
-            word = word_entry['word']
-            # Skip words we already processed
-            if word in word_to_pron_entries:
-                # Check if any entry for this word already has text_pronunciations
-                has_text_pron = any('text_pronunciations' in entry for entry in word_to_pron_entries[word])
-                if not has_text_pron:
-                    words_to_process.append(word)
-            else:
-                # Word doesn't have any pronunciation entries yet
-                words_to_process.append(word)
-                
-        if not words_to_process:
-            safe_print(f"No words need text pronunciations in {words_file_path}")
-            return 0, total_words
-            
-        # Deduplicate words to process (though they should already be unique)
-        words_to_process = list(set(words_to_process))
-        
-        safe_print(f"Found {len(words_to_process)} words needing text pronunciations out of {total_words} total words")
-        
-        # Process in moderately sized batches for better efficiency
-        batch_size = 20  # Increased from 10 to 15
-        batches = [words_to_process[i:i + batch_size] for i in range(0, len(words_to_process), batch_size)]
+            self.new_entries_count += 1
+        if text_prons:
+            safe_print(f"  {'Updated' if updated else 'Added new'} pronunciations for '{word}': {text_prons}")
+
+    def done(self, word: str, result: Optional[Dict], proxy_manager: ProxyManager):
+        """Record a finished word (None: its check failed), checkpointing every CHECKPOINT_WORDS"""
+        if result is not None:
+            self.record(word, result)
+        self.remaining -= 1
+        if self.remaining == 0:
+            self.finish()
+        elif self.store.changed >= CHECKPOINT_WORDS:
+            # Commits only the rows changed since the last checkpoint
+            self.store.checkpoint()
+            total_updated = self.updated_count + self.new_entries_count
+            progress_pct = (len(self.words) - self.remaining) / len(self.words) * 100
+            safe_print(f"Checkpoint saved for {self.file_path}. Updated {self.updated_count} entries, added {self.new_entries_count} new entries ({progress_pct:.1f}%), "
+                       f"{proxy_manager.concurrency()['limit']} checks in flight allowed.")
+
+    def finish(self):
+        # Save final results
+        self.store.export()
+        self.store.close()
+        total_updated = self.updated_count + self.new_entries_count
+        safe_print(f"Completed {self.file_path}: Updated {self.updated_count} entries, added {self.new_entries_count} new entries. Total {total_updated} out of {self.total_words} words.")
+
+def load_words(file_path: str) -> Optional[List[Dict]]:
+    """Entries of the *_words.json file next to a pronunciation file (None if it is missing)"""
+    # Change the file path from pronunciations to words
+    words_file_path = file_path.replace("_pronunciations.json", "_words.json")
+    if not os.path.exists(words_file_path):
+        safe_print(f"Words file not found: {words_file_path}")
+        return None
+    with open(words_file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def unchecked_words(words_data: List[Dict], store: PronunciationStore) -> List[str]:
+    """Words without text pronunciations on any of their entries (or without entries)"""
+    checked_words = store.checked_words()
+    return list(dict.fromkeys(
+        word_entry['word'] for word_entry in words_data if word_entry['word'] not in checked_words))
+
+def open_letter_writer(file_path: str) -> Optional[LetterWriter]:
+    """Writer for the words of a pronunciation file still lacking text pronunciations (None if there are none)"""
+    words_data = load_words(file_path)
+    if words_data is None:
+        return None
+    words_file_path = file_path.replace("_pronunciations.json", "_words.json")
+    safe_print(f"Processing {words_file_path} ({len(words_data)} words)...")
+    
+    # Pronunciation entries indexed by word, updated in place (see pronunciation_store)
+    store = PronunciationStore(file_path)
+    words = unchecked_words(words_data, store)
+    
+    if not words:
+        safe_print(f"No words need text pronunciations in {words_file_path}")
+        if store.unexported:
+            store.export()
+        store.close()
+        return None
+    safe_print(f"Found {len(words)} words needing text pronunciations out of {len(words_data)} total words")
+    return LetterWriter(file_path, store, words, len(words_data))
+
+def run_checks(writers: List[LetterWriter], proxy_manager: ProxyManager):
+    """
+    Check the words of every writer through one long-lived thread pool
+
+    Words are streamed into the pool, the files in order, so there is always
+    work queued; backoffs are requeued with a delay instead of sleeping in a
+    thread, and results are routed back to their file's writer.
+    """
+    # Enough threads for the largest limit; the limiter decides how many check at once
+    worker_count = proxy_manager.limiter.max_limit
+    total = sum(len(writer.words) for writer in writers)
+    safe_print(f"Checking {total} words of {len(writers)} files with up to {worker_count} workers...")
+    
+    pending = ((number, writer, word) for number, writer in enumerate(writers) for word in writer.words)
+    
+    with ThreadPoolExecutor(max_workers=worker_count) as executor:
+        queue = JobQueue({'checks': (executor, worker_count)})
         
-        # Use more workers for better parallelism
-        worker_count = 50  # Increased from 15 to 25
-        safe_print(f"Processing in {len(batches)} batches with {worker_count} workers...")
+        def push_next():
+            job = next(pending, None)
+            if job is not None:
+                push(*job, attempt=0)
         
-        # Track changes and new entries
-        updated_count = 0
-        new_entries_count = 0
+        def push(number, writer, word, attempt, delay=0):
+            # Earlier files first, so they are finished and written early
+            queue.push('checks', (number, attempt), check_pronunciation, (word, proxy_manager, attempt, True),
+                       partial(check_done, number, writer, word), delay)
         
-        # Process all batches with ThreadPoolExecutor
-        completed_batches = 0
-        for batch_num, batch in enumerate(batches, 1):
-            safe_print(f"Processing batch {batch_num}/{len(batches)}...")
-            
-            # Reduced delay between batches
-            if batch_num > 1:
-                time.sleep(random.uniform(2.0, 5.0))  # Reduced from 5.0-10.0s to 2.0-5.0s
-            
-            # Process batch with ThreadPoolExecutor
-            with ThreadPoolExecutor(max_workers=worker_count) as executor:
-                futures = {
-                    executor.submit(check_pronunciation, word, proxy_manager): word
-                    for word in batch
-                }
-                
-                for future in as_completed(futures):
-                    word = futures[future]
-                    try:
-                        result = future.result()
-                        if result and 'text_pronunciations' in result and result['text_pronunciations']:
-                            # Get the pronunciation data
-                            text_prons = result['text_pronunciations']
-                            
-                            # Update existing entries if any
-                            if word in word_to_pron_entries:
-                                for entry in word_to_pron_entries[word]:
-                                    entry['text_pronunciations'] = text_prons
-                                    updated_count += 1
-                                    
-                                with print_lock:
-                                    print(f"  Updated pronunciations for '{word}': {text_prons}")
-                            else:
-                                # Create a new pronunciation entry if none exists
-                                new_entry = {
-                                    "word": word,
-                                    "pronunciation_number": 1,
-                                    "pronunciation_text": None,  # We don't have this yet
-                                    "audio_dir": None,
-                                    "audio_file": None, 
-                                    "audio_url": None,
-                                    "text_pronunciations": text_prons,
-                                    "scraped_at": datetime.now().isoformat()
-                                }
-                                pronunciations.append(new_entry)
-                                
-                                # Update our tracking dict
-                                if word not in word_to_pron_entries:
-                                    word_to_pron_entries[word] = []
-                                word_to_pron_entries[word].append(new_entry)
-                                
-                                new_entries_count += 1
-                                with print_lock:
-                                    print(f"  Added new pronunciation for '{word}': {text_prons}")
-                        else:
-                            # For empty results, still create a record to avoid re-checking
-                            if word not in word_to_pron_entries:
-                                # Create a new entry with empty text pronunciations
-                                new_entry = {
-                                    "word": word,
-                                    "pronunciation_number": 1,
-                                    "pronunciation_text": None,
-                                    "audio_dir": None,
-                                    "audio_file": None,
-                                    "audio_url": None,
-                                    "text_pronunciations": [],
-                                    "scraped_at": datetime.now().isoformat()
-                                }
-                                pronunciations.append(new_entry)
-                                new_entries_count += 1
-                            else:
-                                # Add empty list to existing entries
-                                for entry in word_to_pron_entries[word]:
-                                    entry['text_pronunciations'] = []
-                                    updated_count += 1
-                    except Exception as e:
-                        safe_print(f"Error processing '{word}': {e}")
-                        # Continue with other words
-            
-            # Save checkpoint after every batch
-            completed_batches += 1
-            if completed_batches % 3 == 0 or batch_num == len(batches):  # Changed from 2 to 3 (less frequent saves)
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(pronunciations, f, indent=2, ensure_ascii=False)
-                
-                total_updated = updated_count + new_entries_count
-                progress_pct = (total_updated / len(words_to_process)) * 100 if words_to_process else 0
-                safe_print(f"Checkpoint saved after batch {batch_num}. Updated {updated_count} entries, added {new_entries_count} new entries ({progress_pct:.1f}%).")
+        def check_done(number, writer, word, future):
+            try:
+                result = future.result()
+            except RetryLater as retry:
+                push(number, writer, word, retry.attempt, retry.delay)
+                return
+            except Exception as e:
+                safe_print(f"Error processing '{word}': {e}")
+                result = None
+            writer.done(word, result, proxy_manager)
+            push_next()
         
-        # Save final results
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(pronunciations, f, indent=2, ensure_ascii=False)
-            
-        total_updated = updated_count + new_entries_count
-        safe_print(f"Completed {file_path}: Updated {updated_count} entries, added {new_entries_count} new entries. Total {total_updated} out of {total_words} words.")
-        return total_updated, total_words
-    
+        # Keep a few checks queued per slot, the rest are streamed in as checks finish
+        for _ in range(2 * worker_count):
+            push_next()
+        queue.run()
+    queue.print_summary()
+
+def backfill_file(file_path: str) -> Dict[str, int]:
+    """
+    Fill text pronunciations without requests: from the word's cached page
+    (the same extraction as a check), else from the pronunciation_text of its
+    stored entries (the play-pron-v2 text, normally the span.mw text too)
+    """
+    counts = {'pages': 0, 'fields': 0, 'left': 0}
+    words_data = load_words(file_path)
+    if words_data is None:
+        return counts
+    store = PronunciationStore(file_path)
+    # Words checked with an empty result (often a failed check) are filled too
+    unchecked = unchecked_words(words_data, store)
+    pending = set(unchecked)
+    for word in dict.fromkeys(unchecked + store.words_without_text()):
+        extractor = extract_cached(get_page_cache(), word_url(word), word, 'pronunciation')
+        prons = extractor.text_pronunciations()['text_pronunciations'] if extractor is not None else []
+        if prons:
+            store.set_text_pronunciations(word, prons)
+            counts['pages'] += 1
+            continue
+        for entry in store.word_entries(word):
+            if entry.get('pronunciation_text'):
+                add_unique(prons, entry['pronunciation_text'])
+        if prons:
+            store.set_text_pronunciations(word, prons)
+            counts['fields'] += 1
+        elif extractor is not None:
+            # The page itself has none: as good as a check
+            store.set_text_pronunciations(word, [])
+        elif word in pending:
+            counts['left'] += 1
+    if store.checkpoint() or store.unexported:
+        store.export()
+    store.close()
+    safe_print(f"Backfilled {file_path}: {counts['pages']} words from cached pages, {counts['fields']} from stored "
+               f"pronunciations, {counts['left']} left to check")
+    return counts
+
+def backfill_pronunciation_files(letters: str = 'abcdefghijklmnopqrstuvwxyz'):
+    """Backfill every pronunciation file offline (see backfill_file)"""
+    totals = {'pages': 0, 'fields': 0, 'left': 0}
+    for letter in letters:
+        pron_file = f"{letter}_dictionary_data.json_pronunciations.json"
+        if not os.path.exists(pron_file):
+            continue
+        for key, count in backfill_file(pron_file).items():
+            totals[key] += count
+    safe_print(f"\nBackfilled {totals['pages'] + totals['fields']} words without a request "
+               f"({totals['pages']} from cached pages, {totals['fields']} from stored pronunciations), "
+               f"{totals['left']} left for update_pronunciations.py")
+
+def process_single_file(file_path: str, proxy_manager: ProxyManager):
+    """Process a single pronunciation file"""
+    try:
+        writer = open_letter_writer(file_path)
+        if writer is None:
+            return 0, 0
+        run_checks([writer], proxy_manager)
+        return writer.updated_count + writer.new_entries_count, writer.total_words
     except Exception as e:
         safe_print(f"Error processing file {file_path}: {e}")
         return 0, 0
 
 def process_pronunciation_files():
-    """Process all pronunciation files from a to z and update them"""
+    """Process all pronunciation files from a to z and update them, checking the words of all of them together"""
     # Initialize proxy manager
-    proxy_manager = ProxyManager()
+    proxy_manager = create_proxy_manager()
     
     # Find all pronunciation files for each letter
     letters = 'abcdefghijklmnopqrstuvwxyz'
-    total_updated = 0
-    total_processed = 0
-    
+    writers = []
     for letter in letters:
         # Define the pronunciation file path (create if doesn't exist)
         pron_file = f"{letter}_dictionary_data.json_pronunciations.json"
-        
-        updated, processed = process_single_file(pron_file, proxy_manager)
-        total_updated += updated
-        total_processed += processed
+        try:
+            writer = open_letter_writer(pron_file)
+        except Exception as e:
+            safe_print(f"Error processing file {pron_file}: {e}")
+            continue
+        if writer is not None:
+            writers.append(writer)
+    
+    if writers:
+        run_checks(writers, proxy_manager)
+    total_updated = sum(writer.updated_count + writer.new_entries_count for writer in writers)
+    total_processed = sum(writer.total_words for writer in writers)
     
     safe_print(f"\nAll files processed. Updated/added {total_updated} of {total_processed} entries.")
+    proxy_manager.print_summary()
+    if transfer_stats.summary():
+        safe_print(transfer_stats.summary())
+    if get_negative_cache().summary():
+        safe_print(get_negative_cache().summary())
+    if format_singleflight(get_in_flight().stats()):
+        safe_print(format_singleflight(get_in_flight().stats()))
 
 def test_single_word(word: str):
     """Test the pronunciation checker on a single word and print results"""
     # Initialize proxy manager
-    proxy_manager = ProxyManager()
+    proxy_manager = create_proxy_manager()
     
     # Check pronunciation
     result = check_pronunciation(word, proxy_manager)
     
     # Display results
     display_pronunciation_result(result)
+    if transfer_stats.summary():
+        print(transfer_stats.summary())
     return result
 
 def main():
@@ -475,11 +447,15 @@ def main():
             # Run in test mode for a single word
             word = sys.argv[2].strip().lower()
             test_single_word(word)
+        elif sys.argv[1] == "--backfill":
+            # Fill text pronunciations from cached pages and stored fields, offline
+            backfill_pronunciation_files(sys.argv[2].lower() if len(sys.argv) > 2 else 'abcdefghijklmnopqrstuvwxyz')
         else:
             # Unknown argument
             print("Usage:")
             print("  To process all files: python update_pronunciations.py")
             print("  To test a single word: python update_pronunciations.py --test <word>")
+            print("  To fill them offline from cached pages and stored fields: python update_pronunciations.py --backfill [letters]")
     else:
         # Run the full processing
         process_pronunciation_files()
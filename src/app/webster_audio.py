@@ -1,176 +1,371 @@
-import requests
+import argparse
+import glob
+import json
 import os
-import random
 import time
-from typing import List, Optional, Dict
-from requests.exceptions import RequestException
-
-class ProxyManager:
-    def __init__(self, proxy_file: str = "proxies_list.txt"):
-        self.proxies = self._load_proxies(proxy_file)
-        self.current_index = 0
-        self.working_proxies = set()
-        self.failed_proxies = set()
-        print("Loaded {} proxies from {}".format(len(self.proxies), proxy_file))
-    
-    def _load_proxies(self, proxy_file: str) -> List[str]:
-        try:
-            with open(proxy_file, 'r') as f:
-                return [line.strip() for line in f if line.strip()]
-        except Exception as e:
-            print("Error loading proxies from file: {}".format(e))
-            return []
-    
-    def get_next_proxy(self) -> dict:
-        if not self.proxies:
-            return {}
-        
-        # Try to use a working proxy first
-        if self.working_proxies:
-            proxy = random.choice(list(self.working_proxies))
-        else:
-            # Skip failed proxies
-            while self.proxies:
-                proxy = self.proxies[self.current_index]
-                self.current_index = (self.current_index + 1) % len(self.proxies)
-                if proxy not in self.failed_proxies:
-                    break
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+from typing import Dict, Iterator, Optional, Tuple
+
+from audio_store import AUDIO_DIR, AudioStore, clip_key
+from job_queue import JobQueue
+from negative_cache import NegativeCache
+from proxy_pool import NOT_FOUND, AdaptiveLimiter, ProxyManager, RetryBudget, RetryLater, RetryPolicy
+
+PROXY_SOURCE = "proxies_list.txt"
+
+# Base URL for audio files
+BASE_URL = "https://media.merriam-webster.com/audio/prons/en/us/mp3"
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Referer': 'https://www.merriam-webster.com/',
+    # Stored byte for byte, so the size on disk matches Content-Length
+    'Accept-Encoding': 'identity'
+}
+
+CHUNK_SIZE = 65536
+
+# Downloads in flight in bulk mode start here and adapt up to --workers
+INITIAL_IN_FLIGHT = 8
+
+_proxy_manager = None
+_audio_store = None
+
+# Audio clips that answered 404 are not requested again (see negative_cache)
+_negative_cache = None
+print_lock = Lock()
+
+def safe_print(*args, **kwargs):
+    with print_lock:
+        print(*args, **kwargs)
+
+def create_proxy_manager(limiter: Optional[AdaptiveLimiter] = None, max_attempts: int = 5,
+                         retry_delay: float = 2, pool_size: int = 10) -> ProxyManager:
+    """Proxy manager for audio downloads (raw ip:port list, proxies used for https too)"""
+    return ProxyManager(
+        PROXY_SOURCE,
+        limiter=limiter,
+        retry=RetryPolicy(max_attempts=max_attempts, base_delay=retry_delay, budget=RetryBudget()),
+        cooldown=0,
+        pool_size=pool_size,
+        proxy_https=True,
+        allow_direct=True,
+        probe_url='https://www.merriam-webster.com',
+        probe_timeout=10
+    )
+
+def get_proxy_manager() -> ProxyManager:
+    """This process's proxy manager for single downloads, created on first use"""
+    global _proxy_manager
+    if _proxy_manager is None:
+        _proxy_manager = create_proxy_manager()
+    return _proxy_manager
+
+def get_negative_cache() -> NegativeCache:
+    """Get or create this process's negative cache"""
+    global _negative_cache
+    if _negative_cache is None:
+        _negative_cache = NegativeCache()
+    return _negative_cache
+
+def get_audio_store() -> AudioStore:
+    """This process's audio store (see audio_store)"""
+    global _audio_store
+    if _audio_store is None:
+        _audio_store = AudioStore()
+    return _audio_store
+
+def audio_url(clip: str) -> str:
+    """URL of a clip ("{audio_dir}/{audio_file}")"""
+    return "{}/{}.mp3".format(BASE_URL, clip)
+
+def legacy_audio_path(word: str) -> str:
+    """Where older versions saved a word's audio (audio/{word}_pronunciation.mp3, one file per word)"""
+    return os.path.join(AUDIO_DIR, "{}_pronunciation.mp3".format(word.replace(os.sep, '_')))
+
+class DownloadStats:
+    """Thread-safe totals of a bulk download"""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.started = time.monotonic()
+        self.files = 0
+        self.bytes = 0
+        self.words = 0
+        self.present = 0
+        self.missing = 0
+        self.failed = 0
+
+    def add(self, size: Optional[int]):
+        with self.lock:
+            if size is None:
+                self.failed += 1
             else:
-                return {}
-        
-        return {
-            'http': 'http://{}'.format(proxy),
-            'https': 'http://{}'.format(proxy)
-        }
-    
-    def mark_proxy_status(self, proxy: dict, success: bool):
-        """Mark proxy as working or failed"""
-        if not proxy:
-            return
-            
-        proxy_str = proxy['http'].replace('http://', '')
-        if success:
-            self.working_proxies.add(proxy_str)
-            self.failed_proxies.discard(proxy_str)
-        else:
-            self.failed_proxies.add(proxy_str)
-            self.working_proxies.discard(proxy_str)
-    
-    def validate_proxy(self, proxy: dict) -> bool:
-        if not proxy:
-            return True
-            
+                self.files += 1
+                self.bytes += size
+
+    def rates(self) -> Tuple[float, float]:
+        """Files/s and MB/s downloaded so far"""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        with self.lock:
+            return self.files / elapsed, self.bytes / 1048576 / elapsed
+
+    def summary(self) -> str:
+        files_per_s, mb_per_s = self.rates()
+        with self.lock:
+            return ("Audio: {} files ({:.1f} MB) downloaded in {:.0f}s, {:.1f} files/s, {:.2f} MB/s; "
+                    "{} words indexed, {} clips already present, {} known missing, {} failed").format(
+                self.files, self.bytes / 1048576, time.monotonic() - self.started, files_per_s, mb_per_s,
+                self.words, self.present, self.missing, self.failed)
+
+def fetch_audio(
+    proxy_manager: ProxyManager,
+    store: AudioStore,
+    clip: str,
+    attempt: int = 0,
+    defer: bool = False,
+    retry: Optional[RetryPolicy] = None
+) -> Optional[int]:
+    """
+    Stream a clip into the store through a .part file and an atomic rename
+
+    Returns the bytes downloaded (0 if the file on disk already had the
+    served size), None if it does not exist or every attempt failed. A 404 is
+    recorded in the negative cache under the clip. Failed attempts are
+    retried as `retry` (default: proxy_manager.retry) decides; with `defer`, a
+    retry that has to back off raises RetryLater instead of sleeping.
+    """
+    url = audio_url(clip)
+    path = store.path(clip)
+    current_proxy = None
+    while True:
         try:
-            test_url = 'https://www.merriam-webster.com'
-            response = requests.get(
-                test_url,
-                proxies=proxy,
-                timeout=10,
-                headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            )
-            success = response.status_code == 200
-            self.mark_proxy_status(proxy, success)
-            return success
-        except:
-            self.mark_proxy_status(proxy, False)
-            return False
+            current_proxy = proxy_manager.get_next_proxy(avoid=current_proxy)
+            started = time.monotonic()
+            response = proxy_manager.session.get(url, headers=HEADERS, proxies=current_proxy, timeout=30, stream=True)
+            try:
+                response.raise_for_status()
+                length = response.headers.get('Content-Length')
+                expected = int(length) if length and length.isdigit() else None
+                if expected is not None and os.path.exists(path) and os.path.getsize(path) == expected:
+                    # Downloaded before the manifest knew about it
+                    size, downloaded = expected, 0
+                else:
+                    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                    part_path = path + '.part'
+                    size = 0
+                    with open(part_path, 'wb') as f:
+                        for chunk in response.iter_content(CHUNK_SIZE):
+                            f.write(chunk)
+                            size += len(chunk)
+                    if expected is not None and size != expected:
+                        os.remove(part_path)
+                        raise IOError("Truncated download: {} of {} bytes".format(size, expected))
+                    os.replace(part_path, path)
+                    downloaded = size
+            finally:
+                response.close()
+            proxy_manager.mark_proxy_status(current_proxy, True, time.monotonic() - started)
+            store.record(clip, size)
+            return downloaded
+
+        except Exception as e:
+            failure, delay = proxy_manager.record_failure(current_proxy, e, attempt, retry)
+            if failure == NOT_FOUND:
+                # The file does not exist, another proxy won't change that
+                get_negative_cache().record(clip, NOT_FOUND, 'audio', source=url)
+                return None
+            safe_print("Attempt {} for {} failed ({}): {}".format(attempt + 1, url, failure, str(e)))
+            if delay is None:
+                return None
+            if defer and delay > 0:
+                raise RetryLater(delay, attempt + 1, failure)
+            time.sleep(delay)
+            attempt += 1
 
 def download_pronunciation(
     word: str,
     audio_params: Dict[str, str],
     max_retries: int = 5,
-    retry_delay: int = 2
+    retry_delay: int = 2,
+    pronunciation_number: int = 1
 ) -> bool:
     """
     Download pronunciation audio file for a word using proxies from proxies_list.txt
-    
+
     Args:
         word: The word to download pronunciation for
         audio_params: Dictionary containing 'dir' and 'file' parameters
-        max_retries: Maximum number of retry attempts
-        retry_delay: Delay between retries in seconds
-    
+        max_retries: Maximum number of attempts
+        retry_delay: First backoff in seconds after a blocked attempt
+        pronunciation_number: Which of the word's pronunciations this is
+
     Returns:
-        bool: True if download was successful, False otherwise
+        bool: True if the word's audio is in the store, False otherwise
     """
-    
-    # Base URL for audio files
-    base_url = "https://media.merriam-webster.com/audio/prons/en/us/mp3"
-    
-    # Extract parameters from the URL
-    dir_param = audio_params.get('dir', '')
-    file_param = audio_params.get('file', '')
-    
-    # Construct the audio file URL
-    audio_url = "{}/{}/{}.mp3".format(base_url, dir_param, file_param)
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Referer': 'https://www.merriam-webster.com/'
-    }
-    
-    # Initialize proxy manager
-    proxy_manager = ProxyManager()
-    
-    for attempt in range(max_retries):
-        try:
-            # Get next proxy
-            current_proxy = proxy_manager.get_next_proxy()
-            
-            # Validate proxy before using
-            if not proxy_manager.validate_proxy(current_proxy):
-                print("Proxy validation failed, trying next proxy...")
+    try:
+        clip = clip_key(audio_params.get('dir', ''), audio_params.get('file', ''))
+    except ValueError as e:
+        print("Skipping '{}': {}".format(word, e))
+        return False
+    store = get_audio_store()
+    store.index([(word, pronunciation_number, clip)])
+    if store.is_complete(clip):
+        print("Pronunciation for '{}' already stored at {}".format(word, store.path(clip)))
+        return True
+
+    miss = get_negative_cache().lookup(clip, 'audio')
+    if miss is not None:
+        print("Skipping '{}': no audio at {} ({})".format(word, audio_url(clip), miss['failure']))
+        return False
+
+    # One proxy manager per process, so the proxy list is read once; the
+    # attempt limits are this call's, the retry budget is shared
+    proxy_manager = get_proxy_manager()
+    retry = RetryPolicy(max_attempts=max_retries, base_delay=retry_delay, budget=proxy_manager.retry.budget)
+    if fetch_audio(proxy_manager, store, clip, retry=retry) is None:
+        print("Failed to download pronunciation for '{}'".format(word))
+        return False
+    print("Successfully downloaded pronunciation for '{}' to {}".format(word, store.path(clip)))
+    return True
+
+def audio_entries(pattern: str = '*_pronunciations.json') -> Iterator[Tuple[str, int, str]]:
+    """(word, pronunciation number, clip) of every pronunciation with audio in the matching files"""
+    for file_path in sorted(glob.glob(pattern)):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        for entry in entries:
+            if not entry.get('audio_dir') or not entry.get('audio_file'):
                 continue
-            
-            # Create audio directory if it doesn't exist
-            if not os.path.exists('audio'):
-                os.makedirs('audio')
-            
-            # Download the audio file
-            response = requests.get(
-                audio_url,
-                headers=headers,
-                proxies=current_proxy,
-                timeout=30
-            )
-            response.raise_for_status()
-            
-            # Save the file
-            output_file = "audio/{}_pronunciation.mp3".format(word)
-            with open(output_file, 'wb') as f:
-                f.write(response.content)
-            
-            print("Successfully downloaded pronunciation for '{}' to {}".format(word, output_file))
-            if current_proxy:
-                print("Using working proxy: {}".format(current_proxy['http']))
-            return True
-            
-        except RequestException as e:
-            print("Attempt {}/{} failed: {}".format(attempt + 1, max_retries, str(e)))
-            if current_proxy:
-                proxy_manager.mark_proxy_status(current_proxy, False)
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay)
+            try:
+                clip = clip_key(entry['audio_dir'], entry['audio_file'])
+            except ValueError as e:
+                safe_print("Skipping '{}': {}".format(entry['word'], e))
+                continue
+            yield entry['word'], entry.get('pronunciation_number') or 1, clip
+
+def download_all(pattern: str = '*_pronunciations.json', workers: int = 32, progress_every: int = 500) -> DownloadStats:
+    """
+    Index the audio of every pronunciation in the matching files and download
+    each clip once, through one shared proxy manager and thread pool
+
+    At most `workers` downloads are in flight (fewer while the adaptive
+    limiter backs off); clips already stored with their size, and known
+    misses, cost no request.
+    """
+    limiter = AdaptiveLimiter(initial=min(INITIAL_IN_FLIGHT, workers), max_limit=workers)
+    proxy_manager = create_proxy_manager(limiter=limiter, pool_size=workers)
+    store = get_audio_store()
+    stats = DownloadStats()
+
+    stats.words = store.index(audio_entries(pattern))
+    jobs = []
+    for clip in store.clips():
+        if store.is_complete(clip):
+            stats.present += 1
+        elif get_negative_cache().lookup(clip, 'audio') is not None:
+            stats.missing += 1
+        else:
+            jobs.append(clip)
+    safe_print("{} pronunciations share {} clips: {} to download ({} already present, {} known missing), up to {} at once".format(
+        stats.words, len(jobs) + stats.present + stats.missing, len(jobs), stats.present, stats.missing, workers))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        queue = JobQueue({'audio': (executor, workers)})
+
+        def push(clip, attempt, delay=0):
+            queue.push('audio', (attempt,), fetch_audio, (proxy_manager, store, clip, attempt, True),
+                       partial(done, clip), delay)
+
+        def done(clip, future):
+            try:
+                size = future.result()
+            except RetryLater as retry:
+                push(clip, retry.attempt, retry.delay)
+                return
+            except Exception as e:
+                safe_print("Error downloading {}: {}".format(audio_url(clip), e))
+                size = None
+            stats.add(size)
+            finished = stats.files + stats.failed
+            if finished % progress_every == 0:
+                files_per_s, mb_per_s = stats.rates()
+                safe_print("{}/{} audio files, {:.1f} files/s, {:.2f} MB/s, {} downloads in flight allowed".format(
+                    finished, len(jobs), files_per_s, mb_per_s, proxy_manager.concurrency()['limit']))
+
+        for clip in jobs:
+            push(clip, 0)
+        queue.run()
+
+    safe_print(stats.summary())
+    proxy_manager.print_summary()
+    if get_negative_cache().summary():
+        safe_print(get_negative_cache().summary())
+    return stats
+
+def migrate_legacy_files(pattern: str = '*_pronunciations.json'):
+    """
+    Move audio/{word}_pronunciation.mp3 files into the store, dropping copies of a clip already there
+
+    Older versions wrote every clip of a word to that one file in
+    pronunciation order, so it holds the word's last clip.
+    """
+    store = get_audio_store()
+    entries = list(audio_entries(pattern))
+    store.index(entries)
+    last_clips = {}
+    for word, number, clip in entries:
+        if word not in last_clips or number > last_clips[word][0]:
+            last_clips[word] = (number, clip)
+    moved = duplicates = 0
+    for word, (_, clip) in last_clips.items():
+        legacy_path = legacy_audio_path(word)
+        if not os.path.exists(legacy_path):
             continue
-            
-        except Exception as e:
-            print("Unexpected error: {}".format(str(e)))
-            return False
-    
-    print("Failed to download pronunciation for '{}' after {} attempts".format(word, max_retries))
-    return False
+        if store.is_complete(clip):
+            os.remove(legacy_path)
+            duplicates += 1
+            continue
+        path = store.path(clip)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(legacy_path, path)
+        store.record(clip, os.path.getsize(path))
+        moved += 1
+    safe_print("Moved {} audio files into {}/<dir>/<file>.mp3, removed {} duplicates".format(moved, AUDIO_DIR, duplicates))
+
+def main():
+    parser = argparse.ArgumentParser(description="Download Merriam-Webster pronunciation audio")
+    parser.add_argument('command', nargs='?', choices=['word', 'bulk', 'lookup', 'migrate'], default='word',
+                        help="word: one word's audio (default); "
+                             "bulk: the audio of every pronunciation in the *_pronunciations.json files; "
+                             "lookup: print where a word's audio is stored; "
+                             "migrate: move audio/{word}_pronunciation.mp3 files into the clip store")
+    parser.add_argument('--word', default='splanchnicectomy')
+    parser.add_argument('--dir', default='s', help="data-dir of the word's audio")
+    parser.add_argument('--file', default='splan01m', help="data-file of the word's audio")
+    parser.add_argument('--number', type=int, default=1, help="Which of the word's pronunciations it is")
+    parser.add_argument('--pattern', default='*_pronunciations.json', help="Pronunciation files read by bulk and migrate")
+    parser.add_argument('--workers', type=int, default=32, help="Most downloads in flight in bulk mode")
+    args = parser.parse_args()
+
+    if args.command == 'bulk':
+        download_all(args.pattern, args.workers)
+        return
+    if args.command == 'migrate':
+        migrate_legacy_files(args.pattern)
+        return
+    if args.command == 'lookup':
+        store = get_audio_store()
+        for number, clip in sorted(store.word_clips(args.word).items()):
+            status = "" if store.is_complete(clip) else " (not downloaded)"
+            print("{} #{}: {}{}".format(args.word, number, store.path(clip), status))
+        return
 
-if __name__ == "__main__":
-    # Audio parameters from the example URL
-    audio_params = {
-        'dir': 's',
-        'file': 'splan01m'
-    }
-    
     # Try downloading with proxy support
-    success = download_pronunciation(
-        'splanchnicectomy',
-        audio_params,
-        max_retries=5,
-        retry_delay=2
-    ) 
\ No newline at end of file
+    download_pronunciation(args.word, {'dir': args.dir, 'file': args.file}, max_retries=5, retry_delay=2,
+                           pronunciation_number=args.number)
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,27 @@
-import requests
-from bs4 import BeautifulSoup
+import argparse
+from functools import partial
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from threading import Lock
 import multiprocessing
 from tqdm import tqdm
-import random
 import os
 import json
 from typing import Dict, List, Optional, Set
 from datetime import datetime
 import urllib3
-from urllib3.util.retry import Retry
-from requests.adapters import HTTPAdapter
+
+from page_cache import PageCache, covers, read_blob
+from page_fetch import extract_cached, fetch_word_page, format_transfer
+from page_parsers import DEFAULT_PARSER, PARSERS, get_parser, is_empty_entry
+from proxy_pool import (PARSE_FAILED, AdaptiveLimiter, ParseError, ProxyManager, ProxyPoolService, RetryBudget, RetryLater,
+                        RetryPolicy, SingleFlight, connect_limiter, connect_retry_budget, connect_scheduler,
+                        connect_singleflight, format_singleflight, latest_working_proxies)
+from job_queue import JobQueue
+from negative_cache import NegativeCache
+from result_store import ResultStore
+from word_urls import canonical_url, url_word, word_url
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -24,146 +32,48 @@ print_lock = Lock()
 # Global proxy manager
 _proxy_manager = None
 
-LETTER_PAGES = {
-    'b': 72,
-    'c': 109,
-    'e': 38,
-    'f': 47,
-    'g': 41,
-    'h': 45,
-    'i': 38,
-    'j': 11,
-    'k': 15,
-    'l': 38,
-    'm': 62,
-    'n': 28,
-    'o': 32,
-    'p': 101,
-    'q': 6,
-    'r': 55,
-    's': 134,
-    't': 65,
-    'u': 28,
-    'v': 16,
-    'w': 32,
-    'x': 2,
-    'y': 5,
-    'z': 4
-}
+# HTML parser backend (see page_parsers)
+_parser_name = DEFAULT_PARSER
 
-class ProxyManager:
-    def __init__(self):
-        """Initialize with verified working proxies from JSON file"""
-        with open('working_proxies_20250403_201006.json', 'r') as f:
-            proxy_data = json.load(f)
-            proxy_urls = proxy_data['proxies']
-            
-        self.proxies = [{"http": url, "https": None} for url in proxy_urls]
-        random.shuffle(self.proxies)  # Randomize initial order
-        
-        # Track proxy status
-        self.proxy_status = {str(p): True for p in self.proxies}
-        self.proxy_last_used = {str(p): 0 for p in self.proxies}
-        self.proxy_index = 0
-        self.proxy_lock = Lock()  # Add lock for thread safety
-        
-        # Create a session with optimized settings
-        self.session = requests.Session()
-        self.session.verify = False
-        self.session.trust_env = False
-        
-        # Optimize retry settings
-        retries = Retry(
-            total=3,  # Reduced from 5
-            backoff_factor=0.1,
-            status_forcelist=[500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS", "POST"]
-        )
-        
-        # Increase connection pooling
-        adapter = HTTPAdapter(
-            max_retries=retries,
-            pool_connections=50,  # Increased from 20
-            pool_maxsize=50,     # Increased from 20
-            pool_block=False     # Don't block when pool is full
-        )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
-        
-        # Add default headers
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Cache-Control': 'no-cache',
-            'Pragma': 'no-cache'
-        })
-        
-        print(f"Loaded {len(self.proxies)} verified proxies")
-
-    def get_next_proxy(self) -> Dict[str, str]:
-        """Get next working proxy with minimum pause between uses"""
-        with self.proxy_lock:
-            for _ in range(len(self.proxies)):
-                proxy = self.proxies[self.proxy_index]
-                self.proxy_index = (self.proxy_index + 1) % len(self.proxies)
-                
-                # Check if proxy is marked as working
-                if not self.proxy_status[str(proxy)]:
-                    continue
-                    
-                # Ensure minimum pause between uses of same proxy
-                last_used = self.proxy_last_used[str(proxy)]
-                if last_used > 0:
-                    elapsed = time.time() - last_used
-                    if elapsed < 0.2:  # Reduced from 0.5s to 0.2s
-                        continue  # Skip instead of sleeping
-                
-                self.proxy_last_used[str(proxy)] = time.time()
-                return proxy
-            
-            # If we get here, reset all proxies and try again
-            for p in self.proxy_status:
-                self.proxy_status[p] = True
-            return self.get_next_proxy()
-
-    def mark_proxy_status(self, proxy: Dict[str, str], success: bool):
-        """Mark proxy as working or failed"""
-        with self.proxy_lock:
-            if success:
-                self.proxy_status[str(proxy)] = True
-            else:
-                self.proxy_status[str(proxy)] = False
-                
-                # Check if we have any working proxies left
-                if not any(self.proxy_status.values()):
-                    for p in self.proxy_status:
-                        self.proxy_status[p] = True
+# 'stream': read word pages only up to the end of the entries (see page_fetch),
+# 'full': download the whole page and parse it with _parser_name
+_fetch_mode = 'stream'
 
-    def validate_proxy(self, proxy: Dict[str, str]) -> bool:
-        """Quick check if proxy is responsive"""
-        try:
-            response = self.session.get(
-                'http://www.merriam-webster.com',
-                proxies=proxy,
-                timeout=5,  # Reduced from 10s
-                verify=False,
-                allow_redirects=True
-            )
-            return response.status_code == 200
-        except:
-            return False
+# On-disk cache of fetched word pages (see page_cache), opened per process
+_page_cache = None
+
+# Words known to have no page (see negative_cache), opened per process
+_negative_cache = None
+
+# Word pages being fetched right now, and the parse results of recent ones by
+# final URL (so the inflected forms redirecting to a lemma reuse its result
+# instead of parsing it again), shared by every worker (see proxy_pool.singleflight)
+_singleflight = None
+PAGE_RESULTS_SIZE = 10000
+
+# Validated proxies (cooldown, pool size and retries use the ProxyManager defaults)
+PROXY_SOURCE = latest_working_proxies('working_proxies_20250403_201006.json')
+
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+# Requests in flight start here and follow the adaptive limiter (see
+# proxy_pool.concurrency) up to _max_in_flight, which also sizes the browse
+# thread pools
+INITIAL_IN_FLIGHT = 8
+_max_in_flight = 50
+
+# Browse page count per letter, discovered from each letter's first browse page
+LETTER_PAGES_FILE = 'letter_pages.json'
+LETTER_PAGES_TTL = 24 * 3600  # Seconds before counts are discovered again
 
 def safe_print(*args, **kwargs):
     """Thread-safe printing function"""
     with print_lock:
         print(*args, **kwargs)
 
-def get_total_pages(proxy_manager: ProxyManager) -> int:
-    """Get the total number of pages available"""
-    url = "https://www.merriam-webster.com/browse/dictionary/d/1"
+def get_total_pages(proxy_manager: ProxyManager, letter: str) -> Optional[int]:
+    """Number of browse pages of a letter, from the "page 1 of X" counter (None if it can't be read)"""
+    url = f"https://www.merriam-webster.com/browse/dictionary/{letter}/1"
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -171,11 +81,12 @@ def get_total_pages(proxy_manager: ProxyManager) -> int:
         'Connection': 'keep-alive',
     }
     
-    max_retries = 5
-    for attempt in range(max_retries):
+    proxy = None
+    attempt = 0
+    while True:
         try:
-            proxy = proxy_manager.get_next_proxy()
-            print(f"\nGetting total pages using proxy {proxy['http']}...")
+            proxy = proxy_manager.get_next_proxy(avoid=proxy)
+            print(f"\nGetting total pages of '{letter}' using proxy {proxy['http']}...")
             
             response = proxy_manager.session.get(
                 url, 
@@ -185,29 +96,73 @@ def get_total_pages(proxy_manager: ProxyManager) -> int:
             )
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
             # Find pagination text that shows "page 1 of X"
-            pagination = soup.find('span', class_='counters')
-            if pagination:
-                text = pagination.text.strip()
-                total_pages = int(text.split('of')[-1].strip())
+            total_pages = get_parser(_parser_name).total_pages(response.text)
+            if total_pages:
                 proxy_manager.mark_proxy_status(proxy, True)
                 return total_pages
             else:
-                raise Exception("Could not find pagination info")
+                raise ParseError("Could not find pagination info")
                 
         except Exception as e:
-            print(f"Error getting total pages (attempt {attempt + 1}/{max_retries}): {str(e)}")
-            proxy_manager.mark_proxy_status(proxy, False)
-            if attempt < max_retries - 1:
-                time.sleep(2)
-            continue
+            failure, delay = proxy_manager.record_failure(proxy, e, attempt)
+            print(f"Error getting total pages of '{letter}' (attempt {attempt + 1}, {failure}): {str(e)}")
+            if delay is None:
+                return None
+            time.sleep(delay)
+            attempt += 1
+
+def discover_letter_pages(proxy_manager: ProxyManager, letters: str = LETTERS,
+                          ttl: float = LETTER_PAGES_TTL, refresh: bool = False) -> Dict[str, int]:
+    """
+    Browse page count of every letter, read concurrently and cached in LETTER_PAGES_FILE
+    
+    Counts younger than `ttl` are reused. A letter whose count can't be read
+    keeps its last known count, or is skipped if it never had one.
+    """
+    try:
+        with open(LETTER_PAGES_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = {}
+    
+    now = time.time()
+    letter_pages = {}
+    stale = []
+    for letter in letters:
+        entry = cached.get(letter)
+        if entry and not refresh and now - entry['checked_at'] < ttl:
+            letter_pages[letter] = entry['pages']
+        else:
+            stale.append(letter)
     
-    return 58  # Default to 58 pages as seen earlier
+    if stale:
+        print(f"\nDiscovering browse page counts for {len(stale)} letters...")
+        with ThreadPoolExecutor(max_workers=len(stale)) as executor:
+            counts = dict(zip(stale, executor.map(partial(get_total_pages, proxy_manager), stale)))
+        for letter in stale:
+            if counts[letter]:
+                letter_pages[letter] = counts[letter]
+                cached[letter] = {'pages': counts[letter], 'checked_at': now}
+            elif letter in cached:
+                print(f"Warning: using the last known page count ({cached[letter]['pages']}) for '{letter}'")
+                letter_pages[letter] = cached[letter]['pages']
+            else:
+                print(f"Warning: could not discover the page count of '{letter}', skipping it")
+        with open(LETTER_PAGES_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cached, f, indent=2, sort_keys=True)
+    
+    print("Browse pages: " + ", ".join(f"{letter}={letter_pages[letter]}" for letter in letters if letter in letter_pages))
+    return {letter: letter_pages[letter] for letter in letters if letter in letter_pages}
 
-def get_page_words(page: int, proxy_manager: ProxyManager, letter: str = 'a') -> List[str]:
-    """Get words from a specific page"""
+def get_page_words(page: int, proxy_manager: ProxyManager, letter: str = 'a',
+                   attempt: int = 0, defer: bool = False) -> List[str]:
+    """
+    Get words from a specific page
+    
+    With `defer`, a retry that has to back off raises RetryLater instead of
+    sleeping, so the caller can requeue the page and keep the thread busy.
+    """
     url = f"https://www.merriam-webster.com/browse/dictionary/{letter}/{page}"
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
@@ -220,10 +175,10 @@ def get_page_words(page: int, proxy_manager: ProxyManager, letter: str = 'a') ->
         'Referer': 'https://www.merriam-webster.com/browse/dictionary/d'
     }
     
-    max_retries = 3
-    for attempt in range(max_retries):
+    proxy = None
+    while True:
         try:
-            proxy = proxy_manager.get_next_proxy()
+            proxy = proxy_manager.get_next_proxy(avoid=proxy)
             print(f"\nFetching page {page} using proxy {proxy['http']}...")
             
             response = proxy_manager.session.get(
@@ -236,15 +191,8 @@ def get_page_words(page: int, proxy_manager: ProxyManager, letter: str = 'a') ->
             )
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            page_words = []
-            
             # Find all word links in the browse list
-            word_links = soup.select('div.mw-grid-table-list li')
-            for link in word_links:
-                word = link.text.strip()
-                if word:
-                    page_words.append(word)
+            page_words = get_parser(_parser_name).browse_page(response.text)
             
             if page_words:
                 print(f"Found {len(page_words)} words on page {page}")
@@ -253,156 +201,192 @@ def get_page_words(page: int, proxy_manager: ProxyManager, letter: str = 'a') ->
             else:
                 # Print the HTML for debugging
                 print("DEBUG: No words found. HTML structure:")
-                print(soup.prettify()[:2000])  # Print first 2000 chars
-                raise Exception("No words found on page")
+                print(response.text[:2000])  # Print first 2000 chars
+                raise ParseError("No words found on page")
                 
         except Exception as e:
-            print(f"Error on page {page} (attempt {attempt + 1}/{max_retries}): {str(e)}")
-            proxy_manager.mark_proxy_status(proxy, False)
-            if attempt < max_retries - 1:
-                time.sleep(2)
+            failure, delay = proxy_manager.record_failure(proxy, e, attempt)
+            print(f"Error on page {page} (attempt {attempt + 1}, {failure}): {str(e)}")
+            if delay is None:
+                return []
+            retry_after(delay, attempt, failure, defer)
+            attempt += 1
+
+WORD_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+}
+
+def parse_word_page(word: str, html: str, parser: Optional[str] = None) -> Dict:
+    """Extract part of speech, pronunciations, etymology and senses from a word page"""
+    return get_parser(parser or _parser_name).word_page(word, html)
+
+def set_parser(name: str):
+    """Select the HTML parser backend used by this process (see page_parsers)"""
+    global _parser_name
+    get_parser(name)  # Fail early on unknown/unavailable backends
+    _parser_name = name
+
+def set_fetch_mode(mode: str):
+    """Select how word pages are downloaded by this process ('stream' or 'full')"""
+    global _fetch_mode
+    _fetch_mode = mode
+
+def get_page_cache() -> PageCache:
+    """Get or create this process's page cache"""
+    global _page_cache
+    if _page_cache is None:
+        _page_cache = PageCache()
+    return _page_cache
+
+def get_negative_cache() -> NegativeCache:
+    """Get or create this process's negative cache"""
+    global _negative_cache
+    if _negative_cache is None:
+        _negative_cache = NegativeCache()
+    return _negative_cache
+
+def get_singleflight() -> SingleFlight:
+    """This process's SingleFlight (the parent's, served to worker processes)"""
+    global _singleflight
+    if _singleflight is None:
+        _singleflight = SingleFlight(memory=PAGE_RESULTS_SIZE)
+    return _singleflight
+
+def print_singleflight_summary():
+    summary = format_singleflight(get_singleflight().stats())
+    if summary:
+        print(summary)
+
+def remember_page_result(url: str, result: Dict):
+    get_singleflight().remember(url, result)
+
+def page_result(url: str, word: str) -> Optional[Dict]:
+    """Result parsed earlier (by any worker) from the page at `url`, as the result of `word`"""
+    result = get_singleflight().recall(url)
+    return dict(result, word=word) if result is not None else None
+
+def retry_after(delay: float, attempt: int, failure: str, defer: bool):
+    """Wait out a retry delay, or with `defer` hand a backoff to the caller as RetryLater"""
+    if defer and delay > 0:
+        raise RetryLater(delay, attempt + 1, failure)
+    time.sleep(delay)
+
+def scrape_word(word: str, proxy_manager: ProxyManager, attempt: int = 0, defer: bool = False) -> Optional[Dict]:
+    """
+    Scrape definition for a single word
+    
+    Failed attempts are retried as proxy_manager.retry decides; with `defer`,
+    a retry that has to back off raises RetryLater instead of sleeping.
+    Words that ended in a 404 or an empty page (negative_cache) are skipped
+    without a request, and words redirecting to a page parsed before (an
+    inflected form and its lemma) reuse that page's result. A page another
+    worker is fetching at the moment is waited for instead of fetched twice.
+    """
+    url = word_url(word)
+    final_url = get_page_cache().resolve(url)
     
-    return []
+    # A page parsed before or being fetched right now, by any worker, is not parsed again
+    flights = get_singleflight()
+    leader, shared = flights.join(final_url)
+    if not leader:
+        safe_print("Scraped: {} (same page as {})".format(word, url_word(final_url)) if final_url != url
+                   else "Scraped: {} (shared fetch)".format(word))
+        return dict(shared, word=word)
+    result = None
+    try:
+        result = fetch_word(word, url, final_url, proxy_manager, attempt, defer)
+        return result
+    finally:
+        flights.leave(final_url, result)
 
-def scrape_word(word: str, proxy_manager: ProxyManager) -> Optional[Dict]:
-    """Scrape definition for a single word"""
-    url = "https://www.merriam-webster.com/dictionary/{}".format(word)
+def fetch_word(word: str, url: str, final_url: str, proxy_manager: ProxyManager, attempt: int, defer: bool) -> Optional[Dict]:
+    """Result of a word page from the page cache, or fetched (scrape_word's leader path)"""
+    cache = get_page_cache()
+    negative_cache = get_negative_cache()
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Connection': 'keep-alive',
-    }
+    # Pages downloaded before are parsed from the cache without a request (a
+    # good cached page wins over a recorded miss)
+    if _fetch_mode == 'stream':
+        extractor = extract_cached(cache, url, word)
+        result = extractor.word_page() if extractor is not None else None
+    else:
+        html = cache.get(url)
+        result = parse_word_page(word, html) if html is not None else None
+    if result is not None and not is_empty_entry(result):
+        safe_print("Scraped: {} (cached)".format(word))
+        remember_page_result(final_url, result)
+        return result
     
-    max_retries = 5
-    for attempt in range(max_retries):
+    # Checked after joining, so a waiter taking over from a 404 doesn't repeat it
+    miss = negative_cache.lookup(word)
+    if miss is not None:
+        safe_print("Skipped: {} (known miss, {})".format(word, miss['failure']))
+        return None
+    
+    current_proxy = None
+    parse_failures = 0
+    while True:
         try:
-            current_proxy = proxy_manager.get_next_proxy()
-            if not proxy_manager.validate_proxy(current_proxy):
-                continue
-                
-            response = proxy_manager.session.get(
-                url, 
-                headers=headers, 
-                proxies=current_proxy, 
-                timeout=30,
-                verify=False,
-                allow_redirects=True
-            )
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Get word class (part of speech)
-            word_class = None
-            pos_spans = soup.select('span.fl')
-            if pos_spans:
-                word_class = pos_spans[0].text.strip()
-            
-            # Get syllables and pronunciations
-            syllables = None
-            pronunciations = []
-            
-            # Find the main pronunciation section
-            pron_section = soup.find('span', class_='prons-entries-list-inline')
-            if pron_section:
-                # Get all pronunciation links
-                pron_links = pron_section.find_all('a', class_='play-pron-v2')
-                
-                for pron_link in pron_links:
-                    # Get the pronunciation text (remove &nbsp; and other whitespace)
-                    pron_text = pron_link.get_text(strip=True).replace('\xa0', '')
-                    if not pron_text:
-                        continue
-                    
-                    # Get audio information
-                    audio_dir = pron_link.get('data-dir')
-                    audio_file = pron_link.get('data-file')
-                    
-                    if audio_dir and audio_file:
-                        audio_url = f"https://media.merriam-webster.com/audio/prons/en/us/mp3/{audio_dir}/{audio_file}.mp3"
-                    else:
-                        audio_url = None
-                        
-                    pronunciations.append({
-                        'text': pron_text,
-                        'audio_dir': audio_dir,
-                        'audio_file': audio_file,
-                        'audio_url': audio_url
-                    })
-                    
-                    # Use the first pronunciation as syllables if not set
-                    if syllables is None:
-                        syllables = pron_text
-            
-            # Get etymology if available
-            etymology = None
-            etym_element = soup.select_one('p.et')
-            if etym_element:
-                etymology = etym_element.text.strip()
-            
-            # Get definitions and examples
-            definitions = []
-            definition_groups = soup.select('div.sense')
-            
-            for group_num, group in enumerate(definition_groups, 1):
-                # Get the definition text
-                definition_element = group.select_one('span.dtText')
-                if not definition_element:
-                    continue
-                    
-                # Clean up definition text
-                definition_text = definition_element.get_text(separator=' ', strip=True)
-                if definition_text.startswith(': '):
-                    definition_text = definition_text[2:]
-                
-                # Get example sentences for this definition
-                examples = []
-                example_elements = group.select('span.ex-sent')
-                for example in example_elements:
-                    # Get the example text
-                    example_text = example.get_text(separator=' ', strip=True)
-                    
-                    # Get attribution if available
-                    attribution = None
-                    auth_element = example.select_one('span.auth')
-                    if auth_element:
-                        attribution = auth_element.get_text(strip=True)
-                    
-                    examples.append({
-                        'text': example_text,
-                        'attribution': attribution
-                    })
+            current_proxy = proxy_manager.get_next_proxy(avoid=current_proxy)
+            started = time.monotonic()
+            if _fetch_mode == 'stream':
+                # Stop downloading once the dictionary entries have been read
+                extractor, transfer = fetch_word_page(
+                    proxy_manager.session,
+                    url,
+                    word,
+                    'entry',
+                    cache=cache,
+                    reuse=partial(page_result, word=word),
+                    headers=WORD_HEADERS,
+                    proxies=current_proxy,
+                    timeout=30,
+                    verify=False
+                )
+                latency = time.monotonic() - started
+                final_url = transfer['url']
+                # Redirected to a page some worker has parsed already
+                result = transfer['reused'] if extractor is None else extractor.word_page()
+                fetched = format_transfer(transfer)
+            else:
+                response = proxy_manager.session.get(
+                    url, 
+                    headers=WORD_HEADERS, 
+                    proxies=current_proxy, 
+                    timeout=30,
+                    verify=False,
+                    allow_redirects=True
+                )
+                response.raise_for_status()
+                latency = time.monotonic() - started
+                final_url = canonical_url(response.url)
+                cache.add_redirect(url, final_url)
+                cache.put(final_url, response.text, etag=response.headers.get('ETag'),
+                          last_modified=response.headers.get('Last-Modified'))
                 
-                definitions.append({
-                    'definition_number': group_num,
-                    'definition_text': definition_text,
-                    'examples': examples
-                })
-            
-            result = {
-                'word': word,
-                'part_of_speech': word_class,
-                'syllables': syllables,
-                'pronunciations': pronunciations,
-                'etymology': etymology,
-                'definitions': definitions,
-                'scraped_at': datetime.utcnow().isoformat()
-            }
-            
-            safe_print("Scraped: {}".format(word))
-            proxy_manager.mark_proxy_status(current_proxy, True)
+                result = parse_word_page(word, response.text)
+                fetched = None
+            if is_empty_entry(result):
+                raise ParseError("No dictionary entry found on the page")
+            remember_page_result(final_url, result)
+            safe_print("Scraped: {} ({})".format(word, fetched) if fetched else "Scraped: {}".format(word))
+            proxy_manager.mark_proxy_status(current_proxy, True, latency)
             return result
                 
         except Exception as e:
-            safe_print("Error scraping '{}' (attempt {}/{}): {}".format(word, attempt + 1, max_retries, str(e)))
-            proxy_manager.mark_proxy_status(current_proxy, False)
-            if attempt < max_retries - 1:
-                time.sleep(2)
-            continue
-    
-    return None
+            failure, delay = proxy_manager.record_failure(current_proxy, e, attempt)
+            parse_failures += failure == PARSE_FAILED
+            safe_print("Error scraping '{}' (attempt {}, {}): {}".format(word, attempt + 1, failure, str(e)))
+            if delay is None:
+                # Not when retries or the retry budget ran out on bad proxies
+                if proxy_manager.retry.is_terminal(failure, parse_failures):
+                    negative_cache.record(word, failure)
+                return None
+            retry_after(delay, attempt, failure, defer)
+            attempt += 1
 
 def save_results_to_json(results: List[Dict], base_filename: str = "dictionary_data"):
     """
@@ -462,7 +446,22 @@ def save_results_to_json(results: List[Dict], base_filename: str = "dictionary_d
                 'audio_url': pron['audio_url'],
                 'scraped_at': result['scraped_at']
             }
+            if 'text_pronunciations' in result:
+                pron_entry['text_pronunciations'] = result['text_pronunciations']
             pronunciations_data.append(pron_entry)
+        
+        # Words with text pronunciations but no audio get an entry like update_pronunciations adds
+        if result.get('text_pronunciations') and not result['pronunciations']:
+            pronunciations_data.append({
+                'word': result['word'],
+                'pronunciation_number': 1,
+                'pronunciation_text': None,
+                'audio_dir': None,
+                'audio_file': None,
+                'audio_url': None,
+                'text_pronunciations': result['text_pronunciations'],
+                'scraped_at': result['scraped_at']
+            })
     
     # Save words
     words_file = "{}_words.json".format(base_filename)
@@ -505,119 +504,648 @@ def save_results_to_json(results: List[Dict], base_filename: str = "dictionary_d
         json.dump(metadata, f, indent=2)
     print("Saved metadata to {}".format(metadata_file))
 
-def get_words_for_letter(proxy_manager: ProxyManager, letter: str) -> List[str]:
-    """Get words from all pages for a specific letter"""
-    all_words = []
-    retry_pages = []
-    total_pages = LETTER_PAGES[letter]
-    print(f"\nStarting to collect words for letter '{letter}' from {total_pages} pages...")
+def crawl_pages(proxy_manager: ProxyManager, letter: str, pages: List[int]) -> Dict[int, List[str]]:
+    """Fetch browse pages concurrently; pages whose retry backs off are requeued, not slept on"""
+    page_words = {}
     
-    with ThreadPoolExecutor(max_workers=50) as executor:
-        future_to_page = {
-            executor.submit(get_page_words, page, proxy_manager, letter): page
-            for page in range(1, total_pages + 1)
-        }
+    with ThreadPoolExecutor(max_workers=_max_in_flight) as executor:
+        queue = JobQueue({'browse': (executor, _max_in_flight)})
         
-        # Process results as they complete
-        for future in as_completed(future_to_page):
-            page = future_to_page[future]
+        def push(page, attempt=0, delay=0):
+            queue.push('browse', (attempt, page), get_page_words, (page, proxy_manager, letter, attempt, True),
+                       partial(page_done, page), delay)
+        
+        def page_done(page, future):
             try:
                 words = future.result()
-                if words:
-                    all_words.extend(words)
-                    print(f"Found {len(words)} words on page {page}. Total words so far: {len(all_words)}")
-                else:
-                    print(f"Warning: No words found on page {page}, will retry")
-                    retry_pages.append(page)
+            except RetryLater as e:
+                push(page, e.attempt, e.delay)
+                return
             except Exception as e:
                 print(f"Error processing page {page}: {str(e)}")
-                retry_pages.append(page)
-    
-    # Retry failed pages with fresh proxies
-    if retry_pages:
-        print(f"\nRetrying {len(retry_pages)} failed pages...")
-        with ThreadPoolExecutor(max_workers=20) as executor:
-            future_to_page = {
-                executor.submit(get_page_words, page, proxy_manager, letter): page
-                for page in retry_pages
-            }
-            
-            for future in as_completed(future_to_page):
-                page = future_to_page[future]
-                try:
-                    words = future.result()
-                    if words:
-                        all_words.extend(words)
-                        print(f"Found {len(words)} words on retry of page {page}")
-                except Exception as e:
-                    print(f"Page {page} failed again: {str(e)}")
-    
-    # Remove duplicates while preserving order
+                return
+            if words:
+                page_words[page] = words
+                print(f"Found {len(words)} words on page {page}. Total words so far: {sum(map(len, page_words.values()))}")
+            else:
+                print(f"Warning: No words found on page {page}")
+        
+        for page in pages:
+            push(page)
+        queue.run()
+    
+    return page_words
+
+def page_index_file(letter: str) -> str:
+    return f"{letter}_pages.json"
+
+def load_page_index(letter: str) -> Optional[Dict]:
+    """Words per browse page from the last crawl ({letter}_pages.json), if any"""
+    try:
+        with open(page_index_file(letter), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        index['pages'] = {int(page): words for page, words in index['pages'].items()}
+        return index
+    except (OSError, ValueError, KeyError) as e:
+        if os.path.exists(page_index_file(letter)):
+            print(f"Ignoring unreadable page index {page_index_file(letter)}: {e}")
+        return None
+
+def save_page_index(letter: str, total_pages: int, page_words: Dict[int, List[str]]):
+    with open(page_index_file(letter), 'w', encoding='utf-8') as f:
+        json.dump({
+            'total_pages': total_pages,
+            'crawled_at': datetime.utcnow().isoformat(),
+            'pages': {str(page): page_words[page] for page in sorted(page_words)}
+        }, f, ensure_ascii=False)
+
+def words_from_pages(page_words: Dict[int, List[str]]) -> List[str]:
+    """Words in browse order with duplicates removed"""
     seen = set()
-    unique_words = [x for x in all_words if not (x in seen or seen.add(x))]
+    return [x for page in sorted(page_words) for x in page_words[page] if not (x in seen or seen.add(x))]
+
+def get_words_for_letter(proxy_manager: ProxyManager, letter: str, total_pages: int) -> List[str]:
+    """Get words from all pages for a specific letter"""
+    print(f"\nStarting to collect words for letter '{letter}' from {total_pages} pages...")
+    
+    page_words = crawl_pages(proxy_manager, letter, list(range(1, total_pages + 1)))
+    if len(page_words) == total_pages:
+        save_page_index(letter, total_pages, page_words)
     
+    unique_words = words_from_pages(page_words)
     print(f"\nFinal word count after removing duplicates: {len(unique_words)}")
     return unique_words
 
-def save_checkpoint(words_processed: List[str], results: List[Dict], base_filename: str = "dictionary_data"):
-    """Save checkpoint of progress and partial results"""
-    # Save checkpoint of processed words
-    checkpoint_file = "{}_checkpoint.json".format(base_filename)
-    checkpoint_data = {
-        'words_processed': words_processed,
-        'last_updated': datetime.utcnow().isoformat()
-    }
-    with open(checkpoint_file, 'w', encoding='utf-8') as f:
-        json.dump(checkpoint_data, f, indent=2)
+def sample_pages(total_pages: int, samples: int) -> List[int]:
+    """First, last and evenly spaced browse pages"""
+    samples = max(samples, 2)
+    if total_pages <= samples:
+        return list(range(1, total_pages + 1))
+    step = (total_pages - 1) / (samples - 1)
+    return sorted({round(1 + i * step) for i in range(samples)})
+
+def drifted_pages(stored: Dict[int, List[str]], fetched: Dict[int, List[str]],
+                  sampled: List[int], total_pages: int) -> Set[int]:
+    """Pages to re-crawl around sample pages whose first/last words or size changed"""
+    def changed(page):
+        old, new = stored[page], fetched[page]
+        return (old[0], old[-1], len(old)) != (new[0], new[-1], len(new))
+    
+    recrawl = set()
+    for position, page in enumerate(sampled):
+        if changed(page):
+            low = sampled[position - 1] if position > 0 else 0
+            high = sampled[position + 1] if position + 1 < len(sampled) else total_pages + 1
+            recrawl.update(p for p in range(low + 1, high) if p not in fetched)
+    return recrawl
+
+def get_words_incremental(proxy_manager: ProxyManager, letter: str, total_pages: int, samples: int = 5) -> List[str]:
+    """
+    Word list for a letter from the last crawl's page index, re-fetching only what drifted
+    
+    A few sample pages are fetched and their first and last words compared with
+    the index. An inserted or removed word shifts every later page, so around
+    each changed sample the pages up to the neighbouring samples are re-crawled.
+    Without a usable index (first run, page count changed) all pages are crawled.
+    """
+    index = load_page_index(letter)
+    if not index or index['total_pages'] != total_pages or len(index['pages']) != total_pages:
+        return get_words_for_letter(proxy_manager, letter, total_pages)
+    stored = index['pages']
+    
+    sampled = sample_pages(total_pages, samples)
+    print(f"\nChecking {len(sampled)} of {total_pages} browse pages of '{letter}' for changes since {index['crawled_at']}...")
+    fetched = crawl_pages(proxy_manager, letter, sampled)
+    if len(fetched) != len(sampled):
+        print("Could not fetch every sample page, crawling all pages")
+        return get_words_for_letter(proxy_manager, letter, total_pages)
+    
+    recrawl = drifted_pages(stored, fetched, sampled, total_pages)
+    page_words = dict(stored)
+    page_words.update(fetched)
+    if recrawl:
+        print(f"Browse pages changed, re-crawling {len(recrawl)} pages around them...")
+        recrawled = crawl_pages(proxy_manager, letter, sorted(recrawl))
+        page_words.update(recrawled)
+        if len(recrawled) != len(recrawl):
+            print(f"Warning: {len(recrawl) - len(recrawled)} pages failed, keeping their previous words")
+    else:
+        print("No changes found, using the stored word list")
+    save_page_index(letter, total_pages, page_words)
+    
+    unique_words = words_from_pages(page_words)
+    print(f"\nFinal word count after removing duplicates: {len(unique_words)} ({len(sampled) + len(recrawl)} pages fetched)")
+    return unique_words
+
+def result_store_for(letter: str) -> ResultStore:
+    """Append-only log of a letter's scraped results, compacted into the JSON outputs at the end"""
+    return ResultStore(f"{letter}_dictionary_data_results")
+
+def load_saved_results(base_filename: str) -> List[Dict]:
+    """Rebuild result dicts from files written by save_results_to_json (the reverse of it)"""
+    def load(kind):
+        path = "{}_{}.json".format(base_filename, kind)
+        if not os.path.exists(path):
+            return []
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    results = {}
+    for entry in load('words'):
+        results[entry['word']] = dict(entry, pronunciations=[], definitions=[])
+    
+    definitions = {}
+    for entry in load('definitions'):
+        if entry['word'] in results:
+            definition = {
+                'definition_number': entry['definition_number'],
+                'definition_text': entry['definition_text'],
+                'examples': []
+            }
+            results[entry['word']]['definitions'].append(definition)
+            definitions[(entry['word'], entry['definition_number'])] = definition
+    for entry in load('examples'):
+        definition = definitions.get((entry['word'], entry['definition_number']))
+        if definition is not None:
+            definition['examples'].append({'text': entry['example_text'], 'attribution': entry['attribution']})
     
-    # Save partial results
-    save_results_to_json(results, base_filename)
+    for entry in load('pronunciations'):
+        result = results.get(entry['word'])
+        if result is None:
+            continue
+        if 'text_pronunciations' in entry:
+            result['text_pronunciations'] = entry['text_pronunciations']
+        if entry['pronunciation_text'] is not None:
+            result['pronunciations'].append({
+                'text': entry['pronunciation_text'],
+                'audio_dir': entry['audio_dir'],
+                'audio_file': entry['audio_file'],
+                'audio_url': entry['audio_url']
+            })
+    return list(results.values())
+
+def save_word_list(letter: str, words: List[str]):
+    """Save words to a simple file"""
+    with open(f"{letter}_words.txt", 'w', encoding='utf-8') as f:
+        for word in words:
+            f.write(word + '\n')
+    print(f"Saved word list to {letter}_words.txt")
+
+def open_letter_store(letter: str, resume: bool) -> tuple:
+    """Result store of a letter and the words it already holds (empty unless resuming)"""
+    # Load checkpoint if enabled; the stored results are kept and merged into the output
+    store = result_store_for(letter)
+    processed_words = set()
+    if resume:
+        processed_words = load_checkpoint(f"{letter}_dictionary_data", store)
+    if processed_words:
+        print(f"\nResuming '{letter}' from checkpoint with {len(processed_words)} words already processed")
+    else:
+        store.clear()
+    return store, processed_words
+
+def finish_letter(letter: str, store: ResultStore):
+    """Compact a letter's result log into its final files and drop the checkpoint"""
+    print(f"\nSaving final results for letter '{letter}'...")
+    save_results_to_json(store.load(), f"{letter}_dictionary_data.json")
+    store.clear()
+    print("Data has been saved in JSON format")
+    
+    # Clean up checkpoint file after successful completion
+    checkpoint_file = f"{letter}_dictionary_data_checkpoint.json"
+    if os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+        print("Cleaned up checkpoint file")
+
+def save_checkpoint(words_processed: Set[str], store: ResultStore):
+    """Make results and progress recorded so far durable (both are appended as words complete)"""
+    store.sync()
     safe_print("Checkpoint saved: {} words processed".format(len(words_processed)))
 
-def load_checkpoint(base_filename: str = "dictionary_data") -> tuple:
-    """Load checkpoint data if it exists"""
-    checkpoint_file = "{}_checkpoint.json".format(base_filename)
+def load_checkpoint(base_filename: str, store: ResultStore) -> Set[str]:
+    """Words already scraped for a letter, replayed from its progress journal"""
     try:
+        completed = store.completed()
+        if completed:
+            return completed
+        
+        # Results stored but the journal is gone: rebuild it from them
+        completed = store.rebuild_journal()
+        if completed:
+            return completed
+        
+        # Checkpoint from before the journal: import its partial results once
+        checkpoint_file = "{}_checkpoint.json".format(base_filename)
         if os.path.exists(checkpoint_file):
-            with open(checkpoint_file, 'r', encoding='utf-8') as f:
-                checkpoint_data = json.load(f)
-                return set(checkpoint_data['words_processed']), []  # Return empty results as we'll load from JSON
+            results = load_saved_results(base_filename)
+            store.extend(results)
+            store.sync()
+            safe_print("Imported {} results from {}".format(len(results), checkpoint_file))
+            return {result['word'] for result in results}
     except Exception as e:
         safe_print("Error loading checkpoint: {}".format(e))
-    return set(), []
+    return set()
 
 def get_proxy_manager():
     """Get or create the global proxy manager instance"""
     global _proxy_manager
     if _proxy_manager is None:
-        _proxy_manager = ProxyManager()
+        _proxy_manager = ProxyManager(PROXY_SOURCE)
     return _proxy_manager
 
+def init_worker_proxy_manager(address, authkey, parser_name, fetch_mode):
+    """ProcessPoolExecutor initializer: attach to the parent's shared proxy pool"""
+    global _proxy_manager, _singleflight
+    set_parser(parser_name)
+    set_fetch_mode(fetch_mode)
+    # Each worker scrapes one word at a time, so a small connection pool is enough
+    _proxy_manager = ProxyManager(scheduler=connect_scheduler(address, authkey),
+                                  limiter=connect_limiter(address, authkey),
+                                  retry=RetryPolicy(budget=connect_retry_budget(address, authkey)), pool_size=2)
+    _singleflight = connect_singleflight(address, authkey)
+
 def scrape_word_wrapper(word):
     """Wrapper function for multiprocessing"""
     proxy_manager = get_proxy_manager()  # Get the global instance
     return scrape_word(word, proxy_manager)
 
 def process_word_batch(batch_args):
-    """Process a batch of words using a shared proxy manager"""
-    words, start_idx = batch_args
+    """
+    Process a batch of words using a shared proxy manager
+    
+    batch_args is (words, start index, attempt). Returns the results and the
+    words whose retry has to back off, as (word, next attempt, delay), for the
+    caller to requeue instead of this worker sleeping.
+    """
+    words, start_idx, attempt = batch_args
     proxy_manager = get_proxy_manager()
     results = []
+    deferred = []
     
     for i, word in enumerate(words):
         try:
-            result = scrape_word(word, proxy_manager)
+            result = scrape_word(word, proxy_manager, attempt, defer=True)
             if result:
                 results.append(result)
+        except RetryLater as e:
+            deferred.append((word, e.attempt, e.delay))
         except Exception as e:
             print(f"Error processing word {word}: {str(e)}")
     
-    return results
+    return results, deferred
+
+def scrape_words_with_processes(words_to_process: List[str], words: List[str], processed_words: Set[str],
+                                store: ResultStore, letter: str, proxy_service: ProxyPoolService):
+    """Scrape words in batches across a process pool sharing one proxy pool (--engine process)"""
+    num_processes = min(50, multiprocessing.cpu_count() * 2)
+    batch_size = 10
+    print(f"Using {num_processes} processes with batch size {batch_size}")
+    
+    # Create batches with start indices
+    batches = []
+    for i in range(0, len(words_to_process), batch_size):
+        batch = words_to_process[i:i + batch_size]
+        batches.append((batch, i, 0))
+    
+    # Process all batches with improved concurrency; words backing off are
+    # requeued as single-word batches once their delay is over
+    with ProcessPoolExecutor(max_workers=num_processes, initializer=init_worker_proxy_manager,
+                             initargs=(*proxy_service.connect_args, _parser_name, _fetch_mode)) as executor:
+        queue = JobQueue({'words': (executor, num_processes * 2)})
+        progress = tqdm(total=len(batches), desc="Processing batches")
+        completed = 0
+        
+        def batch_done(future):
+            nonlocal completed
+            try:
+                batch_results, deferred = future.result()
+                if batch_results:
+                    store.extend(batch_results)
+                    processed_words.update([r['word'] for r in batch_results])
+                for word, attempt, delay in deferred:
+                    queue.push('words', (attempt,), process_word_batch, (([word], 0, attempt),), batch_done, delay)
+                    progress.total += 1
+                
+                completed += 1
+                if completed % 5 == 0:  # Save checkpoint every 5 batches
+                    save_checkpoint(processed_words, store)
+                    print(f"\nProgress: {len(processed_words)}/{len(words)} words ({len(processed_words)/len(words)*100:.1f}%), "
+                          f"{_proxy_manager.concurrency()['limit']} requests in flight allowed")
+                    
+            except Exception as e:
+                print(f"\nBatch failed: {str(e)}")
+            progress.update()
+        
+        for batch_args in batches:
+            queue.push('words', (0,), process_word_batch, (batch_args,), batch_done)
+        queue.run()
+        progress.close()
+
+def scrape_words_with_async(words_to_process: List[str], words: List[str], processed_words: Set[str],
+                            store: ResultStore, letter: str, args: argparse.Namespace):
+    """Scrape words from a single event loop (--engine async)"""
+    from async_engine import run_async_engine
+    
+    print(f"Using async engine with up to {args.concurrency} requests in flight")
+    checkpoint_every = 50  # Same cadence as 5 batches of 10 words
+    
+    def on_result(result: Dict):
+        store.append(result)
+        processed_words.add(result['word'])
+        if len(processed_words) % checkpoint_every == 0:
+            save_checkpoint(processed_words, store)
+            print(f"\nProgress: {len(processed_words)}/{len(words)} words ({len(processed_words)/len(words)*100:.1f}%)")
+    
+    run_async_engine(
+        words_to_process,
+        _proxy_manager,
+        partial(parse_word_page, parser=_parser_name),
+        word_url,
+        WORD_HEADERS,
+        concurrency=args.concurrency,
+        parse_workers=args.parse_workers,
+        on_result=on_result,
+        cache=get_page_cache(),
+        negative_cache=get_negative_cache()
+    )
+
+class LetterRun:
+    """
+    One letter's part of the global schedule (--schedule global)
+    
+    Pushes the letter's browse pages into the shared JobQueue (sample pages
+    first in incremental mode), then its word batches once the word list is
+    known, and acts as the letter's output sink: results go to its ResultStore
+    and the final files are written as soon as its last batch is done.
+    """
+    
+    def __init__(self, letter: str, total_pages: int, rank: int, queue: JobQueue, args: argparse.Namespace,
+                 scrape_definitions: bool, resume: bool):
+        self.letter = letter
+        self.total_pages = total_pages
+        self.rank = rank  # Earlier letters' jobs go first, later letters fill in behind them
+        self.queue = queue
+        self.args = args
+        self.scrape_definitions = scrape_definitions
+        self.resume = resume
+        self.page_words = {}
+        self.pending_pages = set()
+        self.stored_pages = None
+        self.sampled = []
+        self.phase = 'full'
+        self.words = []
+        self.store = None
+        self.processed_words = set()
+        self.pending_batches = 0
+        self.completed_batches = 0
+        self.done = False
+    
+    def start(self):
+        index = load_page_index(self.letter) if self.args.index == 'incremental' else None
+        if index and index['total_pages'] == self.total_pages and len(index['pages']) == self.total_pages:
+            self.stored_pages = index['pages']
+            self.sampled = sample_pages(self.total_pages, self.args.sample_pages)
+            self.phase = 'sample'
+            print(f"Checking {len(self.sampled)} of {self.total_pages} browse pages of '{self.letter}' for changes")
+            self.push_pages(self.sampled)
+        else:
+            self.push_pages(range(1, self.total_pages + 1))
+    
+    def push_pages(self, pages, attempt: int = 0, delay: float = 0):
+        for page in pages:
+            self.pending_pages.add(page)
+            # Retries queue behind every first attempt
+            self.queue.push('browse', (attempt, self.rank, page), get_page_words,
+                            (page, _proxy_manager, self.letter, attempt, True), partial(self.page_done, page), delay)
+    
+    def page_done(self, page: int, future):
+        try:
+            words = future.result()
+        except RetryLater as e:
+            self.push_pages([page], e.attempt, e.delay)
+            return
+        except Exception as e:
+            print(f"Error processing page {page} of '{self.letter}': {str(e)}")
+            words = []
+        self.pending_pages.discard(page)
+        if words:
+            self.page_words[page] = words
+        else:
+            print(f"Page {page} of '{self.letter}' failed")
+        if not self.pending_pages:
+            self.pages_done()
+    
+    def pages_done(self):
+        if self.phase == 'sample':
+            if any(page not in self.page_words for page in self.sampled):
+                print(f"Could not fetch every sample page of '{self.letter}', crawling all pages")
+                self.phase = 'full'
+                self.push_pages(p for p in range(1, self.total_pages + 1) if p not in self.page_words)
+                return
+            recrawl = drifted_pages(self.stored_pages, self.page_words, self.sampled, self.total_pages)
+            fetched = self.page_words
+            self.page_words = dict(self.stored_pages)
+            self.page_words.update(fetched)
+            if recrawl:
+                print(f"Browse pages of '{self.letter}' changed, re-crawling {len(recrawl)} pages around them...")
+                self.phase = 'recrawl'
+                self.push_pages(sorted(recrawl))
+                return
+        
+        # After a recrawl, pages that failed keep their previous words
+        if len(self.page_words) == self.total_pages:
+            save_page_index(self.letter, self.total_pages, self.page_words)
+        self.words = words_from_pages(self.page_words)
+        print(f"\nFound {len(self.words)} total words for letter '{self.letter}'")
+        save_word_list(self.letter, self.words)
+        
+        if not self.scrape_definitions:
+            print(f"Skipping definition scraping for letter '{self.letter}'. Words saved in {self.letter}_words.txt")
+            self.done = True
+            return
+        
+        self.store, self.processed_words = open_letter_store(self.letter, self.resume)
+        words_to_process = [w for w in self.words if w not in self.processed_words]
+        batch_size = 10
+        for number, i in enumerate(range(0, len(words_to_process), batch_size)):
+            self.pending_batches += 1
+            self.queue.push('words', (self.rank, 0, number), process_word_batch,
+                            ((words_to_process[i:i + batch_size], i, 0),), self.batch_done)
+        print(f"Queued {len(words_to_process)} remaining words for letter '{self.letter}'")
+        if not self.pending_batches:
+            self.finish()
+    
+    def batch_done(self, future):
+        try:
+            batch_results, deferred = future.result()
+            if batch_results:
+                self.store.extend(batch_results)
+                self.processed_words.update(r['word'] for r in batch_results)
+            # Words backing off come back as single-word batches after their delay
+            for word, attempt, delay in deferred:
+                self.pending_batches += 1
+                self.queue.push('words', (self.rank, attempt, 0), process_word_batch,
+                                (([word], 0, attempt),), self.batch_done, delay)
+        except Exception as e:
+            print(f"\nBatch of '{self.letter}' failed: {str(e)}")
+        
+        self.pending_batches -= 1
+        self.completed_batches += 1
+        if self.completed_batches % 5 == 0:  # Save checkpoint every 5 batches
+            save_checkpoint(self.processed_words, self.store)
+            print(f"Progress '{self.letter}': {len(self.processed_words)}/{len(self.words)} words "
+                  f"({len(self.processed_words)/len(self.words)*100:.1f}%), "
+                  f"{_proxy_manager.concurrency()['limit']} requests in flight allowed")
+        if not self.pending_batches:
+            self.finish()
+    
+    def finish(self):
+        finish_letter(self.letter, self.store)
+        self.done = True
+        print(f"\nCompleted processing letter '{self.letter}'")
+        print("=" * 80)
+
+def scrape_all_letters(letter_pages: Dict[str, int], args: argparse.Namespace, scrape_definitions: bool,
+                       resume: bool, proxy_service: ProxyPoolService):
+    """Browse and word pages of every letter through one priority queue (--schedule global)"""
+    num_processes = min(50, multiprocessing.cpu_count() * 2)
+    print(f"Using {num_processes} processes and {_max_in_flight} browse threads for {len(letter_pages)} letters")
+    
+    with ThreadPoolExecutor(max_workers=_max_in_flight) as browse_pool, \
+            ProcessPoolExecutor(max_workers=num_processes, initializer=init_worker_proxy_manager,
+                                initargs=(*proxy_service.connect_args, _parser_name, _fetch_mode)) as word_pool:
+        # Two batches per process so none waits for the next submission
+        queue = JobQueue({'browse': (browse_pool, _max_in_flight), 'words': (word_pool, num_processes * 2)})
+        runs = [LetterRun(letter, total_pages, rank, queue, args, scrape_definitions, resume)
+                for rank, (letter, total_pages) in enumerate(letter_pages.items())]
+        for run in runs:
+            run.start()
+        queue.run()
+    
+    queue.print_summary()
+    unfinished = [run.letter for run in runs if not run.done]
+    if unfinished:
+        print(f"Letters left unfinished: {', '.join(unfinished)}")
+
+def _reparse_page(task) -> Optional[Dict]:
+    """Parse one cached word page (reparse worker)"""
+    directory, word, digest, fetched_at, parser_name = task
+    try:
+        html = read_blob(directory, digest)
+        result = get_parser(parser_name).word_page(word, html)
+    except Exception as e:
+        safe_print("Error reparsing '{}': {}".format(word, e))
+        return None
+    result['scraped_at'] = fetched_at
+    return result
+
+def reparse_from_cache(letters: Optional[str] = None, workers: Optional[int] = None):
+    """
+    Rebuild the {letter}_dictionary_data.json_* outputs from cached pages, without the network
+    
+    The saved results are the base: words with a cached page are replaced by
+    its new parse, and words the cache doesn't have (scraped before it
+    existed, or evicted) are kept as they were.
+    """
+    cache = get_page_cache()
+    prefix = word_url('')
+    pages = {entry['url']: entry for entry in cache.entries() if entry['url'].startswith(prefix)}
+    # Words redirecting to a cached page (inflected forms) are rebuilt from that page
+    sources = [(url, pages[url]) for url in pages]
+    sources += [(redirect['url'], pages.get(cache.resolve(redirect['url']))) for redirect in cache.redirects()
+                if redirect['url'].startswith(prefix) and redirect['url'] not in pages]
+    tasks = {}
+    skipped = 0
+    for url, entry in sources:
+        if entry is None:
+            continue
+        # Pronunciation-only prefixes lack the senses
+        if not covers(entry, 'entry'):
+            skipped += 1
+            continue
+        word = url_word(url)
+        letter = word[:1].lower()
+        if letters and letter not in letters:
+            continue
+        tasks.setdefault(letter, []).append((cache.directory, word, entry['digest'], entry['fetched_at'], _parser_name))
+    
+    workers = workers or multiprocessing.cpu_count()
+    print(f"Reparsing {sum(len(t) for t in tasks.values())} cached pages with {workers} processes "
+          f"({skipped} pronunciation-only pages skipped)")
+    with ProcessPoolExecutor(max_workers=workers, initializer=set_parser, initargs=(_parser_name,)) as executor:
+        for letter in sorted(tasks):
+            letter_tasks = sorted(tasks[letter], key=lambda task: task[1])
+            reparsed = {r['word']: r for r in tqdm(executor.map(_reparse_page, letter_tasks, chunksize=32),
+                                                   total=len(letter_tasks), desc=f"Reparsing '{letter}'") if r}
+            base_filename = f"{letter}_dictionary_data.json"
+            saved = load_saved_results(base_filename)
+            results = [reparsed.pop(result['word'], result) for result in saved]
+            replaced = len(saved) - sum(1 for result, merged in zip(saved, results) if result is merged)
+            kept = len(saved) - replaced
+            added = len(reparsed)
+            results.extend(reparsed.values())
+            print(f"'{letter}': {replaced} words replaced by their reparsed page, {kept} kept as saved, {added} added")
+            save_results_to_json(results, base_filename)
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Scrape Merriam-Webster word lists and definitions")
+    parser.add_argument('command', nargs='?', choices=['scrape', 'reparse'], default='scrape',
+                        help="scrape: fetch word lists and pages (default); "
+                             "reparse: rebuild the *_dictionary_data* outputs from the page cache offline")
+    parser.add_argument('--engine', choices=['process', 'async'], default='process',
+                        help="process: batches across a process pool; async: one event loop with many requests in flight")
+    parser.add_argument('--schedule', choices=['global', 'letter'], default='global',
+                        help="global: one priority queue of browse and word pages for all letters (--engine process); "
+                             "letter: finish each letter before starting the next")
+    parser.add_argument('--concurrency', type=int, default=1000,
+                        help="Maximum in-flight word fetches for --engine async")
+    parser.add_argument('--max-in-flight', type=int, default=50,
+                        help="Upper bound of the adaptive concurrency limit for --engine process "
+                             "(the limit starts lower and backs off on 403/429/timeouts)")
+    parser.add_argument('--parse-workers', type=int, default=None,
+                        help="HTML parsing processes for --engine async (default: up to 4)")
+    parser.add_argument('--parser', choices=sorted(PARSERS), default=DEFAULT_PARSER,
+                        help="HTML parser backend for word and browse pages")
+    parser.add_argument('--fetch', choices=['stream', 'full'], default='stream',
+                        help="stream: stop downloading word pages once the entries are read (--engine process); "
+                             "full: download whole pages and parse them with --parser")
+    parser.add_argument('--index', choices=['incremental', 'full'], default='incremental',
+                        help="incremental: reuse the last crawl's word lists, re-crawling only browse pages that changed; "
+                             "full: crawl every browse page")
+    parser.add_argument('--sample-pages', type=int, default=5,
+                        help="Browse pages per letter checked for changes in incremental mode")
+    parser.add_argument('--refresh-pages', action='store_true',
+                        help="Rediscover every letter's browse page count even if the cached one is recent")
+    parser.add_argument('--letters', default=None,
+                        help="Letters to scrape, or to rebuild with reparse (default: all)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Parsing processes for reparse (default: one per core)")
+    return parser.parse_args()
 
 def main():
-    # Initialize global proxy manager
-    global _proxy_manager
-    _proxy_manager = ProxyManager()
+    args = parse_args()
+    set_parser(args.parser)
+    set_fetch_mode(args.fetch)
+    
+    if args.command == 'reparse':
+        reparse_from_cache(args.letters, args.workers)
+        return
+    
+    # Initialize global proxy manager; the async engine caps its own requests
+    # with --concurrency
+    global _proxy_manager, _max_in_flight
+    _max_in_flight = args.max_in_flight
+    limiter = None
+    if args.engine == 'process':
+        limiter = AdaptiveLimiter(initial=min(INITIAL_IN_FLIGHT, _max_in_flight), max_limit=_max_in_flight)
+    retry_budget = RetryBudget()
+    _proxy_manager = ProxyManager(PROXY_SOURCE, limiter=limiter, retry=RetryPolicy(budget=retry_budget))
+    
+    # Worker processes share this process's proxy scheduler, health state,
+    # concurrency limit, retry budget and in-flight fetches
+    proxy_service = None
+    if args.engine == 'process':
+        proxy_service = ProxyPoolService(_proxy_manager.scheduler, limiter, retry_budget, get_singleflight()).start()
     
     # Ask about scraping definitions once at the start
     scrape_definitions = input("\nWould you like to scrape definitions for all words? (y/n): ").lower() == 'y'
@@ -628,85 +1156,48 @@ def main():
         response = input("\nWould you like to resume from checkpoints if they exist? (y/n): ").lower() == 'y'
         resume_from_checkpoints = response
     
+    # Page counts of every letter, discovered concurrently
+    letter_pages = discover_letter_pages(_proxy_manager, args.letters or LETTERS, refresh=args.refresh_pages)
+    
+    if args.schedule == 'global' and args.engine == 'process':
+        scrape_all_letters(letter_pages, args, scrape_definitions, resume_from_checkpoints, proxy_service)
+        _proxy_manager.print_summary()
+        print_singleflight_summary()
+        return
+    
     # Process each letter sequentially
-    for letter in LETTER_PAGES.keys():
+    for letter, total_pages in letter_pages.items():
         print(f"\nCollecting all words starting with '{letter}'...")
-        words = get_words_for_letter(_proxy_manager, letter)
+        if args.index == 'incremental':
+            words = get_words_incremental(_proxy_manager, letter, total_pages, args.sample_pages)
+        else:
+            words = get_words_for_letter(_proxy_manager, letter, total_pages)
         print(f"\nFound {len(words)} total words for letter '{letter}'")
-        
-        # Save words to a simple file
-        with open(f"{letter}_words.txt", 'w', encoding='utf-8') as f:
-            for word in words:
-                f.write(word + '\n')
-        print(f"Saved word list to {letter}_words.txt")
+        save_word_list(letter, words)
         
         if scrape_definitions:
-            # Load checkpoint if enabled
-            processed_words, results = load_checkpoint(f"{letter}_dictionary_data_checkpoint.json")
-            if processed_words and resume_from_checkpoints:
-                print(f"\nResuming from checkpoint with {len(processed_words)} words already processed")
-            else:
-                processed_words = set()
-                results = []
+            store, processed_words = open_letter_store(letter, resume_from_checkpoints)
             
             # Filter out already processed words
             words_to_process = [w for w in words if w not in processed_words]
             if not words_to_process:
                 print(f"All words for letter '{letter}' have been processed!")
-                continue
-                
-            print(f"\nProcessing {len(words_to_process)} remaining words for letter '{letter}'...")
-            
-            # Use existing batch processing logic
-            num_processes = min(50, multiprocessing.cpu_count() * 2)
-            batch_size = 10
-            print(f"Using {num_processes} processes with batch size {batch_size}")
-            
-            # Create batches with start indices
-            batches = []
-            for i in range(0, len(words_to_process), batch_size):
-                batch = words_to_process[i:i + batch_size]
-                batches.append((batch, i))
-            
-            total_batches = len(batches)
-            
-            # Process all batches with improved concurrency
-            with ProcessPoolExecutor(max_workers=num_processes) as executor:
-                futures = []
-                for batch_args in batches:
-                    futures.append(executor.submit(process_word_batch, batch_args))
+            else:
+                print(f"\nProcessing {len(words_to_process)} remaining words for letter '{letter}'...")
                 
-                # Process results as they complete
-                completed = 0
-                for future in tqdm(as_completed(futures), total=len(futures), desc="Processing batches"):
-                    try:
-                        batch_results = future.result()
-                        if batch_results:
-                            results.extend(batch_results)
-                            processed_words.update([r['word'] for r in batch_results])
-                        
-                        completed += 1
-                        if completed % 5 == 0:  # Save checkpoint every 5 batches
-                            save_checkpoint(list(processed_words), results, f"{letter}_dictionary_data")
-                            print(f"\nProgress: {len(processed_words)}/{len(words)} words ({len(processed_words)/len(words)*100:.1f}%)")
-                            
-                    except Exception as e:
-                        print(f"\nBatch failed: {str(e)}")
-            
-            # Save final results with letter prefix
-            print(f"\nSaving final results for letter '{letter}'...")
-            save_results_to_json(results, f"{letter}_dictionary_data.json")
-            print("Data has been saved in JSON format")
+                if args.engine == 'async':
+                    scrape_words_with_async(words_to_process, words, processed_words, store, letter, args)
+                else:
+                    scrape_words_with_processes(words_to_process, words, processed_words, store, letter, proxy_service)
             
-            # Clean up checkpoint file after successful completion
-            checkpoint_file = f"{letter}_dictionary_data_checkpoint.json"
-            if os.path.exists(checkpoint_file):
-                os.remove(checkpoint_file)
-                print("Cleaned up checkpoint file")
+            # Compact the result log into the final files with letter prefix
+            finish_letter(letter, store)
         else:
             print(f"Skipping definition scraping for letter '{letter}'. Words saved in {letter}_words.txt")
             
         print(f"\nCompleted processing letter '{letter}'")
+        _proxy_manager.print_summary()
+        print_singleflight_summary()
         print("=" * 80)  # Visual separator between letters
 
 if __name__ == "__main__":
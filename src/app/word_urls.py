@@ -0,0 +1,38 @@
+"""
+Canonical dictionary URLs
+
+Every script builds word URLs with word_url() and stores fetched pages and
+redirects under canonical_url(), so the page cache, redirect map and
+negative cache agree on one key per page however a URL was spelled:
+
+    word_url("borrow/take a page from someone")
+    -> https://www.merriam-webster.com/dictionary/borrow%2Ftake%20a%20page%20from%20someone
+"""
+
+from urllib.parse import quote, unquote, urlsplit, urlunsplit
+
+DICTIONARY_URL = 'https://www.merriam-webster.com/dictionary/'
+
+def word_url(word: str) -> str:
+    """Dictionary page URL for a word, with the whole word percent-encoded as one path segment"""
+    return DICTIONARY_URL + quote(word.strip(), safe='')
+
+def url_word(url: str) -> str:
+    """Word of a dictionary page URL (inverse of word_url)"""
+    return unquote(canonical_url(url)[len(DICTIONARY_URL):])
+
+def canonical_url(url: str) -> str:
+    """
+    One spelling per page: https, lower-case host, no fragment or trailing
+    slash, dictionary words encoded like word_url(), other paths re-quoted
+    """
+    parts = urlsplit(url.strip())
+    scheme = 'https' if parts.scheme in ('http', 'https', '') else parts.scheme
+    host = parts.netloc.lower()
+    path = unquote(parts.path)
+    if host == 'www.merriam-webster.com' and path.startswith('/dictionary/'):
+        path = '/dictionary/' + quote(path[len('/dictionary/'):].rstrip('/'), safe='')
+    else:
+        path = quote(path, safe="/:@!$&'()*+,;=-._~") if path != '/' else path
+        path = path.rstrip('/') or '/'
+    return urlunsplit((scheme, host, path, parts.query, ''))